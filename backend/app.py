@@ -1,11 +1,35 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_app_context, make_response, url_for, send_from_directory, Response
 from flask_cors import CORS
 import os
 import sqlite3
-from datetime import datetime
-import hashlib
+import time
+import threading
+from datetime import datetime, timedelta, timezone
 import uuid
 import json
+import re
+import csv
+import io
+import tempfile
+import base64
+import binascii
+import math
+import secrets
+import signal
+import sys
+from functools import lru_cache, wraps
+
+from database import BatchWriter, ConnectionPool, WriteQueue, run_migrations
+from response_cache import ResponseCache
+from media_pipeline import ImagePipeline, UploadError, VARIANTS, FORMATS
+from events import EventBroker, EventStreamServer
+from home_content import HomeContentStore
+import geo
+from serializers import RowEncoder
+from compression import CompressedBody, compress_response
+from auth import HasherBusy, PasswordHasher, TokenSigner
+from ratelimit import MemoryStore, RateLimiter
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 app = Flask(__name__)
 
@@ -29,16 +53,144 @@ def handle_options():
         return response, 200
 
 # Configuration
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'fallback_secret_key_for_dev')
+# SECRET_KEY signs admin access tokens, so it must not be a known value.
+# Without one, a random key is generated per process: tokens then stop
+# working when the server restarts, and each process has its own key.
+PLACEHOLDER_SECRET_KEYS = {'', 'fallback_secret_key_for_dev', 'your_secret_key_here'}
+SECRET_KEY = os.environ.get('SECRET_KEY', '')
+if SECRET_KEY in PLACEHOLDER_SECRET_KEYS:
+    app.logger.warning('SECRET_KEY is not set; using a random key, admin logins will not survive a restart')
+    SECRET_KEY = secrets.token_hex(32)
+app.config['SECRET_KEY'] = SECRET_KEY
 
 # Database initialization
 DATABASE = 'megareality.db'
 
-def init_db():
-    """Initialize the database with tables and sample data if they don't exist"""
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    
+# PRAGMAs applied once to every connection when it is opened. The database
+# runs in WAL mode (set in init_db) so readers never wait on the writer;
+# synchronous=NORMAL is durable in WAL mode except across power loss.
+DB_PRAGMAS = [
+    'busy_timeout = 5000',
+    'synchronous = NORMAL',
+    'temp_store = MEMORY',
+    'cache_size = -16000',  # 16 MB page cache per connection
+    f"mmap_size = {int(os.environ.get('DB_MMAP_SIZE', 128 * 1024 * 1024))}",
+]
+
+db_pool = ConnectionPool(DATABASE, DB_PRAGMAS, max_idle=int(os.environ.get('DB_POOL_SIZE', 8)))
+
+# All writes go through a single writer thread which batches queued jobs into
+# one transaction, so concurrent admin edits never fight over the write lock
+db_writer = WriteQueue(lambda: db_pool.connect(autocommit=True))
+
+# Admin notifications are written off the request path: handlers only queue
+# them, and a background thread inserts whatever has queued up in batches
+notification_writer = BatchWriter(
+    lambda: db_pool.connect(autocommit=True),
+    '''
+        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
+        VALUES (?, ?, ?, ?, ?, 0)
+    ''',
+    before_commit=lambda db: bump_table_versions(db, ['notifications']),
+    after_commit=lambda: response_cache.invalidate('notifications'),
+)
+
+# Tables whose changes are reported by GET /api/sync
+SYNC_TABLES = ['admins', 'properties', 'agents', 'projects', 'builders', 'home_content', 'inquiries']
+
+# Parsed home content is kept in memory and reloaded after each change
+home_content_store = HomeContentStore(db_pool, lambda job, *tables: run_write(job, *tables))
+
+# Changes to public data are pushed to browsers over Server-Sent Events.
+# `python app.py` serves the stream from an asyncio server on PORT so idle
+# connections don't each hold a request thread; it forwards every other
+# request to the Flask app, which listens on WSGI_PORT on loopback only.
+event_broker = EventBroker(history=int(os.environ.get('EVENT_HISTORY', 1000)))
+WSGI_PORT = int(os.environ.get('WSGI_PORT', 5001))
+
+# Notifications older than NOTIFICATION_RETENTION_DAYS, or beyond the newest
+# NOTIFICATION_MAX_ROWS, are deleted every NOTIFICATION_COMPACT_INTERVAL
+# seconds. Setting either limit to 0 disables it.
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
+NOTIFICATION_MAX_ROWS = int(os.environ.get('NOTIFICATION_MAX_ROWS', 10000))
+NOTIFICATION_COMPACT_INTERVAL = int(os.environ.get('NOTIFICATION_COMPACT_INTERVAL', 3600))
+# Delete tombstones are kept for TOMBSTONE_RETENTION_DAYS (0 keeps them
+# forever) and pruned by the same job; sync tokens older than the newest
+# pruned tombstone get a full snapshot
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', 30))
+
+# Public GET responses are cached in-process and dropped when a write
+# touches one of the tables they were built from
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('RESPONSE_CACHE_SIZE', 1024)),
+    ttl=int(os.environ.get('RESPONSE_CACHE_TTL', 300)),
+)
+
+# JSON and text responses of at least COMPRESS_MIN_SIZE bytes are sent
+# brotli- or gzip-compressed when the client accepts it (see compression.py)
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+# Admin passwords are hashed with scrypt (or pbkdf2_sha256) on a small
+# bounded pool so logins can't occupy every request thread (see auth.py).
+# Login hands out signed tokens valid for ADMIN_TOKEN_TTL seconds.
+password_hasher = PasswordHasher(
+    algorithm=os.environ.get('PASSWORD_HASH_ALGORITHM', 'scrypt'),
+    scrypt_n=int(os.environ.get('SCRYPT_N', 2 ** 14)),
+    pbkdf2_iterations=int(os.environ.get('PBKDF2_ITERATIONS', 600000)),
+    max_workers=int(os.environ.get('PASSWORD_HASH_WORKERS', 2)),
+    max_pending=int(os.environ.get('PASSWORD_HASH_QUEUE', 16)),
+)
+token_signer = TokenSigner(app.config['SECRET_KEY'], max_age=int(os.environ.get('ADMIN_TOKEN_TTL', 12 * 3600)))
+
+# Behind PROXY_COUNT reverse proxies, take the client address from
+# X-Forwarded-For so rate limits apply per client rather than per proxy.
+# The event stream server in front of the app (see __main__) adds one more.
+PROXY_COUNT = int(os.environ.get('PROXY_COUNT', 0))
+wsgi_app = app.wsgi_app
+
+def trust_proxies(count):
+    """Read the client address from X-Forwarded-For behind count proxies"""
+    app.wsgi_app = ProxyFix(wsgi_app, x_for=count) if count else wsgi_app
+
+trust_proxies(PROXY_COUNT)
+
+# Login and public inquiry submissions are rate limited per client address
+# and in total, as '<count>/<second|minute|hour|day>' ('0' disables a
+# limit). Refused requests get a 429 before the view runs (see ratelimit.py).
+rate_limiter = RateLimiter(MemoryStore(max_keys=int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))))
+rate_limiter.limit(
+    'admin_login',
+    per_client=os.environ.get('LOGIN_RATE_LIMIT', '10/minute'),
+    total=os.environ.get('LOGIN_RATE_LIMIT_TOTAL', '120/minute'),
+)
+rate_limiter.limit(
+    'create_inquiry',
+    per_client=os.environ.get('INQUIRY_RATE_LIMIT', '5/minute'),
+    total=os.environ.get('INQUIRY_RATE_LIMIT_TOTAL', '300/minute'),
+)
+rate_limiter.init_app(app)
+
+# Uploaded images are stored under their content hash and resized into
+# variants in the background (see media_pipeline.py)
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', 'uploads')
+media_pipeline = ImagePipeline(
+    MEDIA_ROOT,
+    max_workers=int(os.environ.get('MEDIA_WORKERS', 2)),
+    max_bytes=int(os.environ.get('MEDIA_MAX_BYTES', 20 * 1024 * 1024)),
+    on_ready=lambda manifest: record_media_dimensions(manifest),
+)
+MEDIA_KEY_RE = re.compile(r'^[0-9a-f]{32}$')
+# The upload key in a media URL (/media/<key>/...), as an SQL expression
+MEDIA_URL_KEY = "(CASE WHEN instr(url, '/media/') > 0 THEN substr(url, instr(url, '/media/') + 7, 32) END)"
+
+# owner_type used for each listing table's rows in media
+MEDIA_OWNER_TYPES = {'properties': 'property', 'projects': 'project'}
+
+# Schema migrations
+# Each step runs once, in order; the number of applied steps is stored in
+# PRAGMA user_version so startup skips everything already applied.
+def migrate_base_schema(cursor):
+    """Create the original tables and backfill columns added later"""
     # Create tables if they don't exist
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS admins (
@@ -169,68 +321,1023 @@ def init_db():
             read_status BOOLEAN DEFAULT 0
         )
     ''')
+
+def migrate_listing_indexes(cursor):
+    """Secondary indexes for the listing filters and keyset pagination"""
+    indexes = [
+        "idx_properties_created ON properties (created_at, id)",
+        "idx_properties_type_price ON properties (property_type, price)",
+        "idx_properties_status_price ON properties (status, price)",
+        "idx_properties_builder ON properties (builder_id)",
+        "idx_projects_created ON projects (created_at, id)",
+        "idx_projects_status_tag ON projects (status, tag)",
+        "idx_projects_tag ON projects (tag)",
+        "idx_projects_builder ON projects (builder_id)",
+        "idx_inquiries_created ON inquiries (created_at, id)",
+        "idx_inquiries_status ON inquiries (status)",
+        "idx_notifications_created ON notifications (created_at, id)",
+        "idx_home_content_section ON home_content (section)",
+    ]
+    for index in indexes:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index}")
+
+def migrate_listing_search(cursor):
+    """FTS5 indexes over listing text, kept in sync by triggers"""
+    search_columns = {
+        'properties': ['title', 'description', 'location'],
+        'projects': ['title', 'description', 'location', 'city', 'address'],
+    }
+    for table, columns in search_columns.items():
+        fts = f'{table}_fts'
+        cols = ', '.join(columns)
+        new_values = ', '.join(f'new.{col}' for col in columns)
+        old_values = ', '.join(f'old.{col}' for col in columns)
+        
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+            END
+        ''')
+        # Index the rows that already exist
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+def migrate_table_versions(cursor):
+    """Per-table change counters used for ETag/Last-Modified validators"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            modified_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    tables = ['admins', 'properties', 'agents', 'projects', 'builders',
+              'home_content', 'inquiries', 'notifications']
+    cursor.executemany(
+        "INSERT OR IGNORE INTO table_versions (name, version, modified_at) VALUES (?, 0, ?)",
+        [(table, time.time()) for table in tables]
+    )
+
+def migrate_media(cursor):
+    """Normalized media table mirrored from the listings' images JSON.
+
+    Triggers keep it in sync with every write to properties.images and
+    projects.images, so the JSON column stays the source the admin edits.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS media (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            owner_type TEXT NOT NULL,
+            owner_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            width INTEGER,
+            height INTEGER
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_owner ON media (owner_type, owner_id, position)")
+    
+    for table, owner_type in MEDIA_OWNER_TYPES.items():
+        # Non-empty URL strings from a well-formed images array
+        def image_rows(row, source=''):
+            return f'''
+                SELECT '{owner_type}', {row}.id, j.key, trim(j.value)
+                FROM {source}json_each(CASE WHEN json_valid({row}.images) AND json_type({row}.images) = 'array'
+                                            THEN {row}.images ELSE '[]' END) j
+                WHERE j.type = 'text' AND trim(j.value) != ''
+            '''
+        insert = "INSERT INTO media (owner_type, owner_id, position, url)"
+        remove = f"DELETE FROM media WHERE owner_type = '{owner_type}' AND owner_id = old.id"
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_media_insert AFTER INSERT ON {table} BEGIN
+                {insert} {image_rows('new')};
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_media_update AFTER UPDATE OF images ON {table} BEGIN
+                {remove};
+                {insert} {image_rows('new')};
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_media_delete AFTER DELETE ON {table} BEGIN
+                {remove};
+            END
+        ''')
+        # Backfill from the rows that already exist
+        cursor.execute(f"DELETE FROM media WHERE owner_type = '{owner_type}'")
+        cursor.execute(f"{insert} {image_rows(table, source=f'{table}, ')}")
+
+def migrate_notification_unread(cursor):
+    """Partial index over unread notifications for the unread count"""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications (id) WHERE read_status = 0"
+    )
+
+def migrate_row_versions(cursor):
+    """Row versions and delete tombstones for delta sync.
+
+    Every insert or update stamps the row with the next value of a single
+    database-wide sequence (and updated_at); deletes record a tombstone
+    under the next value instead. Everything changed after version N is
+    then "row_version > N" on each table plus the tombstones after N.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sync_sequence (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            value INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO sync_sequence (id, value) VALUES (1, 0)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tombstones (
+            row_version INTEGER PRIMARY KEY,
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            deleted_at TEXT NOT NULL
+        )
+    ''')
+    
+    next_version = "UPDATE sync_sequence SET value = value + 1"
+    current_version = "(SELECT value FROM sync_sequence)"
+    now = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+    for table in SYNC_TABLES:
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if 'row_version' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN row_version INTEGER NOT NULL DEFAULT 0")
+        if 'updated_at' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN updated_at TEXT")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_row_version ON {table} (row_version)")
+        
+        stamp = f"UPDATE {table} SET row_version = {current_version}, updated_at = {now} WHERE id = new.id"
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_insert AFTER INSERT ON {table} BEGIN
+                {next_version};
+                {stamp};
+            END
+        ''')
+        # The stamp is itself an update; the WHEN clause skips it
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_update AFTER UPDATE ON {table}
+            WHEN new.row_version IS old.row_version BEGIN
+                {next_version};
+                {stamp};
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_delete AFTER DELETE ON {table} BEGIN
+                {next_version};
+                INSERT INTO tombstones (row_version, entity, entity_id, deleted_at)
+                VALUES ({current_version}, '{table}', old.id, {now});
+            END
+        ''')
+        # Stamp the rows that already exist
+        cursor.execute(f"UPDATE {table} SET row_version = row_version")
+
+def migrate_tombstone_horizon(cursor):
+    """Row version up to which tombstones have been pruned"""
+    cursor.execute("ALTER TABLE sync_sequence ADD COLUMN pruned_through INTEGER NOT NULL DEFAULT 0")
+
+def migrate_media_dimensions(cursor):
+    """Fill media.width/height from the dimensions of uploaded images.
+
+    media_files holds each rendered upload's dimensions by key. Triggers
+    copy them onto media rows whose URL points at the upload, both when a
+    listing saves the URL and when the upload finishes rendering later.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS media_files (
+            key TEXT PRIMARY KEY,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_media_key ON media ({MEDIA_URL_KEY})")
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS media_dimensions AFTER INSERT ON media BEGIN
+            UPDATE media SET (width, height) = (SELECT width, height FROM media_files WHERE key = {MEDIA_URL_KEY})
+            WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS media_files_insert AFTER INSERT ON media_files BEGIN
+            UPDATE media SET width = new.width, height = new.height WHERE {MEDIA_URL_KEY} = new.key;
+        END
+    ''')
+    
+    # Backfill from the manifests of the uploads listings already use
+    keys = cursor.execute(f"SELECT DISTINCT {MEDIA_URL_KEY} FROM media WHERE {MEDIA_URL_KEY} IS NOT NULL").fetchall()
+    for (key,) in keys:
+        manifest = media_pipeline.manifest(key) if MEDIA_KEY_RE.match(key) else None
+        if manifest and manifest.get('status') == 'ready' and 'width' in manifest:
+            cursor.execute(
+                "INSERT OR REPLACE INTO media_files (key, width, height) VALUES (?, ?, ?)",
+                (key, manifest['width'], manifest['height'])
+            )
+
+def record_media_dimensions(manifest):
+    """Save a rendered upload's dimensions, filling the media rows using it"""
+    run_write(lambda db: db.execute(
+        "INSERT OR REPLACE INTO media_files (key, width, height) VALUES (?, ?, ?)",
+        (manifest['key'], manifest['width'], manifest['height'])
+    ))
+
+# An uploaded image's URL as earlier versions returned it, with the host
+ABSOLUTE_MEDIA_URL_RE = re.compile(r'^https?://[^/]+(/media/[0-9a-f]{32}/[^/]+)$')
+
+def migrate_media_paths(cursor):
+    """Store uploaded images as root-relative /media/ paths.
+
+    Absolute URLs kept the scheme and host the upload went through, which
+    behind a TLS-terminating proxy was plain http.
+    """
+    def relative(url):
+        match = ABSOLUTE_MEDIA_URL_RE.match(url) if isinstance(url, str) else None
+        return match.group(1) if match else url
+    
+    for table in ('properties', 'projects'):
+        for row_id, images in cursor.execute(f"SELECT id, images FROM {table}").fetchall():
+            try:
+                urls = json.loads(images)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(urls, list):
+                continue
+            rewritten = [relative(url) for url in urls]
+            if rewritten != urls:
+                cursor.execute(f"UPDATE {table} SET images = ? WHERE id = ?", (json.dumps(rewritten), row_id))
+    for table in ('agents', 'builders'):
+        for row_id, image in cursor.execute(f"SELECT id, image FROM {table}").fetchall():
+            if relative(image) != image:
+                cursor.execute(f"UPDATE {table} SET image = ? WHERE id = ?", (relative(image), row_id))
+
+def migrate_property_facets(cursor):
+    """Index for grouping properties by location in the facet counts"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_properties_location ON properties (location)")
+
+# How rows of each listing table are geocoded: expressions looked up by
+# exact name in geo_places, an expression matched against pincode
+# prefixes, and text columns searched for a known city name. {row} is the
+# row being geocoded.
+GEOCODE_SOURCES = {
+    'properties': {
+        'exact': ["lower(trim({row}.location))"],
+        'pincode': None,
+        'text': ['location'],
+    },
+    'projects': {
+        'exact': ["trim({row}.pincode)", "lower(trim({row}.city))"],
+        'pincode': "trim({row}.pincode)",
+        'text': ['location', 'address'],
+    },
+}
+# Characters that separate words in an address, for matching city names
+# as whole words rather than inside longer ones
+ADDRESS_SEPARATORS = ',.;:-/()#\'"\t\n'
+
+def address_words(expression):
+    """expression lowercased with separators as spaces and padded with a
+    space at each end, so a name is found as whole words by instr(' name ')"""
+    text = f"lower(coalesce({expression}, ''))"
+    for separator in ADDRESS_SEPARATORS:
+        text = f"replace({text}, {sql_literal(separator)}, ' ')"
+    return f"(' ' || {text} || ' ')"
+
+def sql_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+def geocode_sql(table, row):
+    """UPDATE setting the coordinates of row from geo_places.
+
+    A matching pincode wins, then the longest matching pincode prefix, then
+    the longest place name found as whole words (an exact match being the
+    longest); leaves them NULL when nothing matches.
+    """
+    source = GEOCODE_SOURCES[table]
+    exact = ', '.join(expression.format(row=row) for expression in source['exact'])
+    matches = [f"p.name IN ({exact})"]
+    if source['pincode']:
+        pincode = source['pincode'].format(row=row)
+        matches.append(f"(p.kind = 'pincode_prefix' AND {pincode} GLOB p.name || '*')")
+    text = ' OR '.join(
+        f"instr({address_words(f'{row}.{column}')}, ' ' || p.name || ' ') > 0" for column in source['text']
+    )
+    matches.append(f"(p.kind = 'city' AND ({text}))")
+    return f'''
+        UPDATE {table} SET (latitude, longitude) = (
+            SELECT p.latitude, p.longitude FROM geo_places p
+            WHERE {' OR '.join(matches)}
+            ORDER BY p.kind = 'pincode' DESC, p.kind = 'pincode_prefix' DESC, length(p.name) DESC
+            LIMIT 1
+        )
+    '''
+
+def create_geocode_triggers(cursor, table, source):
+    """Geocode rows saved without coordinates, and rows whose address
+    changes unless new coordinates were set along with it"""
+    watched = sorted({re.search(r'\.(\w+)', expression).group(1) for expression in source['exact']}
+                     | set(source['text']))
+    changed = ' OR '.join(f"new.{column} IS NOT old.{column}" for column in watched)
+    geocode = geocode_sql(table, 'new') + " WHERE id = new.id"
+    cursor.execute(f'''
+        CREATE TRIGGER {table}_geocode_insert AFTER INSERT ON {table}
+        WHEN new.latitude IS NULL OR new.longitude IS NULL BEGIN
+            {geocode};
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER {table}_geocode_update AFTER UPDATE OF {', '.join(watched)} ON {table}
+        WHEN ({changed}) AND new.latitude IS old.latitude AND new.longitude IS old.longitude BEGIN
+            {geocode};
+        END
+    ''')
+
+def migrate_geo(cursor):
+    """Listing coordinates with an R*Tree index and offline geocoding"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS geo_places (
+            name TEXT PRIMARY KEY,
+            kind TEXT NOT NULL DEFAULT 'city',
+            latitude REAL NOT NULL,
+            longitude REAL NOT NULL
+        )
+    ''')
+    cursor.executemany(
+        "INSERT OR IGNORE INTO geo_places (name, kind, latitude, longitude) VALUES (?, 'city', ?, ?)",
+        geo.CITIES,
+    )
+    
+    for table, source in GEOCODE_SOURCES.items():
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN latitude REAL")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN longitude REAL")
+        cursor.execute(f"CREATE VIRTUAL TABLE {table}_geo USING rtree(id, min_lat, max_lat, min_lng, max_lng)")
+        
+        # Keep the R*Tree in step with the coordinate columns
+        index_row = f'''
+            INSERT INTO {table}_geo (id, min_lat, max_lat, min_lng, max_lng)
+            SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+        '''
+        cursor.execute(f'''
+            CREATE TRIGGER {table}_geo_insert AFTER INSERT ON {table} BEGIN
+                {index_row};
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER {table}_geo_update AFTER UPDATE OF latitude, longitude ON {table} BEGIN
+                DELETE FROM {table}_geo WHERE id = old.id;
+                {index_row};
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER {table}_geo_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM {table}_geo WHERE id = old.id;
+            END
+        ''')
+        
+        create_geocode_triggers(cursor, table, source)
+        cursor.execute(geocode_sql(table, table))
+
+def migrate_geocode_words(cursor):
+    """Seed pincode prefixes and match city names as whole words.
+
+    Rows without coordinates, or whose coordinates are a geo_places point
+    (so came from geocoding rather than the admin), are geocoded again.
+    """
+    cursor.executemany(
+        "INSERT OR IGNORE INTO geo_places (name, kind, latitude, longitude) VALUES (?, 'pincode_prefix', ?, ?)",
+        geo.pincode_prefix_places(),
+    )
+    for table, source in GEOCODE_SOURCES.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_geocode_insert")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_geocode_update")
+        create_geocode_triggers(cursor, table, source)
+        cursor.execute(geocode_sql(table, table) + f'''
+            WHERE latitude IS NULL OR longitude IS NULL
+               OR (latitude, longitude) IN (SELECT latitude, longitude FROM geo_places)
+        ''')
+
+MIGRATIONS = [
+    migrate_base_schema,
+    migrate_listing_indexes,
+    migrate_listing_search,
+    migrate_table_versions,
+    migrate_media,
+    migrate_notification_unread,
+    migrate_row_versions,
+    migrate_property_facets,
+    migrate_geo,
+    migrate_tombstone_horizon,
+    migrate_media_paths,
+    migrate_media_dimensions,
+    migrate_geocode_words,
+]
+
+def init_db():
+    """Initialize the database, apply pending migrations and seed the first admin"""
+    conn = sqlite3.connect(DATABASE)
+    cursor = conn.cursor()
+    
+    # WAL mode is persistent, so it only needs to be switched on once
+    cursor.execute("PRAGMA journal_mode = WAL").fetchall()
+    
+    run_migrations(conn, MIGRATIONS)
     
     # Check if sample admin exists
     cursor.execute("SELECT COUNT(*) FROM admins")
     if cursor.fetchone()[0] == 0:
         # Insert sample admin
-        admin_password_hash = hashlib.sha256('admin123'.encode()).hexdigest()
+        admin_password_hash = password_hasher.hash_now('admin123')
         cursor.execute('''
             INSERT INTO admins (name, email, password_hash, role, created_at)
             VALUES (?, ?, ?, ?, ?)
         ''', ('Admin User', 'admin@example.com', admin_password_hash, 'admin', datetime.now().isoformat()))
     
-    # Don't insert sample properties - only admin-added content will be available
-    # Check if properties exist
-    cursor.execute("SELECT COUNT(*) FROM properties")
-    if cursor.fetchone()[0] == 0:
-        # No sample properties will be added - only admin-added content will be available
-        pass
+    conn.commit()
+    conn.close()
+
+def get_db_connection():
+    """Get the database connection for the current request.
+
+    The connection comes from db_pool and is shared by every call made
+    while handling the same request; it goes back to the pool on teardown.
+    """
+    if not has_app_context():
+        # Scripts and shells get a private connection they close themselves
+        conn = sqlite3.connect(DATABASE)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    if 'db_conn' not in g:
+        g.db_conn = db_pool.acquire()
+    return g.db_conn
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        db_pool.release(conn)
+
+@app.after_request
+def compress(response):
+    return compress_response(request, response, COMPRESS_MIN_SIZE)
+
+def run_write(job, *tables, timeout=30):
+    """Run job(db) on the writer thread and return its result.
+
+    The job must not commit; the writer commits it together with any other
+    jobs queued at the same time. Exceptions raised by the job roll back
+    only that job and are re-raised here. tables names the tables the job
+    modifies: their table_versions counters are bumped in the same
+    transaction and cached responses built from them are dropped. timeout
+    is how long to wait for the result, None to wait until it is done.
+    """
+    def write_and_bump(db):
+        result = job(db)
+        bump_table_versions(db, tables)
+        return result
+    
+    result = db_writer.run(write_and_bump, timeout)
+    response_cache.invalidate(*tables)
+    return result
+
+def bump_table_versions(db, tables):
+    """Increment the table_versions counters of tables inside db's transaction"""
+    now = time.time()
+    db.executemany('''
+        INSERT INTO table_versions (name, version, modified_at) VALUES (?, 1, ?)
+        ON CONFLICT (name) DO UPDATE SET version = version + 1, modified_at = excluded.modified_at
+    ''', [(table, now) for table in tables])
+
+def table_validators(tables):
+    """Return (etag, last_modified) for a response built from tables"""
+    placeholders = ', '.join('?' for _ in tables)
+    rows = get_db_connection().execute(
+        f"SELECT name, version, modified_at FROM table_versions WHERE name IN ({placeholders})", tables
+    ).fetchall()
+    found = {row['name']: row for row in rows}
+    versions = [str(found[table]['version']) if table in found else '0' for table in tables]
+    last_modified = max((row['modified_at'] for row in rows), default=None)
+    return 'v' + '.'.join(versions), last_modified
+
+def conditional_response(*tables):
+    """Answer GET requests with 304 when the client's copy is current.
+
+    The ETag is built from the table_versions counters of every table the
+    route reads, and is checked before the view runs so a 304 costs one
+    small query. Last-Modified is only sent once the newest change is at
+    least a second old, since it can't tell apart changes within a second.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = table_validators(tables)
+            
+            if request.if_none_match:
+                # Weak comparison: compressed responses carry weak ETags
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since and last_modified:
+                not_modified = int(last_modified) <= request.if_modified_since.timestamp()
+            else:
+                not_modified = False
+            
+            if not_modified:
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            if last_modified and time.time() - last_modified >= 1:
+                response.last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+            # Let browsers keep the body but revalidate it on every use
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def cached_response(*tables):
+    """Serve a GET route from response_cache.
+
+    The key is the path plus the sorted query parameters; only 200
+    responses are stored, as a CompressedBody so each encoding is only
+    compressed once. tables lists every table the route reads. Cached
+    routes also answer conditional requests (conditional_response).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            entry = response_cache.get(key)
+            if entry is not None:
+                response = entry.apply(request, app.response_class(mimetype=entry.mimetype), COMPRESS_MIN_SIZE)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            
+            versions = response_cache.versions(tables)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                entry = CompressedBody(response.get_data(), response.mimetype)
+                response_cache.set(key, entry, tables, versions)
+                entry.apply(request, response, COMPRESS_MIN_SIZE)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return conditional_response(*tables)(wrapper)
+    return decorator
+
+def add_notification(notification_type, message, admin_id=1, admin_name='Admin User'):
+    """Queue an admin notification; it is written shortly after in a batch"""
+    notification_writer.add((notification_type, message, admin_id, admin_name, datetime.now().isoformat()))
+
+def compact_notifications(db):
+    """Delete notifications past the retention limits; returns the number removed"""
+    deleted = 0
+    if NOTIFICATION_RETENTION_DAYS > 0:
+        cutoff = (datetime.now() - timedelta(days=NOTIFICATION_RETENTION_DAYS)).isoformat()
+        deleted += db.execute("DELETE FROM notifications WHERE created_at < ?", (cutoff,)).rowcount
+    if NOTIFICATION_MAX_ROWS > 0:
+        # Keep the newest NOTIFICATION_MAX_ROWS; the subquery is NULL (and
+        # nothing matches) while the table is smaller than that
+        deleted += db.execute('''
+            DELETE FROM notifications WHERE id < (
+                SELECT id FROM notifications ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        ''', (NOTIFICATION_MAX_ROWS - 1,)).rowcount
+    return deleted
+
+def prune_tombstones(db):
+    """Delete tombstones past TOMBSTONE_RETENTION_DAYS; returns the number removed"""
+    if TOMBSTONE_RETENTION_DAYS <= 0:
+        return 0
+    cutoff = (datetime.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)).isoformat()
+    horizon = db.execute("SELECT max(row_version) FROM tombstones WHERE deleted_at < ?", (cutoff,)).fetchone()[0]
+    if horizon is None:
+        return 0
+    # Row versions only grow, so everything up to the horizon goes; clients
+    # whose token is older can't see those deletes and resync in full
+    db.execute("UPDATE sync_sequence SET pruned_through = max(pruned_through, ?)", (horizon,))
+    return db.execute("DELETE FROM tombstones WHERE row_version <= ?", (horizon,)).rowcount
+
+def start_compaction():
+    """Compact notifications and tombstones now and then every NOTIFICATION_COMPACT_INTERVAL seconds"""
+    def compact_periodically():
+        while True:
+            for job, tables in ((compact_notifications, ['notifications']), (prune_tombstones, [])):
+                try:
+                    run_write(job, *tables)
+                except Exception:
+                    app.logger.exception('%s failed', job.__name__)
+            time.sleep(NOTIFICATION_COMPACT_INTERVAL)
+    
+    if NOTIFICATION_COMPACT_INTERVAL > 0:
+        threading.Thread(target=compact_periodically, name='compaction', daemon=True).start()
+
+# Listing query layer
+# Properties and projects resolve builder_name with a single LEFT JOIN
+# instead of one builders lookup per row. List and detail routes take
+# fields= to select only some columns.
+# Named field sets for fields=; detail is every field
+LISTING_PROJECTIONS = {
+    'card': {
+        'properties': ['id', 'title', 'price', 'location', 'property_type', 'status', 'bedrooms',
+                       'bathrooms', 'area_sqft', 'builder_id', 'builder_name', 'is_favorite', 'cover_image'],
+        'projects': ['id', 'title', 'location', 'status', 'tag', 'type', 'price_range', 'city',
+                     'builder_id', 'builder_name', 'is_favorite', 'cover_image'],
+    },
+    'detail': None,
+}
+# Bookkeeping columns for /api/sync, left out of every other response so
+# they don't leak into public payloads (or change their cached bytes)
+SYNC_COLUMNS = ('row_version', 'updated_at')
+# Columns of each table, read from the schema on first use
+table_columns = {}
+
+def public_columns(table):
+    """table's columns other than SYNC_COLUMNS, in schema order"""
+    if table not in table_columns:
+        conn = db_pool.acquire()
+        try:
+            table_columns[table] = [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        finally:
+            db_pool.release(conn)
+    return [column for column in table_columns[table] if column not in SYNC_COLUMNS]
+
+def select_public(table):
+    """SELECT of table's public columns, for queries that would use *"""
+    return f"SELECT {', '.join(public_columns(table))} FROM {table}"
+
+def parse_fields(cursor, table, cover=False):
+    """Fields requested with fields=, or None for every field.
+
+    Accepts field names and projection names, comma-separated. With
+    cover=True a requested images field becomes cover_image. Returns
+    (fields, error).
+    """
+    value = request.args.get('fields')
+    if not value:
+        return None, None
+    available = set(public_columns(table)) | {'builder_name', 'cover_image'}
+    
+    fields = []
+    for name in value.split(','):
+        name = name.strip()
+        if name in LISTING_PROJECTIONS:
+            projection = LISTING_PROJECTIONS[name]
+            if projection is None:
+                return None, None
+            fields.extend(projection[table])
+        elif name in available:
+            fields.append('cover_image' if cover and name == 'images' else name)
+        elif name:
+            return None, f'Unknown field: {name}'
+    return list(dict.fromkeys(fields)), None
+
+def listing_query(table, search=False, cover=False, fields=None, all_columns=False):
+    """Base SELECT for a listing table with builder_name joined in.
+
+    With search=True the table's FTS index is joined as f, its relevance is
+    selected as rank and the caller adds a "{table}_fts MATCH ?" condition.
+    With cover=True the first image is looked up in media as cover_image.
+    fields (from parse_fields) limits the columns selected; id and
+    created_at are always included for the pagination cursor, and
+    the row converter or encoder drops them again if they weren't asked for.
+    Without fields every column but SYNC_COLUMNS is selected, or every
+    column with all_columns=True (for /api/sync).
+    """
+    cover_image = f'''(
+            SELECT m.url FROM media m
+            WHERE m.owner_type = '{MEDIA_OWNER_TYPES[table]}' AND m.owner_id = t.id
+            ORDER BY m.position LIMIT 1
+        ) AS cover_image'''
+    builder_name = "COALESCE(b.name, '') AS builder_name"
+    if fields is None:
+        columns = ["t.*" if all_columns else ', '.join(f"t.{column}" for column in public_columns(table)),
+                   builder_name]
+        if cover:
+            columns.append(cover_image)
+    else:
+        columns = []
+        for field in dict.fromkeys(['id', 'created_at', *fields]):
+            if field == 'builder_name':
+                columns.append(builder_name)
+            elif field == 'cover_image':
+                columns.append(cover_image)
+            else:
+                columns.append(f"t.{field}")
+    if search:
+        columns.append("f.rank AS rank")
+        source = f"{table}_fts f JOIN {table} t ON t.id = f.rowid"
+    else:
+        source = f"{table} t"
     
-    # Don't insert sample agents - only admin-added content will be available
-    # Check if agents exist
-    cursor.execute("SELECT COUNT(*) FROM agents")
-    if cursor.fetchone()[0] == 0:
-        # No sample agents will be added - only admin-added content will be available
-        pass
+    return f'''
+        SELECT {', '.join(columns)}
+        FROM {source}
+        LEFT JOIN builders b ON b.id = t.builder_id
+    '''
+
+def listing_to_dict(row):
+    """Convert a listing row to its API representation"""
+    item = dict(row)
+    # The search rank is only used for ordering
+    item.pop('rank', None)
+    if 'cover_image' in item:
+        # Cover-only listings skip decoding the full image list
+        item.pop('images', None)
+        return item
+    # Convert images from JSON string to list
+    if 'images' in item:
+        item['images'] = decode_images(item['images'])
+    return item
+
+def decode_images(value):
+    """A stored images column as a list"""
+    try:
+        return json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+
+def listing_converter(fields=None):
+    """Row converter for listing_query(fields=fields) rows"""
+    if fields is None:
+        return listing_to_dict
+    
+    # Every requested field is returned, images included even next to
+    # cover_image (the replacement only applies to whole rows)
+    def convert(row):
+        item = {field: row[field] for field in fields}
+        if 'images' in item:
+            item['images'] = decode_images(item['images'])
+        return item
+    return convert
+
+def search_match(q):
+    """Build an FTS5 MATCH expression from free text.
+
+    Every word must match, as a prefix so partial input finds results.
+    Returns None when q has no searchable words.
+    """
+    words = re.findall(r'\w+', q or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+def query_listings(cursor, table, conditions=None, params=(), search=False, cover=False, fields=None,
+                   all_columns=False):
+    """Raw listing rows matching the given SQL conditions"""
+    query = listing_query(table, search, cover, fields, all_columns)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if search:
+        query += " ORDER BY f.rank"
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+def fetch_listings(cursor, table, conditions=None, params=(), search=False, cover=False, fields=None,
+                   all_columns=False):
+    """Fetch listing rows matching the given SQL conditions"""
+    convert = listing_converter(fields)
+    rows = query_listings(cursor, table, conditions, params, search, cover, fields, all_columns)
+    return [convert(row) for row in rows]
+
+def fetch_listing(cursor, table, listing_id, fields=None):
+    """Fetch a single listing by id, or None if it doesn't exist"""
+    cursor.execute(listing_query(table, fields=fields) + " WHERE t.id = ?", (listing_id,))
+    row = cursor.fetchone()
+    return listing_converter(fields)(row) if row else None
+
+# Keyset pagination
+# List endpoints page on a (created_at, id) key instead of OFFSET so deep
+# pages cost the same as the first one. Tables without created_at page on id.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+LISTING_SORT = ('t.created_at', 't.id')
+SEARCH_SORT = ('f.rank', 't.id')
+CREATED_SORT = ('created_at', 'id')
+ID_SORT = ('id',)
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Decode a cursor produced by encode_cursor"""
+    padded = token + '=' * (-len(token) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list):
+        raise ValueError('cursor must encode a list')
+    # Each value is bound as a query parameter, so only ones SQLite can bind
+    for value in values:
+        if isinstance(value, float):
+            valid = math.isfinite(value)
+        else:
+            valid = isinstance(value, str) or is_id(value)
+        if not valid:
+            raise ValueError('cursor values must be strings or numbers')
+    return values
+
+def parse_page_args(sort_columns):
+    """Read limit/cursor query parameters.
+
+    Returns (page, error). page is None when the client didn't ask for
+    pagination, so existing callers keep receiving a plain list.
+    """
+    limit = request.args.get('limit')
+    token = request.args.get('cursor')
+    if limit is None and token is None:
+        return None, None
     
-    # Don't insert sample projects - only admin-added content will be available
-    # Check if projects exist
-    cursor.execute("SELECT COUNT(*) FROM projects")
-    if cursor.fetchone()[0] == 0:
-        # No sample projects will be added - only admin-added content will be available
-        pass
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        return None, 'limit must be an integer'
+    if limit < 1:
+        return None, 'limit must be positive'
+    limit = min(limit, MAX_PAGE_SIZE)
+    
+    after = None
+    if token:
+        try:
+            after = decode_cursor(token)
+        except (ValueError, binascii.Error):
+            return None, 'Invalid cursor'
+        if len(after) != len(sort_columns):
+            return None, 'Invalid cursor'
     
-    # Don't insert sample builders - only admin-added content will be available
-    # Check if builders exist
-    cursor.execute("SELECT COUNT(*) FROM builders")
-    if cursor.fetchone()[0] == 0:
-        # No sample builders will be added - only admin-added content will be available
-        pass
+    return (limit, after), None
+
+def page_rows(cursor, base_query, conditions, params, sort_columns, page, descending=False):
+    """Run base_query for one keyset page ordered by sort_columns.
+
+    Returns the raw rows and the cursor for the next page (None on the last).
+    """
+    limit, after = page
+    conditions = list(conditions or [])
+    params = list(params)
+    
+    if after is not None:
+        op = '<' if descending else '>'
+        placeholders = ', '.join('?' for _ in sort_columns)
+        conditions.append(f"({', '.join(sort_columns)}) {op} ({placeholders})")
+        params.extend(after)
+    
+    query = base_query
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    direction = " DESC" if descending else ""
+    query += " ORDER BY " + ", ".join(col + direction for col in sort_columns)
+    # Fetch one extra row to know whether another page exists
+    query += " LIMIT ?"
+    params.append(limit + 1)
     
-    # Don't insert default home content - only admin-added content will be available
-    # Check if home content exists
-    cursor.execute("SELECT COUNT(*) FROM home_content")
-    if cursor.fetchone()[0] == 0:
-        # No default home content will be added - only admin-added content will be available
-        pass
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
     
-    # Removed favorite initialization code
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[col.split('.')[-1]] for col in sort_columns])
     
-    conn.commit()
-    conn.close()
+    return rows, next_cursor
 
-def get_db_connection():
-    """Get a database connection"""
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row  # This enables column access by name
-    return conn
+def fetch_page(cursor, base_query, conditions, params, sort_columns, page,
+               descending=False, convert=dict):
+    """Run base_query for one keyset page as {'items': [...], 'next_cursor': ...}"""
+    rows, next_cursor = page_rows(cursor, base_query, conditions, params, sort_columns, page, descending)
+    return {'items': [convert(row) for row in rows], 'next_cursor': next_cursor}
+
+# JSON encoders for list endpoints (see serializers.py). They emit the same
+# keys as listing_to_dict / dict(row) without building the dicts.
+ROW_ENCODERS = {
+    'properties': RowEncoder({'images': decode_images}, drop=['rank'], replaces={'cover_image': 'images'}),
+    'projects': RowEncoder({'images': decode_images}, drop=['rank'], replaces={'cover_image': 'images'}),
+    'agents': RowEncoder(),
+    'builders': RowEncoder(),
+    'inquiries': RowEncoder(),
+}
+
+def rows_response(entity, cursor, rows, page=None, next_cursor=None, fields=None):
+    """JSON response for rows of cursor's last query; a page object when page is set"""
+    columns = [column[0] for column in cursor.description]
+    encoder = ROW_ENCODERS[entity]
+    if page:
+        body = encoder.encode_page(rows, columns, next_cursor, fields)
+    else:
+        body = encoder.encode(rows, columns, fields)
+    return app.response_class(body + b'\n', mimetype='application/json')
+
+def request_admin():
+    """Claims of the request's bearer token, or None if it has no valid one"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token_signer.verify(token.strip())
+
+def admin_required(view):
+    """Reject requests without a valid admin access token with 401"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        claims = request_admin()
+        if claims is None:
+            return jsonify({'message': 'Authentication required'}), 401
+        g.admin = claims
+        return view(*args, **kwargs)
+    return wrapper
 
 # Routes
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'OK', 'message': 'Real Estate API is running'})
 
+@app.route('/api/admin/cache/stats', methods=['GET'])
+@admin_required
+def cache_stats():
+    return jsonify(response_cache.stats())
+
+# Image uploads
+def media_to_dict(manifest):
+    """Manifest plus root-relative URLs for the original and every variant"""
+    key = manifest['key']
+    
+    def media_url(filename):
+        return url_for('serve_media', key=key, filename=filename)
+    
+    variants = {}
+    for name in VARIANTS:
+        variant = dict(manifest.get('variants', {}).get(name, {}))
+        variant.pop('files', None)
+        variant.update({ext: media_url(f'{name}.{ext}') for ext in FORMATS})
+        variants[name] = variant
+    
+    media = {
+        'key': key,
+        'status': manifest['status'],
+        'url': media_url('full.jpg'),
+        'original': media_url(manifest['original']),
+        'variants': variants,
+    }
+    for field in ('width', 'height', 'error'):
+        if field in manifest:
+            media[field] = manifest[field]
+    return media
+
+@app.route('/api/admin/media', methods=['POST'])
+@admin_required
+def upload_media():
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'message': 'No file uploaded'}), 400
+    
+    try:
+        manifest = media_pipeline.store(upload.stream)
+    except UploadError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    # Variant URLs are known up front; they become available once the
+    # background resize finishes (GET /media/... waits for it)
+    return jsonify(media_to_dict(manifest)), 200 if manifest['status'] == 'ready' else 202
+
+@app.route('/api/admin/media/<key>', methods=['GET'])
+@admin_required
+def get_media(key):
+    manifest = media_pipeline.manifest(key) if MEDIA_KEY_RE.match(key) else None
+    if manifest is None:
+        return jsonify({'message': 'Media not found'}), 404
+    return jsonify(media_to_dict(manifest))
+
+@app.route('/media/<key>/<filename>', methods=['GET'])
+def serve_media(key, filename):
+    if not MEDIA_KEY_RE.match(key) or filename == 'manifest.json':
+        return jsonify({'message': 'Media not found'}), 404
+    
+    # A variant requested right after upload may still be rendering
+    if not media_pipeline.wait(key, timeout=30):
+        return jsonify({'message': 'Media is still processing'}), 503
+    
+    # Files are content-addressed, so a URL never changes what it serves
+    response = send_from_directory(os.path.abspath(os.path.join(MEDIA_ROOT, key)), filename, max_age=31536000)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 # Removed favorite functionality and temporary endpoints
 
 # Admin Authentication
@@ -251,9 +1358,21 @@ def admin_login():
     
     conn.close()
     
-    if admin and admin['password_hash'] == hashlib.sha256(password.encode()).hexdigest():
+    # Unknown emails are checked against a dummy hash so they take as long
+    try:
+        matches, needs_rehash = password_hasher.verify(
+            password, admin['password_hash'] if admin else dummy_password_hash()
+        )
+    except HasherBusy:
+        return hasher_busy_response()
+    
+    if admin and matches:
+        if needs_rehash:
+            rehash_password(admin, password)
         return jsonify({
-            'access_token': 'sample_jwt_token',
+            'access_token': token_signer.issue({'sub': admin['id'], 'role': admin['role']}),
+            'token_type': 'Bearer',
+            'expires_in': token_signer.max_age,
             'admin': {
                 'id': admin['id'],
                 'name': admin['name'],
@@ -264,8 +1383,48 @@ def admin_login():
     
     return jsonify({'message': 'Invalid credentials'}), 401
 
+@lru_cache(maxsize=1)
+def dummy_password_hash():
+    return password_hasher.hash_now(uuid.uuid4().hex)
+
+def hasher_busy_response():
+    response = jsonify({'message': 'Too many login attempts in progress, try again shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+def rehash_password(admin, password):
+    """Store password under the current hash settings (legacy or outdated hash)"""
+    try:
+        password_hash = password_hasher.hash(password)
+    except HasherBusy:
+        # Tried again on the next login
+        return
+    
+    def write(db):
+        # Skip it if the password was changed in the meantime
+        db.execute("UPDATE admins SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                   (password_hash, admin['id'], admin['password_hash']))
+    
+    run_write(write, 'admins')
+
+@app.route('/api/admin/session', methods=['GET'])
+@admin_required
+def get_admin_session():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT id, name, email, role FROM admins WHERE id = ?", (g.admin['sub'],))
+    admin = cursor.fetchone()
+    conn.close()
+    
+    if not admin:
+        return jsonify({'message': 'Authentication required'}), 401
+    return jsonify({'admin': dict(admin)})
+
 # Admin Management Routes
 @app.route('/api/admin/register', methods=['POST'])
+@admin_required
 def register_admin():
     data = request.get_json()
     
@@ -283,21 +1442,27 @@ def register_admin():
         return jsonify({'message': 'Admin with this email already exists'}), 409
     
     # Create new admin
-    password_hash = hashlib.sha256(data['password'].encode()).hexdigest()
-    cursor.execute('''
-        INSERT INTO admins (name, email, password_hash, role, created_at)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (data['name'], data['email'], password_hash, data.get('role', 'admin'), datetime.now().isoformat()))
+    try:
+        password_hash = password_hasher.hash(data['password'])
+    except HasherBusy:
+        conn.close()
+        return hasher_busy_response()
     
-    admin_id = cursor.lastrowid
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO admins (name, email, password_hash, role, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (data['name'], data['email'], password_hash, data.get('role', 'admin'), datetime.now().isoformat()))
+        
+        admin_id = cursor.lastrowid
+        
+        return admin_id
     
-    # Add notification for admin creation
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('admin', f'New admin added: {data["name"]}', admin_id, data['name'], datetime.now().isoformat(), 0))
+    admin_id = run_write(write, 'admins')
     
-    conn.commit()
+    # Add notification for admin creation
+    add_notification('admin', f'New admin added: {data["name"]}', admin_id, data['name'])
     
     # Get the newly created admin
     cursor.execute("SELECT id, name, email, role, created_at FROM admins WHERE id = ?", (admin_id,))
@@ -307,18 +1472,28 @@ def register_admin():
     return jsonify(dict(new_admin)), 201
 
 @app.route('/api/admins', methods=['GET'])
+@admin_required
+@conditional_response('admins')
 def get_admins():
+    page, error = parse_page_args(ID_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT id, name, email, role, created_at FROM admins")
-    admins = [dict(row) for row in cursor.fetchall()]
+    if page:
+        admins = fetch_page(cursor, "SELECT id, name, email, role, created_at FROM admins", [], [], ID_SORT, page)
+    else:
+        cursor.execute("SELECT id, name, email, role, created_at FROM admins")
+        admins = [dict(row) for row in cursor.fetchall()]
     
     conn.close()
     
     return jsonify(admins)
 
 @app.route('/api/admins/<int:admin_id>', methods=['PUT'])
+@admin_required
 def update_admin(admin_id):
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -351,22 +1526,25 @@ def update_admin(admin_id):
         update_fields.append("role = ?")
         params.append(data['role'])
     if 'password' in data and data['password']:
-        password_hash = hashlib.sha256(data['password'].encode()).hexdigest()
+        try:
+            password_hash = password_hasher.hash(data['password'])
+        except HasherBusy:
+            conn.close()
+            return hasher_busy_response()
         update_fields.append("password_hash = ?")
         params.append(password_hash)
     
     if update_fields:
         update_query = f"UPDATE admins SET {', '.join(update_fields)} WHERE id = ?"
         params.append(admin_id)
-        cursor.execute(update_query, params)
+        
+        def write(db):
+            db.execute(update_query, params)
+        
+        run_write(write, 'admins')
         
         # Add notification for admin update
-        cursor.execute('''
-            INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('admin', f'Admin updated: {data.get("name", admin["name"])}', admin_id, data.get('name', admin['name']), datetime.now().isoformat(), 0))
-    
-    conn.commit()
+        add_notification('admin', f'Admin updated: {data.get("name", admin["name"])}', admin_id, data.get('name', admin['name']))
     
     # Get updated admin
     cursor.execute("SELECT id, name, email, role, created_at FROM admins WHERE id = ?", (admin_id,))
@@ -376,6 +1554,7 @@ def update_admin(admin_id):
     return jsonify(dict(updated_admin))
 
 @app.route('/api/admins/<int:admin_id>', methods=['DELETE'])
+@admin_required
 def delete_admin(admin_id):
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -393,219 +1572,334 @@ def delete_admin(admin_id):
         conn.close()
         return jsonify({'message': 'Admin not found'}), 404
     
-    # Remove admin
-    cursor.execute("DELETE FROM admins WHERE id = ?", (admin_id,))
+    def write(db):
+        # Remove admin
+        db.execute("DELETE FROM admins WHERE id = ?", (admin_id,))
+    
+    run_write(write, 'admins')
     
     # Add notification for admin deletion
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('admin', f'Admin deleted: {admin["name"]}', admin_id, admin['name'], datetime.now().isoformat(), 0))
+    add_notification('admin', f'Admin deleted: {admin["name"]}', admin_id, admin['name'])
     
-    conn.commit()
     conn.close()
     
     return jsonify({'message': 'Admin deleted successfully'})
 
 # Property Routes
 @app.route('/api/properties', methods=['GET'])
+@cached_response('properties', 'builders')
 def get_properties():
     # Get query parameters for filtering
-    property_type = request.args.get('type')
-    location = request.args.get('location')
-    status = request.args.get('status')
-    min_price = request.args.get('min_price')
-    max_price = request.args.get('max_price')
+    cover = request.args.get('images') == 'cover'
+    try:
+        filters = property_filters(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    match = 'q' in filters
+    
+    sort = SEARCH_SORT if match else LISTING_SORT
+    page, error = parse_page_args(sort)
+    if error:
+        return jsonify({'message': error}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    query = "SELECT * FROM properties"
-    params = []
+    conditions, params = filter_conditions(filters)
     
-    conditions = []
-    if property_type:
-        conditions.append("property_type = ?")
-        params.append(property_type)
+    fields, error = parse_fields(cursor, 'properties', cover)
+    if error:
+        conn.close()
+        return jsonify({'message': error}), 400
     
-    if location:
-        conditions.append("location LIKE ?")
-        params.append(f'%{location}%')
+    if page:
+        rows, next_cursor = page_rows(cursor, listing_query('properties', bool(match), cover, fields), conditions,
+                                      params, sort, page)
+    else:
+        rows = query_listings(cursor, 'properties', conditions, params, search=bool(match), cover=cover,
+                              fields=fields)
+        next_cursor = None
     
-    if status:
-        conditions.append("status = ?")
-        params.append(status)
+    response = rows_response('properties', cursor, rows, page, next_cursor, fields)
+    conn.close()
+    return response
+
+@app.route('/api/properties/<int:property_id>', methods=['GET'])
+@cached_response('properties', 'builders')
+def get_property(property_id):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    fields, error = parse_fields(cursor, 'properties')
+    if error:
+        conn.close()
+        return jsonify({'message': error}), 400
     
-    if min_price:
-        conditions.append("price >= ?")
-        params.append(float(min_price))
+    prop_dict = fetch_listing(cursor, 'properties', property_id, fields)
     
-    if max_price:
-        conditions.append("price <= ?")
-        params.append(float(max_price))
+    if prop_dict:
+        conn.close()
+        return jsonify(prop_dict)
     
+    conn.close()
+    return jsonify({'message': 'Property not found'}), 404
+
+# Facets reported by /api/properties/facets, with the column each groups by
+PROPERTY_FACETS = {
+    'type': 't.property_type',
+    'status': 't.status',
+    'location': 't.location',
+}
+# (key, min, max) price ranges in rupees; min is inclusive, max exclusive
+PRICE_BUCKETS = [
+    ('under_50l', None, 5000000),
+    ('50l_1cr', 5000000, 10000000),
+    ('1cr_2cr', 10000000, 20000000),
+    ('2cr_5cr', 20000000, 50000000),
+    ('over_5cr', 50000000, None),
+]
+# Most common values returned for facets with open-ended values
+FACET_LIMIT = 20
+# Search radius for near= when radius isn't given, in km
+DEFAULT_RADIUS_KM = 10
+
+def geo_filters(table, args):
+    """[(condition, params)] for the near/radius and bbox query parameters.
+
+    Candidates come from the table's R*Tree; near also checks the exact
+    distance. Raises ValueError for malformed coordinates.
+    """
+    clauses = []
+    boxes = []
+    # radius_km is accepted as another name for radius
+    radius = args.get('radius') or args.get('radius_km')
+    if radius and not args.get('near'):
+        raise ValueError('radius needs near')
+    if args.get('near'):
+        lat, lng, radius = geo.parse_near(args['near'], radius or DEFAULT_RADIUS_KM)
+        boxes.append(geo.radius_box(lat, lng, radius))
+        scale = geo.lng_scale(lat)
+        clauses.append((
+            "(t.latitude - ?) * (t.latitude - ?) + (t.longitude - ?) * (t.longitude - ?) * ? <= ?",
+            [lat, lat, lng, lng, scale * scale, (radius / geo.KM_PER_DEGREE) ** 2],
+        ))
+    if args.get('bbox'):
+        boxes.append(geo.parse_bbox(args['bbox']))
+    for min_lat, min_lng, max_lat, max_lng in boxes:
+        clauses.insert(0, (
+            f"t.id IN (SELECT id FROM {table}_geo"
+            " WHERE min_lat >= ? AND max_lat <= ? AND min_lng >= ? AND max_lng <= ?)",
+            [min_lat, max_lat, min_lng, max_lng],
+        ))
+    return clauses
+
+def property_filters(args):
+    """The property list filters in args as {facet: [(condition, params), ...]}.
+
+    Text search is under 'q', min_price/max_price under 'price' and
+    near/bbox under 'geo'. Raises ValueError for a malformed or non-finite
+    number.
+    """
+    filters = {}
+    match = search_match(args.get('q'))
+    if match:
+        filters['q'] = [("properties_fts MATCH ?", [match])]
+    if args.get('type'):
+        filters['type'] = [("t.property_type = ?", [args['type']])]
+    # location and city may be repeated; a listing matches if its location
+    # contains any of the values of each
+    for facet in ('location', 'city'):
+        terms = [term for term in args.getlist(facet) if term]
+        if terms:
+            filters[facet] = [(
+                "(" + " OR ".join("t.location LIKE ?" for _ in terms) + ")",
+                [f"%{term}%" for term in terms],
+            )]
+    if args.get('builder'):
+        if not args['builder'].isdigit():
+            raise ValueError('builder must be an id')
+        filters['builder'] = [("t.builder_id = ?", [int(args['builder'])])]
+    if args.get('status'):
+        filters['status'] = [("t.status = ?", [args['status']])]
+    price = []
+    for name, condition in (('min_price', "t.price >= ?"), ('max_price', "t.price <= ?")):
+        if not args.get(name):
+            continue
+        try:
+            value = float(args[name])
+        except ValueError:
+            value = math.nan
+        # nan would match nothing and inf everything
+        if not math.isfinite(value):
+            raise ValueError('min_price and max_price must be numbers')
+        price.append((condition, [value]))
+    if price:
+        filters['price'] = price
+    area = geo_filters('properties', args)
+    if area:
+        filters['geo'] = area
+    return filters
+
+def filter_conditions(filters, exclude=None):
+    """SQL conditions and params for every filter except the exclude facet"""
+    conditions = []
+    params = []
+    for facet, clauses in filters.items():
+        if facet == exclude:
+            continue
+        for condition, clause_params in clauses:
+            conditions.append(condition)
+            params.extend(clause_params)
+    return conditions, params
+
+def count_facet(cursor, source, filters, facet, expression, limit=None):
+    """[(value, count)] for expression over the rows matching every other filter"""
+    conditions, params = filter_conditions(filters, exclude=facet)
+    query = f"SELECT {expression} AS value, COUNT(*) AS count FROM {source}"
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
-    
+    query += " GROUP BY value ORDER BY count DESC, value"
+    if limit:
+        query += f" LIMIT {int(limit)}"
     cursor.execute(query, params)
-    properties = cursor.fetchall()
+    return [(row['value'], row['count']) for row in cursor.fetchall()]
+
+@app.route('/api/properties/facets', methods=['GET'])
+@cached_response('properties')
+def get_property_facets():
+    """Listing counts per type, status, location and price bucket.
+
+    Takes the same filters as /api/properties. Each facet is counted with
+    every filter applied except its own, so the counts show how many
+    listings picking another value would return.
+    """
+    try:
+        filters = property_filters(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
-    # Get builder names for each property
-    result = []
-    for prop in properties:
-        prop_dict = dict(prop)
-        # Convert images from JSON string to list
-        try:
-            prop_dict['images'] = json.loads(prop_dict['images']) if prop_dict['images'] else []
-        except:
-            prop_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if prop_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (prop_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                prop_dict['builder_name'] = builder['name']
-            else:
-                prop_dict['builder_name'] = ""
-        else:
-            prop_dict['builder_name'] = ""
-        
-        result.append(prop_dict)
+    if 'q' in filters:
+        source = "properties_fts f JOIN properties t ON t.id = f.rowid"
+    else:
+        source = "properties t"
     
-    conn.close()
-    return jsonify(result)
-
-@app.route('/api/properties/<int:property_id>', methods=['GET'])
-def get_property(property_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM properties WHERE id = ?", (property_id,))
-    property = cursor.fetchone()
+    # One read transaction so every count sees the same rows
+    cursor.execute("BEGIN")
     
-    if property:
-        prop_dict = dict(property)
-        # Convert images from JSON string to list
-        try:
-            prop_dict['images'] = json.loads(prop_dict['images']) if prop_dict['images'] else []
-        except:
-            prop_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if prop_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (prop_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                prop_dict['builder_name'] = builder['name']
-            else:
-                prop_dict['builder_name'] = ""
-        else:
-            prop_dict['builder_name'] = ""
-        
-        conn.close()
-        return jsonify(prop_dict)
+    conditions, params = filter_conditions(filters)
+    query = f"SELECT COUNT(*) FROM {source}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    total = cursor.execute(query, params).fetchone()[0]
+    
+    facets = {}
+    for facet, column in PROPERTY_FACETS.items():
+        limit = FACET_LIMIT if facet == 'location' else None
+        facets[facet] = [
+            {'value': value, 'count': count}
+            for value, count in count_facet(cursor, source, filters, facet, column, limit)
+        ]
+    
+    # Bucket index per row, counted in a single pass
+    cases = []
+    for index, (_, low, high) in enumerate(PRICE_BUCKETS):
+        bounds = []
+        if low is not None:
+            bounds.append(f"t.price >= {low}")
+        if high is not None:
+            bounds.append(f"t.price < {high}")
+        cases.append(f"WHEN {' AND '.join(bounds)} THEN {index}")
+    bucket_counts = dict(count_facet(cursor, source, filters, 'price', f"CASE {' '.join(cases)} END"))
+    facets['price'] = [
+        {'key': key, 'min': low, 'max': high, 'count': bucket_counts.get(index, 0)}
+        for index, (key, low, high) in enumerate(PRICE_BUCKETS)
+    ]
     
     conn.close()
-    return jsonify({'message': 'Property not found'}), 404
+    return jsonify({'total': total, 'facets': facets})
 
 # Protected Admin Routes
 @app.route('/api/admin/properties', methods=['GET'])
+@admin_required
+@conditional_response('properties', 'builders')
 def get_admin_properties():
-    # In a real app, this would require authentication
+    cover = request.args.get('images') == 'cover'
+    page, error = parse_page_args(LISTING_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM properties")
-    properties = cursor.fetchall()
-    
-    # Get builder names for each property
-    result = []
-    for prop in properties:
-        prop_dict = dict(prop)
-        # Convert images from JSON string to list
-        try:
-            prop_dict['images'] = json.loads(prop_dict['images']) if prop_dict['images'] else []
-        except:
-            prop_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if prop_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (prop_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                prop_dict['builder_name'] = builder['name']
-            else:
-                prop_dict['builder_name'] = ""
-        else:
-            prop_dict['builder_name'] = ""
-        
-        result.append(prop_dict)
+    if page:
+        rows, next_cursor = page_rows(cursor, listing_query('properties', cover=cover), [], [], LISTING_SORT, page)
+    else:
+        rows, next_cursor = query_listings(cursor, 'properties', cover=cover), None
     
+    response = rows_response('properties', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(result)
+    return response
 
 @app.route('/api/admin/properties', methods=['POST'])
+@admin_required
 def create_property():
-    # In a real app, this would require authentication
     data = request.get_json()
+    try:
+        coordinates = request_coordinates(data)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Get builder info if builder_id is provided
     builder_id = data.get('builder_id')
-    builder_name = ""
-    if builder_id:
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (builder_id,))
-        builder = cursor.fetchone()
-        if builder:
-            builder_name = builder['name']
     
     # Convert images list to JSON string
     images_json = json.dumps(data.get('images', []))
     
-    cursor.execute('''
-        INSERT INTO properties (title, description, price, location, property_type, 
-        status, bedrooms, bathrooms, area_sqft, builder_id, images, is_favorite, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data['title'], data.get('description', ''), float(data['price']), data['location'],
-        data['property_type'], data.get('status', 'Available'), 
-        data.get('bedrooms', 0), data.get('bathrooms', 0), 
-        data.get('area_sqft', 0), builder_id, images_json, data.get('is_favorite', 0), datetime.now().isoformat()
-    ))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO properties (title, description, price, location, property_type, 
+            status, bedrooms, bathrooms, area_sqft, builder_id, images, is_favorite, created_at,
+            latitude, longitude)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            data['title'], data.get('description', ''), float(data['price']), data['location'],
+            data['property_type'], data.get('status', 'Available'), 
+            data.get('bedrooms', 0), data.get('bathrooms', 0), 
+            data.get('area_sqft', 0), builder_id, images_json, data.get('is_favorite', 0), datetime.now().isoformat(),
+            coordinates.get('latitude'), coordinates.get('longitude')
+        ))
+        
+        property_id = cursor.lastrowid
+        
+        return property_id
     
-    property_id = cursor.lastrowid
+    property_id = run_write(write, 'properties')
     
     # Add notification for property creation
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('property', f'New property added: {data["title"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+    add_notification('property', f'New property added: {data["title"]}')
     
     # Get the newly created property
-    cursor.execute("SELECT * FROM properties WHERE id = ?", (property_id,))
-    new_property = cursor.fetchone()
+    prop_dict = fetch_listing(cursor, 'properties', property_id)
     conn.close()
     
-    prop_dict = dict(new_property)
-    # Convert images from JSON string to list
-    try:
-        prop_dict['images'] = json.loads(prop_dict['images']) if prop_dict['images'] else []
-    except:
-        prop_dict['images'] = []
-    
-    prop_dict['builder_name'] = builder_name
+    event_broker.publish('property', 'create', property_id, prop_dict)
     
     return jsonify(prop_dict), 201
 
 @app.route('/api/admin/properties/<int:property_id>', methods=['PUT'])
+@admin_required
 def update_property(property_id):
-    # In a real app, this would require authentication
     data = request.get_json()
+    try:
+        coordinates = request_coordinates(data)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -617,16 +1911,7 @@ def update_property(property_id):
         conn.close()
         return jsonify({'message': 'Property not found'}), 404
     
-    original_title = current_property['title']
-    
-    # Get builder info if builder_id is provided
-    builder_id = data.get('builder_id')
-    builder_name = current_property['builder_name'] if current_property['builder_name'] else ""
-    if builder_id and builder_id != current_property['builder_id']:
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (builder_id,))
-        builder = cursor.fetchone()
-        if builder:
-            builder_name = builder['name']
+    original_title = current_property['title']
     
     # Prepare update fields
     update_fields = []
@@ -659,6 +1944,9 @@ def update_property(property_id):
     if 'area_sqft' in data:
         update_fields.append("area_sqft = ?")
         params.append(data['area_sqft'])
+    for field, value in coordinates.items():
+        update_fields.append(f"{field} = ?")
+        params.append(value)
     if 'builder_id' in data:
         update_fields.append("builder_id = ?")
         params.append(data['builder_id'])
@@ -674,50 +1962,30 @@ def update_property(property_id):
     if update_fields:
         update_query = f"UPDATE properties SET {', '.join(update_fields)} WHERE id = ?"
         params.append(property_id)
-        cursor.execute(update_query, params)
+        
+        def write(db):
+            db.execute(update_query, params)
+        
+        run_write(write, 'properties')
         
         # Add notification for property update
-        cursor.execute('''
-            INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('property', f'Property updated: {data.get("title", original_title)}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+        add_notification('property', f'Property updated: {data.get("title", original_title)}')
     
     # Get updated property
-    cursor.execute("SELECT * FROM properties WHERE id = ?", (property_id,))
-    updated_property = cursor.fetchone()
+    prop_dict = fetch_listing(cursor, 'properties', property_id)
     
     conn.close()
     
-    if not updated_property:
+    if not prop_dict:
         return jsonify({'message': 'Property not found after update'}), 404
     
-    # Get builder name for updated property
-    updated_builder_name = ""
-    if updated_property['builder_id']:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (updated_property['builder_id'],))
-        builder = cursor.fetchone()
-        if builder:
-            updated_builder_name = builder['name']
-        conn.close()
-    
-    prop_dict = dict(updated_property)
-    # Convert images from JSON string to list
-    try:
-        prop_dict['images'] = json.loads(prop_dict['images']) if prop_dict['images'] else []
-    except:
-        prop_dict['images'] = []
-    
-    prop_dict['builder_name'] = updated_builder_name
+    event_broker.publish('property', 'update', property_id, prop_dict)
     
     return jsonify(prop_dict)
 
 @app.route('/api/admin/properties/<int:property_id>', methods=['DELETE'])
+@admin_required
 def delete_property(property_id):
-    # In a real app, this would require authentication
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -727,50 +1995,64 @@ def delete_property(property_id):
         conn.close()
         return jsonify({'message': 'Property not found'}), 404
     
-    # Remove property
-    cursor.execute("DELETE FROM properties WHERE id = ?", (property_id,))
+    def write(db):
+        # Remove property
+        db.execute("DELETE FROM properties WHERE id = ?", (property_id,))
+    
+    run_write(write, 'properties')
     
     # Add notification for property deletion
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('property', f'Property deleted: {property["title"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
+    add_notification('property', f'Property deleted: {property["title"]}')
     
-    conn.commit()
     conn.close()
     
+    event_broker.publish('property', 'delete', property_id)
+    
     return jsonify({'message': 'Property deleted successfully'})
 
 # Favorite functionality removed
 
 # Agent Routes
 @app.route('/api/agents', methods=['GET'])
+@cached_response('agents')
 def get_agents():
     # Get query parameters for filtering
     search_name = request.args.get('name')
     
+    page, error = parse_page_args(ID_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    query = "SELECT * FROM agents"
+    query = select_public('agents')
     params = []
+    conditions = []
     
     if search_name:
-        query += " WHERE name LIKE ?"
+        conditions.append("name LIKE ?")
         params.append(f'%{search_name}%')
     
-    cursor.execute(query, params)
-    agents = [dict(row) for row in cursor.fetchall()]
+    if page:
+        rows, next_cursor = page_rows(cursor, query, conditions, params, ID_SORT, page)
+    else:
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor.execute(query, params)
+        rows, next_cursor = cursor.fetchall(), None
     
+    response = rows_response('agents', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(agents)
+    return response
 
 @app.route('/api/agents/<int:agent_id>', methods=['GET'])
+@cached_response('agents')
 def get_agent(agent_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+    cursor.execute(select_public('agents') + " WHERE id = ?", (agent_id,))
     agent = cursor.fetchone()
     
     if agent:
@@ -782,62 +2064,74 @@ def get_agent(agent_id):
 
 # Admin Agent Management Routes
 @app.route('/api/admin/agents', methods=['GET'])
+@admin_required
+@conditional_response('agents')
 def get_admin_agents():
-    # In a real app, this would require authentication
+    page, error = parse_page_args(ID_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM agents")
-    agents = [dict(row) for row in cursor.fetchall()]
+    if page:
+        rows, next_cursor = page_rows(cursor, select_public('agents'), [], [], ID_SORT, page)
+    else:
+        cursor.execute(select_public('agents'))
+        rows, next_cursor = cursor.fetchall(), None
     
+    response = rows_response('agents', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(agents)
+    return response
 
 @app.route('/api/admin/agents', methods=['POST'])
+@admin_required
 def create_agent():
-    # In a real app, this would require authentication
     data = request.get_json()
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-        INSERT INTO agents (name, email, phone, position, experience, properties_sold, image, bio, is_favorite)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data['name'], data.get('email', ''), data.get('phone', ''), 
-        data.get('position', ''), data.get('experience', ''), 
-        data.get('properties_sold', 0), data.get('image', ''), 
-        data.get('bio', ''), data.get('is_favorite', 0)
-    ))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO agents (name, email, phone, position, experience, properties_sold, image, bio, is_favorite)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            data['name'], data.get('email', ''), data.get('phone', ''), 
+            data.get('position', ''), data.get('experience', ''), 
+            data.get('properties_sold', 0), data.get('image', ''), 
+            data.get('bio', ''), data.get('is_favorite', 0)
+        ))
+        
+        agent_id = cursor.lastrowid
+        
+        return agent_id
     
-    agent_id = cursor.lastrowid
+    agent_id = run_write(write, 'agents')
     
     # Add notification for agent creation
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('agent', f'New agent added: {data["name"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+    add_notification('agent', f'New agent added: {data["name"]}')
     
     # Get the newly created agent
-    cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+    cursor.execute(select_public('agents') + " WHERE id = ?", (agent_id,))
     new_agent = cursor.fetchone()
     conn.close()
     
+    event_broker.publish('agent', 'create', agent_id, dict(new_agent))
+    
     return jsonify(dict(new_agent)), 201
 
 @app.route('/api/admin/agents/<int:agent_id>', methods=['PUT'])
+@admin_required
 def update_agent(agent_id):
-    # In a real app, this would require authentication
     data = request.get_json()
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
     # Get current agent to get original name
-    cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+    cursor.execute(select_public('agents') + " WHERE id = ?", (agent_id,))
     current_agent = cursor.fetchone()
     if not current_agent:
         conn.close()
@@ -880,69 +2174,81 @@ def update_agent(agent_id):
     if update_fields:
         update_query = f"UPDATE agents SET {', '.join(update_fields)} WHERE id = ?"
         params.append(agent_id)
-        cursor.execute(update_query, params)
+        
+        def write(db):
+            db.execute(update_query, params)
+        
+        run_write(write, 'agents')
         
         # Add notification for agent update
-        cursor.execute('''
-            INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('agent', f'Agent updated: {data.get("name", original_name)}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+        add_notification('agent', f'Agent updated: {data.get("name", original_name)}')
     
     # Get updated agent
-    cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+    cursor.execute(select_public('agents') + " WHERE id = ?", (agent_id,))
     updated_agent = cursor.fetchone()
     conn.close()
     
+    event_broker.publish('agent', 'update', agent_id, dict(updated_agent))
+    
     return jsonify(dict(updated_agent))
 
 @app.route('/api/admin/agents/<int:agent_id>', methods=['DELETE'])
+@admin_required
 def delete_agent(agent_id):
-    # In a real app, this would require authentication
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+    cursor.execute(select_public('agents') + " WHERE id = ?", (agent_id,))
     agent = cursor.fetchone()
     if not agent:
         conn.close()
         return jsonify({'message': 'Agent not found'}), 404
     
-    # Remove agent
-    cursor.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+    def write(db):
+        # Remove agent
+        db.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+    
+    run_write(write, 'agents')
     
     # Add notification for agent deletion
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('agent', f'Agent deleted: {agent["name"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
+    add_notification('agent', f'Agent deleted: {agent["name"]}')
     
-    conn.commit()
     conn.close()
     
+    event_broker.publish('agent', 'delete', agent_id)
+    
     return jsonify({'message': 'Agent deleted successfully'})
 
 # Agent favorite functionality removed
 
 # Builder Routes
 @app.route('/api/builders', methods=['GET'])
+@cached_response('builders')
 def get_builders():
+    page, error = parse_page_args(ID_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM builders")
-    builders = [dict(row) for row in cursor.fetchall()]
+    if page:
+        rows, next_cursor = page_rows(cursor, select_public('builders'), [], [], ID_SORT, page)
+    else:
+        cursor.execute(select_public('builders'))
+        rows, next_cursor = cursor.fetchall(), None
     
+    response = rows_response('builders', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(builders)
+    return response
 
 @app.route('/api/builders/<int:builder_id>', methods=['GET'])
+@cached_response('builders')
 def get_builder(builder_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM builders WHERE id = ?", (builder_id,))
+    cursor.execute(select_public('builders') + " WHERE id = ?", (builder_id,))
     builder = cursor.fetchone()
     
     if builder:
@@ -954,57 +2260,69 @@ def get_builder(builder_id):
 
 # Admin Builder Management Routes
 @app.route('/api/admin/builders', methods=['GET'])
+@admin_required
+@conditional_response('builders')
 def get_admin_builders():
-    # In a real app, this would require authentication
+    page, error = parse_page_args(ID_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM builders")
-    builders = [dict(row) for row in cursor.fetchall()]
+    if page:
+        rows, next_cursor = page_rows(cursor, select_public('builders'), [], [], ID_SORT, page)
+    else:
+        cursor.execute(select_public('builders'))
+        rows, next_cursor = cursor.fetchall(), None
     
+    response = rows_response('builders', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(builders)
+    return response
 
 @app.route('/api/admin/builders', methods=['POST'])
+@admin_required
 def create_builder():
-    # In a real app, this would require authentication
     data = request.get_json()
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-        INSERT INTO builders (name, projects_count, image, description)
-        VALUES (?, ?, ?, ?)
-    ''', (data['name'], data.get('projects_count', 0), data.get('image', ''), data.get('description', '')))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO builders (name, projects_count, image, description)
+            VALUES (?, ?, ?, ?)
+        ''', (data['name'], data.get('projects_count', 0), data.get('image', ''), data.get('description', '')))
+        
+        builder_id = cursor.lastrowid
+        
+        return builder_id
     
-    builder_id = cursor.lastrowid
+    builder_id = run_write(write, 'builders')
     
     # Add notification for builder creation
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('builder', f'New builder added: {data["name"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+    add_notification('builder', f'New builder added: {data["name"]}')
     
     # Get the newly created builder
-    cursor.execute("SELECT * FROM builders WHERE id = ?", (builder_id,))
+    cursor.execute(select_public('builders') + " WHERE id = ?", (builder_id,))
     new_builder = cursor.fetchone()
     conn.close()
     
+    event_broker.publish('builder', 'create', builder_id, dict(new_builder))
+    
     return jsonify(dict(new_builder)), 201
 
 @app.route('/api/admin/builders/<int:builder_id>', methods=['PUT'])
+@admin_required
 def update_builder(builder_id):
-    # In a real app, this would require authentication
     data = request.get_json()
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
     # Get current builder to get original name
-    cursor.execute("SELECT * FROM builders WHERE id = ?", (builder_id,))
+    cursor.execute(select_public('builders') + " WHERE id = ?", (builder_id,))
     current_builder = cursor.fetchone()
     if not current_builder:
         conn.close()
@@ -1032,135 +2350,128 @@ def update_builder(builder_id):
     if update_fields:
         update_query = f"UPDATE builders SET {', '.join(update_fields)} WHERE id = ?"
         params.append(builder_id)
-        cursor.execute(update_query, params)
+        
+        def write(db):
+            db.execute(update_query, params)
+        
+        run_write(write, 'builders')
         
         # Add notification for builder update
-        cursor.execute('''
-            INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('builder', f'Builder updated: {data.get("name", original_name)}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+        add_notification('builder', f'Builder updated: {data.get("name", original_name)}')
     
     # Get updated builder
-    cursor.execute("SELECT * FROM builders WHERE id = ?", (builder_id,))
+    cursor.execute(select_public('builders') + " WHERE id = ?", (builder_id,))
     updated_builder = cursor.fetchone()
     conn.close()
     
+    event_broker.publish('builder', 'update', builder_id, dict(updated_builder))
+    
     return jsonify(dict(updated_builder))
 
 @app.route('/api/admin/builders/<int:builder_id>', methods=['DELETE'])
+@admin_required
 def delete_builder(builder_id):
-    # In a real app, this would require authentication
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM builders WHERE id = ?", (builder_id,))
+    cursor.execute(select_public('builders') + " WHERE id = ?", (builder_id,))
     builder = cursor.fetchone()
     if not builder:
         conn.close()
         return jsonify({'message': 'Builder not found'}), 404
     
-    # Remove builder
-    cursor.execute("DELETE FROM builders WHERE id = ?", (builder_id,))
+    def write(db):
+        # Remove builder
+        db.execute("DELETE FROM builders WHERE id = ?", (builder_id,))
+    
+    run_write(write, 'builders')
     
     # Add notification for builder deletion
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('builder', f'Builder deleted: {builder["name"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
+    add_notification('builder', f'Builder deleted: {builder["name"]}')
     
-    conn.commit()
     conn.close()
     
+    event_broker.publish('builder', 'delete', builder_id)
+    
     return jsonify({'message': 'Builder deleted successfully'})
 
 # Project Routes
 @app.route('/api/projects', methods=['GET'])
+@cached_response('projects', 'builders')
 def get_projects():
     # Get query parameters for filtering
+    match = search_match(request.args.get('q'))
+    cover = request.args.get('images') == 'cover'
     status = request.args.get('status')
     location = request.args.get('location')
     tag = request.args.get('tag')
+    try:
+        area = geo_filters('projects', request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    sort = SEARCH_SORT if match else LISTING_SORT
+    page, error = parse_page_args(sort)
+    if error:
+        return jsonify({'message': error}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    query = "SELECT * FROM projects"
     params = []
     
     conditions = []
+    if match:
+        conditions.append("projects_fts MATCH ?")
+        params.append(match)
+    
     if status:
-        conditions.append("status = ?")
+        conditions.append("t.status = ?")
         params.append(status)
     
     if location:
-        conditions.append("location LIKE ?")
+        conditions.append("t.location LIKE ?")
         params.append(f'%{location}%')
     
     if tag:
-        conditions.append("tag = ?")
+        conditions.append("t.tag = ?")
         params.append(tag)
     
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
+    for condition, area_params in area:
+        conditions.append(condition)
+        params.extend(area_params)
     
-    cursor.execute(query, params)
-    projects = cursor.fetchall()
+    fields, error = parse_fields(cursor, 'projects', cover)
+    if error:
+        conn.close()
+        return jsonify({'message': error}), 400
     
-    # Get builder names for each project
-    result = []
-    for project in projects:
-        proj_dict = dict(project)
-        # Convert images from JSON string to list
-        try:
-            proj_dict['images'] = json.loads(proj_dict['images']) if proj_dict['images'] else []
-        except:
-            proj_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if proj_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (proj_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                proj_dict['builder_name'] = builder['name']
-            else:
-                proj_dict['builder_name'] = ""
-        else:
-            proj_dict['builder_name'] = ""
-        
-        result.append(proj_dict)
+    if page:
+        rows, next_cursor = page_rows(cursor, listing_query('projects', bool(match), cover, fields), conditions,
+                                      params, sort, page)
+    else:
+        rows = query_listings(cursor, 'projects', conditions, params, search=bool(match), cover=cover,
+                              fields=fields)
+        next_cursor = None
     
+    response = rows_response('projects', cursor, rows, page, next_cursor, fields)
     conn.close()
-    return jsonify(result)
+    return response
 
 @app.route('/api/projects/<int:project_id>', methods=['GET'])
+@cached_response('projects', 'builders')
 def get_project(project_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-    project = cursor.fetchone()
+    fields, error = parse_fields(cursor, 'projects')
+    if error:
+        conn.close()
+        return jsonify({'message': error}), 400
     
-    if project:
-        proj_dict = dict(project)
-        # Convert images from JSON string to list
-        try:
-            proj_dict['images'] = json.loads(proj_dict['images']) if proj_dict['images'] else []
-        except:
-            proj_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if proj_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (proj_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                proj_dict['builder_name'] = builder['name']
-            else:
-                proj_dict['builder_name'] = ""
-        else:
-            proj_dict['builder_name'] = ""
-        
+    proj_dict = fetch_listing(cursor, 'projects', project_id, fields)
+    
+    if proj_dict:
         conn.close()
         return jsonify(proj_dict)
     
@@ -1169,105 +2480,86 @@ def get_project(project_id):
 
 # Admin Project Management Routes
 @app.route('/api/admin/projects', methods=['GET'])
+@admin_required
+@conditional_response('projects', 'builders')
 def get_admin_projects():
-    # In a real app, this would require authentication
+    cover = request.args.get('images') == 'cover'
+    page, error = parse_page_args(LISTING_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM projects")
-    projects = cursor.fetchall()
-    
-    # Get builder names for each project
-    result = []
-    for project in projects:
-        proj_dict = dict(project)
-        # Convert images from JSON string to list
-        try:
-            proj_dict['images'] = json.loads(proj_dict['images']) if proj_dict['images'] else []
-        except:
-            proj_dict['images'] = []
-        
-        # Get builder name if builder_id exists
-        if proj_dict['builder_id']:
-            cursor.execute("SELECT name FROM builders WHERE id = ?", (proj_dict['builder_id'],))
-            builder = cursor.fetchone()
-            if builder:
-                proj_dict['builder_name'] = builder['name']
-            else:
-                proj_dict['builder_name'] = ""
-        else:
-            proj_dict['builder_name'] = ""
-        
-        result.append(proj_dict)
+    if page:
+        rows, next_cursor = page_rows(cursor, listing_query('projects', cover=cover), [], [], LISTING_SORT, page)
+    else:
+        rows, next_cursor = query_listings(cursor, 'projects', cover=cover), None
     
+    response = rows_response('projects', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(result)
+    return response
 
 @app.route('/api/admin/projects', methods=['POST'])
+@admin_required
 def create_project():
-    # In a real app, this would require authentication
     data = request.get_json()
+    try:
+        coordinates = request_coordinates(data)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Get builder info if builder_id is provided
     builder_id = data.get('builder_id')
-    builder_name = ""
-    if builder_id:
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (builder_id,))
-        builder = cursor.fetchone()
-        if builder:
-            builder_name = builder['name']
     
     # Convert images list to JSON string
     images_json = json.dumps(data.get('images', []))
     
-    cursor.execute('''
-        INSERT INTO projects (title, description, location, status, completion_date, 
-        total_units, builder_id, images, tag, is_favorite, created_at, type, area, 
-        price_range, address, city, state, pincode)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data['title'], data.get('description', ''), data['location'], 
-        data.get('status', 'Available'), data.get('completion_date', ''), 
-        data.get('total_units', 0), builder_id, images_json, 
-        data.get('tag', 'available'), data.get('is_favorite', 0), datetime.now().isoformat(), 
-        data.get('type', ''), data.get('area', ''), data.get('price_range', ''), 
-        data.get('address', ''), data.get('city', ''), 
-        data.get('state', ''), data.get('pincode', '')
-    ))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO projects (title, description, location, status, completion_date, 
+            total_units, builder_id, images, tag, is_favorite, created_at, type, area, 
+            price_range, address, city, state, pincode, latitude, longitude)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            data['title'], data.get('description', ''), data['location'], 
+            data.get('status', 'Available'), data.get('completion_date', ''), 
+            data.get('total_units', 0), builder_id, images_json, 
+            data.get('tag', 'available'), data.get('is_favorite', 0), datetime.now().isoformat(), 
+            data.get('type', ''), data.get('area', ''), data.get('price_range', ''), 
+            data.get('address', ''), data.get('city', ''), 
+            data.get('state', ''), data.get('pincode', ''),
+            coordinates.get('latitude'), coordinates.get('longitude')
+        ))
+        
+        project_id = cursor.lastrowid
+        
+        return project_id
     
-    project_id = cursor.lastrowid
+    project_id = run_write(write, 'projects')
     
     # Add notification for project creation
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('project', f'New project added: {data["title"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+    add_notification('project', f'New project added: {data["title"]}')
     
     # Get the newly created project
-    cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-    new_project = cursor.fetchone()
+    proj_dict = fetch_listing(cursor, 'projects', project_id)
     conn.close()
     
-    proj_dict = dict(new_project)
-    # Convert images from JSON string to list
-    try:
-        proj_dict['images'] = json.loads(proj_dict['images']) if proj_dict['images'] else []
-    except:
-        proj_dict['images'] = []
-    
-    proj_dict['builder_name'] = builder_name
+    event_broker.publish('project', 'create', project_id, proj_dict)
     
     return jsonify(proj_dict), 201
 
 @app.route('/api/admin/projects/<int:project_id>', methods=['PUT'])
+@admin_required
 def update_project(project_id):
-    # In a real app, this would require authentication
     data = request.get_json()
+    try:
+        coordinates = request_coordinates(data)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -1281,15 +2573,6 @@ def update_project(project_id):
     
     original_title = current_project['title']
     
-    # Get builder info if builder_id is provided
-    builder_id = data.get('builder_id')
-    builder_name = current_project['builder_name'] if current_project['builder_name'] else ""
-    if builder_id and builder_id != current_project['builder_id']:
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (builder_id,))
-        builder = cursor.fetchone()
-        if builder:
-            builder_name = builder['name']
-    
     # Prepare update fields
     update_fields = []
     params = []
@@ -1347,48 +2630,34 @@ def update_project(project_id):
     if 'pincode' in data:
         update_fields.append("pincode = ?")
         params.append(data['pincode'])
+    for field, value in coordinates.items():
+        update_fields.append(f"{field} = ?")
+        params.append(value)
     
     if update_fields:
         update_query = f"UPDATE projects SET {', '.join(update_fields)} WHERE id = ?"
         params.append(project_id)
-        cursor.execute(update_query, params)
+        
+        def write(db):
+            db.execute(update_query, params)
+        
+        run_write(write, 'projects')
         
         # Add notification for project update
-        cursor.execute('''
-            INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', ('project', f'Project updated: {data.get("title", original_title)}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
+        add_notification('project', f'Project updated: {data.get("title", original_title)}')
     
     # Get updated project
-    cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-    updated_project = cursor.fetchone()
-    
-    # Get builder name for updated project
-    updated_builder_name = ""
-    if updated_project['builder_id']:
-        cursor.execute("SELECT name FROM builders WHERE id = ?", (updated_project['builder_id'],))
-        builder = cursor.fetchone()
-        if builder:
-            updated_builder_name = builder['name']
+    proj_dict = fetch_listing(cursor, 'projects', project_id)
     
     conn.close()
     
-    proj_dict = dict(updated_project)
-    # Convert images from JSON string to list
-    try:
-        proj_dict['images'] = json.loads(proj_dict['images']) if proj_dict['images'] else []
-    except:
-        proj_dict['images'] = []
-    
-    proj_dict['builder_name'] = updated_builder_name
+    event_broker.publish('project', 'update', project_id, proj_dict)
     
     return jsonify(proj_dict)
 
 @app.route('/api/admin/projects/<int:project_id>', methods=['DELETE'])
+@admin_required
 def delete_project(project_id):
-    # In a real app, this would require authentication
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -1398,111 +2667,684 @@ def delete_project(project_id):
         conn.close()
         return jsonify({'message': 'Project not found'}), 404
     
-    # Remove project
-    cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+    def write(db):
+        # Remove project
+        db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+    
+    run_write(write, 'projects')
     
     # Add notification for project deletion
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('project', f'Project deleted: {project["title"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
+    add_notification('project', f'Project deleted: {project["title"]}')
     
-    conn.commit()
     conn.close()
     
+    event_broker.publish('project', 'delete', project_id)
+    
     return jsonify({'message': 'Project deleted successfully'})
 
 # Project favorite functionality removed
 
-# Home Content Management Routes
-@app.route('/api/admin/home-content', methods=['GET'])
-def get_home_content():
-    # In a real app, this would require authentication
+# Bulk Routes
+def images_json(value):
+    """Images as a JSON array string; accepts a list or an encoded list (CSV)"""
+    if isinstance(value, str):
+        value = json.loads(value) if value else []
+    if not isinstance(value, list):
+        raise ValueError('images must be a list')
+    return json.dumps(value)
+
+def coordinate(value, bound, name):
+    """value as a float within +-bound, or None when not given; ValueError otherwise"""
+    if value in (None, ''):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a number')
+    # Also rejects nan
+    if not -bound <= value <= bound:
+        raise ValueError(f'{name} must be between -{bound} and {bound}')
+    return value
+
+def latitude(value):
+    return coordinate(value, 90, 'latitude')
+
+def longitude(value):
+    return coordinate(value, 180, 'longitude')
+
+def request_coordinates(data):
+    """The latitude/longitude keys present in data, converted; ValueError if invalid"""
+    return {
+        field: convert(data[field])
+        for field, convert in (('latitude', latitude), ('longitude', longitude))
+        if field in data
+    }
+
+# Writable columns of each bulk table as column -> (default on create,
+# converter for incoming values). Items are validated against this before
+# anything is written; required columns are the table's NOT NULL ones.
+BULK_TABLES = {
+    'properties': {
+        'entity': 'property',
+        'required': ['title', 'price', 'location', 'property_type'],
+        'columns': {
+            'title': ('', None),
+            'description': ('', None),
+            'price': (0, float),
+            'location': ('', None),
+            'property_type': ('', None),
+            'status': ('Available', None),
+            'bedrooms': (0, None),
+            'bathrooms': (0, None),
+            'area_sqft': (0, None),
+            'builder_id': (None, None),
+            'images': ([], images_json),
+            'is_favorite': (0, None),
+            'latitude': (None, latitude),
+            'longitude': (None, longitude),
+        },
+        'created_at': True,
+    },
+    'projects': {
+        'entity': 'project',
+        'required': ['title', 'location'],
+        'columns': {
+            'title': ('', None),
+            'description': ('', None),
+            'location': ('', None),
+            'status': ('Available', None),
+            'completion_date': ('', None),
+            'total_units': (0, None),
+            'builder_id': (None, None),
+            'images': ([], images_json),
+            'tag': ('available', None),
+            'is_favorite': (0, None),
+            'type': ('', None),
+            'area': ('', None),
+            'price_range': ('', None),
+            'address': ('', None),
+            'city': ('', None),
+            'state': ('', None),
+            'pincode': ('', None),
+            'latitude': (None, latitude),
+            'longitude': (None, longitude),
+        },
+        'created_at': True,
+    },
+    'agents': {
+        'entity': 'agent',
+        'required': ['name'],
+        'columns': {
+            'name': ('', None),
+            'email': ('', None),
+            'phone': ('', None),
+            'position': ('', None),
+            'experience': ('', None),
+            'properties_sold': (0, None),
+            'image': ('', None),
+            'bio': ('', None),
+            'is_favorite': (0, None),
+        },
+        'created_at': False,
+    },
+    # Only used by the inquiry import
+    'inquiries': {
+        'entity': 'inquiry',
+        'required': ['user_name', 'email'],
+        'columns': {
+            'user_name': ('', None),
+            'email': ('', None),
+            'phone': ('', None),
+            'property_id': (None, None),
+            'message': ('', None),
+            'status': ('pending', None),
+        },
+        'created_at': True,
+    },
+}
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 10000))
+# SQLite INTEGER range; larger ints fail at binding time
+SQLITE_INT_MIN, SQLITE_INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+def is_id(value):
+    # bool is an int subclass, but true is not id 1
+    return isinstance(value, int) and not isinstance(value, bool) and SQLITE_INT_MIN <= value <= SQLITE_INT_MAX
+
+def sqlite_scalar(value):
+    """Whether value can be bound as a column value"""
+    if isinstance(value, int):
+        return SQLITE_INT_MIN <= value <= SQLITE_INT_MAX
+    return value is None or isinstance(value, (str, float))
+
+def bulk_items(key):
+    """The request's item list (a JSON array or {key: [...]}), or (None, error)"""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list) or not data:
+        return None, f'Expected a non-empty list of {key}'
+    if len(data) > BULK_MAX_ITEMS:
+        return None, f'At most {BULK_MAX_ITEMS} {key} per request'
+    return data, None
+
+def bulk_values(spec, item, fields):
+    """Convert item's values for fields, raising ValueError naming a bad field"""
+    values = []
+    for field in fields:
+        default, convert = spec['columns'][field]
+        value = item.get(field, default)
+        if field in spec['required'] and value in (None, ''):
+            raise ValueError(f'Missing {field}')
+        if convert is not None:
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                raise ValueError(f'Invalid value for {field}')
+        if not sqlite_scalar(value):
+            raise ValueError(f'Invalid value for {field}')
+        values.append(value)
+    return values
+
+def prepare_insert(spec, item, now):
+    """Column values for inserting item, raising ValueError with the reason it's invalid"""
+    if not isinstance(item, dict):
+        raise ValueError('Item must be an object')
+    missing = [field for field in spec['required'] if item.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f'Missing {", ".join(missing)}')
+    values = bulk_values(spec, item, list(spec['columns']))
+    if spec['created_at']:
+        created_at = item.get('created_at') or now
+        if not isinstance(created_at, str):
+            raise ValueError('Invalid value for created_at')
+        values.append(created_at)
+    return values
+
+def insert_columns(spec):
+    """The columns prepare_insert returns values for, in order"""
+    return list(spec['columns']) + (['created_at'] if spec['created_at'] else [])
+
+def insert_statement(table, spec):
+    columns = insert_columns(spec)
+    placeholders = ', '.join('?' for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+def insert_rows(table, spec, rows):
+    """Insert prepared rows in one transaction; returns the id of the first"""
+    def write(db):
+        db.executemany(insert_statement(table, spec), rows)
+        # The writer holds the write lock and ids are AUTOINCREMENT, so
+        # the batch got consecutive ids ending at the last insert
+        return db.execute("SELECT last_insert_rowid()").fetchone()[0]
+    
+    return run_write(write, table) - len(rows) + 1
+
+def existing_ids(cursor, table, ids):
+    """The subset of ids present in table"""
+    found = set()
+    ids = list(ids)
+    # Stay well under SQLite's limit on bound parameters
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        placeholders = ', '.join('?' for _ in chunk)
+        cursor.execute(f"SELECT id FROM {table} WHERE id IN ({placeholders})", chunk)
+        found.update(row['id'] for row in cursor.fetchall())
+    return found
+
+def bulk_response(results, status):
+    errors = sum(1 for result in results if result['status'] == 'error')
+    if errors == len(results):
+        status = 400
+    elif errors:
+        status = 207
+    return jsonify({'results': results, 'errors': errors}), status
+
+@app.route('/api/admin/<any(properties, projects, agents):table>/bulk', methods=['POST'])
+@admin_required
+def bulk_create(table):
+    spec = BULK_TABLES[table]
+    items, error = bulk_items(table)
+    if error:
+        return jsonify({'message': error}), 400
+    
+    # Validate everything before writing anything
+    results = [None] * len(items)
+    rows = []
+    now = datetime.now().isoformat()
+    for index, item in enumerate(items):
+        try:
+            rows.append((index, prepare_insert(spec, item, now)))
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+    
+    if rows:
+        first_id = insert_rows(table, spec, [values for _, values in rows])
+        for offset, (index, _) in enumerate(rows):
+            results[index] = {'index': index, 'status': 'created', 'id': first_id + offset}
+        
+        add_notification(spec['entity'], f'{len(rows)} {table} added in bulk')
+        event_broker.publish(spec['entity'], 'bulk')
+    
+    return bulk_response(results, 201)
+
+@app.route('/api/admin/<any(properties, projects, agents):table>/bulk', methods=['PUT'])
+@admin_required
+def bulk_update(table):
+    spec = BULK_TABLES[table]
+    items, error = bulk_items(table)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM home_content")
-    content_rows = cursor.fetchall()
+    ids = {item.get('id') for item in items if isinstance(item, dict) and is_id(item.get('id'))}
+    found = existing_ids(cursor, table, ids)
+    conn.close()
     
-    home_content = {}
-    for row in content_rows:
+    # Items changing the same set of fields share one UPDATE statement
+    results = [None] * len(items)
+    groups = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'status': 'error', 'message': 'Item must be an object'}
+            continue
+        item_id = item.get('id')
+        if not is_id(item_id) or item_id not in found:
+            results[index] = {'index': index, 'status': 'error', 'message': f'{spec["entity"].capitalize()} not found'}
+            continue
+        fields = tuple(field for field in spec['columns'] if field in item)
         try:
-            home_content[row['section']] = json.loads(row['content'])
-        except:
-            home_content[row['section']] = row['content']
+            values = bulk_values(spec, item, fields)
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+            continue
+        results[index] = {'index': index, 'status': 'updated', 'id': item_id}
+        if fields:
+            groups.setdefault(fields, []).append(values + [item_id])
+    
+    updated = sum(1 for result in results if result['status'] == 'updated')
+    if groups:
+        def write(db):
+            for fields, params in groups.items():
+                assignments = ', '.join(f"{field} = ?" for field in fields)
+                db.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", params)
+        
+        run_write(write, table)
+        
+        add_notification(spec['entity'], f'{updated} {table} updated in bulk')
+        event_broker.publish(spec['entity'], 'bulk')
+    
+    return bulk_response(results, 200)
+
+@app.route('/api/admin/<any(properties, projects, agents):table>/bulk', methods=['DELETE'])
+@admin_required
+def bulk_delete(table):
+    spec = BULK_TABLES[table]
+    ids, error = bulk_items('ids')
+    if error:
+        return jsonify({'message': error}), 400
     
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    found = existing_ids(cursor, table, {item_id for item_id in ids if is_id(item_id)})
     conn.close()
-    return jsonify(home_content)
+    
+    results = []
+    for index, item_id in enumerate(ids):
+        if is_id(item_id) and item_id in found:
+            results.append({'index': index, 'status': 'deleted', 'id': item_id})
+        else:
+            results.append({'index': index, 'status': 'error', 'message': f'{spec["entity"].capitalize()} not found'})
+    
+    if found:
+        run_write(lambda db: db.executemany(f"DELETE FROM {table} WHERE id = ?", [(item_id,) for item_id in found]), table)
+        
+        add_notification(spec['entity'], f'{len(found)} {table} deleted in bulk')
+        event_broker.publish(spec['entity'], 'bulk')
+    
+    return bulk_response(results, 200)
+
+# Import / Export
+EXPORT_TABLES = ['properties', 'projects', 'inquiries']
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+# Rows fetched from the cursor per round
+STREAM_CHUNK_SIZE = 1000
+# Only the first few invalid rows of an import are reported back
+IMPORT_MAX_ERRORS = 100
+
+def export_rows(table, export_format):
+    """Yield table as NDJSON or CSV text, a chunk of rows at a time.
+
+    Only the columns import accepts are exported, so an export can be
+    imported back as is.
+    """
+    columns = insert_columns(BULK_TABLES[table])
+    # Uses its own connection: the generator runs after the view returns
+    conn = db_pool.acquire()
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == 'csv':
+            # Sent up front so an empty table still exports its header
+            writer.writerow(columns)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        while True:
+            rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                if export_format == 'csv':
+                    writer.writerow(row)
+                else:
+                    item = dict(row)
+                    if 'images' in item:
+                        try:
+                            item['images'] = json.loads(item['images'])
+                        except (TypeError, ValueError):
+                            item['images'] = []
+                    buffer.write(json.dumps(item))
+                    buffer.write('\n')
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    finally:
+        db_pool.release(conn)
+
+@app.route('/api/admin/export/<table>', methods=['GET'])
+@admin_required
+def export_table(table):
+    export_format = request.args.get('format', 'ndjson')
+    if table not in EXPORT_TABLES:
+        return jsonify({'message': 'Unknown table'}), 404
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'message': 'format must be ndjson or csv'}), 400
+    
+    response = Response(export_rows(table, export_format), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={table}.{export_format}'
+    return response
+
+def import_records(stream, import_format):
+    """Yield (line number, record) from an uploaded NDJSON or CSV stream"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if import_format == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            # Empty cells fall back to the column defaults
+            yield reader.line_num, {key: value for key, value in record.items() if value != ''}
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
 
-@app.route('/api/admin/home-content/<section>', methods=['PUT'])
+@app.route('/api/admin/import/<table>', methods=['POST'])
+@admin_required
+def import_table(table):
+    import_format = request.args.get('format', 'ndjson')
+    if table not in EXPORT_TABLES:
+        return jsonify({'message': 'Unknown table'}), 404
+    if import_format not in EXPORT_FORMATS:
+        return jsonify({'message': 'format must be ndjson or csv'}), 400
+    
+    # Either a multipart upload (spooled to disk by werkzeug) or the raw body
+    upload = request.files.get('file')
+    stream = upload.stream if upload else io.BufferedReader(request.stream)
+    
+    spec = BULK_TABLES[table]
+    now = datetime.now().isoformat()
+    valid = 0
+    failed = 0
+    errors = []
+    
+    # Records are validated as they are parsed and the prepared rows spooled
+    # to a temporary file, so memory use doesn't grow with the size of the
+    # upload. Nothing is written until the whole upload has parsed.
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+        try:
+            for line_number, record in import_records(stream, import_format):
+                try:
+                    if record is None:
+                        raise ValueError('Invalid JSON')
+                    row = prepare_insert(spec, record, now)
+                except ValueError as e:
+                    failed += 1
+                    if len(errors) < IMPORT_MAX_ERRORS:
+                        errors.append({'line': line_number, 'message': str(e)})
+                    continue
+                spool.write(json.dumps(row))
+                spool.write('\n')
+                valid += 1
+        except (UnicodeDecodeError, csv.Error) as e:
+            return jsonify({'message': f'Could not parse upload: {e}', 'imported': 0}), 400
+        
+        if valid:
+            spool.seek(0)
+            
+            def write(db):
+                db.executemany(insert_statement(table, spec), (json.loads(line) for line in spool))
+            
+            # One transaction: an import is either fully written or not at all
+            run_write(write, table, timeout=None)
+            add_notification(spec['entity'], f'{valid} {table} imported')
+            event_broker.publish(spec['entity'], 'bulk')
+    
+    return jsonify({'imported': valid, 'errors': failed, 'error_samples': errors}), 200 if not failed else 207
+
+# Home Content Management Routes
+# (version, CompressedBody) of the last home content served
+home_content_body = None
+
+@app.route('/api/admin/home-content', methods=['GET'])
+def get_home_content():
+    # Public: the site's hero, footer and typewriter read it
+    # Served from memory; the ETag is the home_content version
+    global home_content_body
+    version, _, encoded = home_content_store.snapshot()
+    if home_content_body is None or home_content_body[0] != version:
+        home_content_body = (version, CompressedBody(encoded, 'application/json'))
+    response = home_content_body[1].apply(request, app.response_class(mimetype='application/json'),
+                                          COMPRESS_MIN_SIZE)
+    response.set_etag(f'hc{version}')
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/api/admin/home-content', methods=['PUT'])
+@admin_required
+def replace_home_content():
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Expected an object of sections'}), 400
+    
+    version = home_content_store.replace(data)
+    
+    add_notification('content', 'Homepage content updated')
+    
+    content = home_content_store.get()
+    for section in data:
+        event_broker.publish('home_content', 'update', section, content.get(section))
+    
+    return jsonify({'message': 'Content updated successfully', 'version': version})
+
+@app.route('/api/admin/home-content/<section>', methods=['PUT', 'PATCH'])
+@admin_required
 def update_home_content(section):
-    # In a real app, this would require authentication
     data = request.get_json()
     
+    # PUT replaces the section, PATCH merges the given keys into it
+    version = home_content_store.update_section(section, data, merge=request.method == 'PATCH')
+    
+    # Add notification for content update
+    add_notification('content', f'Homepage {section} content updated')
+    
+    event_broker.publish('home_content', 'update', section, home_content_store.get().get(section))
+    
+    return jsonify({'message': 'Content updated successfully', 'version': version})
+
+# Homepage
+# Number of items of each kind included in GET /api/homepage; 0 means all
+# agents or builders. The homepage's property section fetches listings for
+# a selected location from /api/properties itself, so the cap only applies
+# to its unfiltered view.
+HOMEPAGE_LIMITS = {
+    'properties': int(os.environ.get('HOMEPAGE_PROPERTIES', 24)),
+    'projects': int(os.environ.get('HOMEPAGE_PROJECTS', 12)),
+    'agents': int(os.environ.get('HOMEPAGE_AGENTS', 0)),
+    'builders': int(os.environ.get('HOMEPAGE_BUILDERS', 0)),
+}
+
+@app.route('/api/homepage', methods=['GET'])
+@cached_response('home_content', 'properties', 'projects', 'agents', 'builders')
+def get_homepage():
+    """Everything the homepage renders, in one response.
+
+    Built in a single read transaction and kept in the response cache until
+    one of the tables it reads changes.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Check if section exists
-    cursor.execute("SELECT * FROM home_content WHERE section = ?", (section,))
-    existing = cursor.fetchone()
+    conn.execute("BEGIN")
+    homepage = {'home_content': home_content_store.get()}
     
-    if existing:
-        # Update existing section
-        cursor.execute("UPDATE home_content SET content = ? WHERE section = ?", (json.dumps(data), section))
-    else:
-        # Insert new section
-        cursor.execute("INSERT INTO home_content (section, content) VALUES (?, ?)", (section, json.dumps(data)))
+    # Newest listings first
+    for table in ('properties', 'projects'):
+        homepage[table] = fetch_page(
+            cursor, listing_query(table), [], [], LISTING_SORT, (HOMEPAGE_LIMITS[table], None),
+            descending=True, convert=listing_to_dict,
+        )['items']
     
-    # Add notification for content update
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('content', f'Homepage {section} content updated', 1, 'Admin User', datetime.now().isoformat(), 0))
+    # LIMIT -1 is no limit in SQLite
+    cursor.execute(select_public('agents') + " ORDER BY properties_sold DESC, id LIMIT ?",
+                   (HOMEPAGE_LIMITS['agents'] or -1,))
+    homepage['agents'] = [dict(row) for row in cursor.fetchall()]
+    
+    cursor.execute(select_public('builders') + " ORDER BY projects_count DESC, id LIMIT ?",
+                   (HOMEPAGE_LIMITS['builders'] or -1,))
+    homepage['builders'] = [dict(row) for row in cursor.fetchall()]
+    
+    conn.close()
+    return jsonify(homepage)
+
+# Delta sync
+def sync_rows(cursor, table, since, token):
+    """Rows of table inserted or updated after since, up to token"""
+    if table in MEDIA_OWNER_TYPES:
+        return fetch_listings(cursor, table, ["t.row_version > ?", "t.row_version <= ?"], (since, token),
+                              all_columns=True)
+    
+    columns = "id, name, email, role, created_at, updated_at, row_version" if table == 'admins' else "*"
+    cursor.execute(f"SELECT {columns} FROM {table} WHERE row_version > ? AND row_version <= ?", (since, token))
+    rows = [dict(row) for row in cursor.fetchall()]
+    if table == 'home_content':
+        for row in rows:
+            try:
+                row['content'] = json.loads(row['content'])
+            except (TypeError, ValueError):
+                pass
+    return rows
+
+@app.route('/api/sync', methods=['GET'])
+@admin_required
+def sync():
+    since = request.args.get('since', '0')
+    if not since.isdigit():
+        return jsonify({'message': 'Invalid since token'}), 400
+    since = int(since)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # One read transaction so every table is seen at the same version
+    conn.execute("BEGIN")
+    token, pruned_through = cursor.execute("SELECT value, pruned_through FROM sync_sequence").fetchone()
+    
+    # A token from a different or rebuilt database can't be diffed against,
+    # nor can one older than the deletes that have been pruned
+    full = since == 0 or since > token or since < pruned_through
+    if full:
+        since = 0
+    
+    changes = {table: sync_rows(cursor, table, since, token) for table in SYNC_TABLES}
+    deleted = {table: [] for table in SYNC_TABLES}
+    if not full:
+        cursor.execute(
+            "SELECT entity, entity_id FROM tombstones WHERE row_version > ? AND row_version <= ?", (since, token)
+        )
+        for row in cursor.fetchall():
+            deleted[row['entity']].append(row['entity_id'])
     
-    conn.commit()
     conn.close()
     
-    return jsonify({'message': 'Content updated successfully'})
+    return jsonify({
+        'token': str(token),
+        'full': full,
+        'changes': changes,
+        'deleted': deleted,
+    })
 
 # Notification Routes
 @app.route('/api/admin/notifications', methods=['GET'])
+@admin_required
+@conditional_response('notifications')
 def get_notifications():
-    # In a real app, this would require authentication
+    page, error = parse_page_args(CREATED_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM notifications ORDER BY created_at DESC")
-    notifications = [dict(row) for row in cursor.fetchall()]
+    # ?unread=1 limits the list to unread notifications
+    conditions = ["read_status = 0"] if request.args.get('unread') in ('1', 'true') else []
+    
+    if page:
+        notifications = fetch_page(cursor, "SELECT * FROM notifications", conditions, [], CREATED_SORT, page, descending=True)
+    else:
+        query = "SELECT * FROM notifications"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor.execute(query + " ORDER BY created_at DESC")
+        notifications = [dict(row) for row in cursor.fetchall()]
     
     conn.close()
     return jsonify(notifications)
 
+@app.route('/api/admin/notifications/unread-count', methods=['GET'])
+@admin_required
+@conditional_response('notifications')
+def get_unread_notification_count():
+    conn = get_db_connection()
+    # Counted from idx_notifications_unread, so this only touches unread rows
+    unread_count = conn.execute("SELECT COUNT(*) FROM notifications WHERE read_status = 0").fetchone()[0]
+    conn.close()
+    return jsonify({'unread_count': unread_count})
+
 @app.route('/api/admin/notifications/<int:notification_id>/read', methods=['PUT'])
+@admin_required
 def mark_notification_as_read(notification_id):
-    # In a real app, this would require authentication
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("UPDATE notifications SET read_status = 1 WHERE id = ?", (notification_id,))
+    def write(db):
+        return db.execute("UPDATE notifications SET read_status = 1 WHERE id = ?", (notification_id,)).rowcount
     
-    if cursor.rowcount == 0:
-        conn.close()
+    if run_write(write, 'notifications') == 0:
         return jsonify({'message': 'Notification not found'}), 404
     
-    conn.commit()
-    conn.close()
-    
     return jsonify({'message': 'Notification marked as read'})
 
 @app.route('/api/admin/notifications/read-all', methods=['PUT'])
+@admin_required
 def mark_all_notifications_as_read():
-    # In a real app, this would require authentication
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("UPDATE notifications SET read_status = 1")
-    conn.commit()
-    conn.close()
+    run_write(lambda db: db.execute("UPDATE notifications SET read_status = 1 WHERE read_status = 0"), 'notifications')
     
     return jsonify({'message': 'All notifications marked as read'})
 
@@ -1511,28 +3353,25 @@ def mark_all_notifications_as_read():
 def create_inquiry():
     data = request.get_json()
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO inquiries (user_name, email, phone, property_id, message, status, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data['user_name'], data['email'], data.get('phone', ''), 
-        data.get('property_id'), data.get('message', ''), 
-        'pending', datetime.now().isoformat()
-    ))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute('''
+            INSERT INTO inquiries (user_name, email, phone, property_id, message, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            data['user_name'], data['email'], data.get('phone', ''), 
+            data.get('property_id'), data.get('message', ''), 
+            'pending', datetime.now().isoformat()
+        ))
+        
+        inquiry_id = cursor.lastrowid
+        
+        return inquiry_id
     
-    inquiry_id = cursor.lastrowid
+    inquiry_id = run_write(write, 'inquiries')
     
     # Add notification for new inquiry
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('inquiry', f'New inquiry from {data["user_name"]}', 1, 'Admin User', datetime.now().isoformat(), 0))
-    
-    conn.commit()
-    conn.close()
+    add_notification('inquiry', f'New inquiry from {data["user_name"]}')
     
     return jsonify({
         'id': inquiry_id,
@@ -1540,20 +3379,29 @@ def create_inquiry():
     }), 201
 
 @app.route('/api/admin/inquiries', methods=['GET'])
+@admin_required
+@conditional_response('inquiries')
 def get_inquiries():
-    # In a real app, this would require authentication
+    page, error = parse_page_args(CREATED_SORT)
+    if error:
+        return jsonify({'message': error}), 400
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM inquiries ORDER BY created_at DESC")
-    inquiries = [dict(row) for row in cursor.fetchall()]
+    if page:
+        rows, next_cursor = page_rows(cursor, "SELECT * FROM inquiries", [], [], CREATED_SORT, page, descending=True)
+    else:
+        cursor.execute("SELECT * FROM inquiries ORDER BY created_at DESC")
+        rows, next_cursor = cursor.fetchall(), None
     
+    response = rows_response('inquiries', cursor, rows, page, next_cursor)
     conn.close()
-    return jsonify(inquiries)
+    return response
 
 @app.route('/api/admin/inquiries/<int:inquiry_id>/status', methods=['PUT'])
+@admin_required
 def update_inquiry_status(inquiry_id):
-    # In a real app, this would require authentication
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -1570,30 +3418,42 @@ def update_inquiry_status(inquiry_id):
         conn.close()
         return jsonify({'message': 'Invalid status'}), 400
     
-    cursor.execute("UPDATE inquiries SET status = ? WHERE id = ?", (new_status, inquiry_id))
+    def write(db):
+        cursor = db.cursor()
+        cursor.execute("UPDATE inquiries SET status = ? WHERE id = ?", (new_status, inquiry_id))
     
-    # Add notification for status change
-    cursor.execute('''
-        INSERT INTO notifications (type, message, admin_id, admin_name, created_at, read_status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', ('inquiry', f'Inquiry #{inquiry_id} status changed to {new_status}', 1, 'Admin User', datetime.now().isoformat(), 0))
+    run_write(write, 'inquiries')
     
-    conn.commit()
-    conn.close()
+    # Add notification for status change
+    add_notification('inquiry', f'Inquiry #{inquiry_id} status changed to {new_status}')
     
     # Return the updated inquiry
-    conn = get_db_connection()
-    cursor = conn.cursor()
     cursor.execute("SELECT * FROM inquiries WHERE id = ?", (inquiry_id,))
     updated_inquiry = cursor.fetchone()
     conn.close()
     
     return jsonify(dict(updated_inquiry))
 
+def stop_on_sigterm(signum, frame):
+    """Write what is still queued before exiting.
+
+    Deploy platforms stop the process with SIGTERM, which ends it without
+    running atexit handlers, so queued notifications would be lost.
+    """
+    notification_writer.stop()
+    db_writer.stop()
+    sys.exit(0)
+
 if __name__ == '__main__':
     # Initialize the database
     init_db()
+    start_compaction()
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
     
     # Use the PORT environment variable for deployment platforms like Heroku, Railway, etc.
+    # It is served by the event stream server, which forwards everything
+    # but /api/events to the Flask app
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
+    EventStreamServer(event_broker, port=port, upstream=('127.0.0.1', WSGI_PORT)).start()
+    trust_proxies(PROXY_COUNT + 1)
+    app.run(debug=False, host='127.0.0.1', port=WSGI_PORT)
\ No newline at end of file
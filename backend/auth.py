@@ -0,0 +1,135 @@
+"""
+Admin password hashing and access tokens.
+
+Passwords are hashed with scrypt or PBKDF2-SHA256 from hashlib, with a
+random salt and the cost parameters stored alongside the hash:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+Rows still holding an unsalted SHA-256 hex digest from before verify as
+well, but report that they need rehashing, as do hashes made with other
+settings than the current ones. Hashing is deliberately slow, so it runs
+on a small thread pool with a bounded number of waiting jobs. A burst of
+logins is turned away with HasherBusy instead of taking CPU from every
+request thread.
+
+Access tokens are signed (itsdangerous, keyed by the app's SECRET_KEY) and
+carry their issue time, so they are checked without any server state.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+
+class HasherBusy(Exception):
+    """Raised when too many hashing jobs are already waiting"""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded worker pool.
+
+    algorithm is 'scrypt' or 'pbkdf2_sha256'. At most max_workers hashes
+    run at once and at most max_pending more wait for a worker; beyond
+    that hash() and verify() raise HasherBusy.
+    """
+
+    def __init__(self, algorithm='scrypt', scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1,
+                 pbkdf2_iterations=600000, max_workers=2, max_pending=16):
+        if algorithm not in ('scrypt', 'pbkdf2_sha256'):
+            raise ValueError(f'Unknown password hash algorithm: {algorithm}')
+        self.algorithm = algorithm
+        self.scrypt_n = scrypt_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.pbkdf2_iterations = pbkdf2_iterations
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def hash(self, password):
+        """A new salted hash of password"""
+        return self._run(self.hash_now, password)
+
+    def verify(self, password, stored):
+        """(matches, needs_rehash) for password against a stored hash"""
+        return self._run(self.verify_now, password, stored)
+
+    def hash_now(self, password):
+        """hash() on the calling thread"""
+        salt = os.urandom(16)
+        if self.algorithm == 'scrypt':
+            params = (self.scrypt_n, self.scrypt_r, self.scrypt_p)
+            digest = self._scrypt(password, salt, *params)
+            return f"scrypt${params[0]}${params[1]}${params[2]}${_b64(salt)}${_b64(digest)}"
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, self.pbkdf2_iterations)
+        return f"pbkdf2_sha256${self.pbkdf2_iterations}${_b64(salt)}${_b64(digest)}"
+
+    def verify_now(self, password, stored):
+        """verify() on the calling thread"""
+        stored = stored or ''
+        parts = stored.split('$')
+        try:
+            if parts[0] == 'scrypt' and len(parts) == 6:
+                n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+                salt, expected = base64.b64decode(parts[4]), base64.b64decode(parts[5])
+                digest = self._scrypt(password, salt, n, r, p)
+                current = self.algorithm == 'scrypt' and (n, r, p) == (self.scrypt_n, self.scrypt_r, self.scrypt_p)
+            elif parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+                iterations = int(parts[1])
+                salt, expected = base64.b64decode(parts[2]), base64.b64decode(parts[3])
+                digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+                current = self.algorithm == 'pbkdf2_sha256' and iterations == self.pbkdf2_iterations
+            elif len(stored) == 64:
+                # Legacy unsalted SHA-256 hex digest
+                expected = stored.encode()
+                digest = hashlib.sha256(password.encode()).hexdigest().encode()
+                current = False
+            else:
+                return False, False
+        except ValueError:
+            return False, False
+        matches = hmac.compare_digest(digest, expected)
+        return matches, matches and not current
+
+    def _scrypt(self, password, salt, n, r, p):
+        # OpenSSL's default memory cap (32 MB) is too low for larger n
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy('Too many password checks in progress')
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+class TokenSigner:
+    """Issues and checks signed, expiring access tokens"""
+
+    def __init__(self, secret_key, max_age=12 * 3600, salt='admin-access-token'):
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=salt)
+
+    def issue(self, claims):
+        """A token carrying claims (a JSON-serializable dict)"""
+        return self._serializer.dumps(claims)
+
+    def verify(self, token):
+        """The token's claims, or None if it is invalid or expired"""
+        try:
+            return self._serializer.loads(token, max_age=self.max_age)
+        except (SignatureExpired, BadSignature):
+            return None
@@ -0,0 +1,116 @@
+"""
+Throughput of list endpoint JSON encoding.
+
+Compares the old path (dict per sqlite3.Row, images decoded in place, then
+json.dumps the way Flask's jsonify does it) with serializers.RowEncoder on
+the stdlib backend and, if installed, orjson. Every path is checked to
+produce the same data before it is timed.
+
+Usage:
+    python benchmarks/bench_serializers.py [--rows 2000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serializers  # noqa: E402
+from serializers import RowEncoder  # noqa: E402
+
+
+def decode_images(value):
+    try:
+        return json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+
+
+def seed(rows):
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute('''
+        CREATE TABLE properties (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            price REAL NOT NULL,
+            location TEXT NOT NULL,
+            property_type TEXT NOT NULL,
+            status TEXT DEFAULT 'Available',
+            bedrooms INTEGER DEFAULT 0,
+            bathrooms INTEGER DEFAULT 0,
+            area_sqft INTEGER DEFAULT 0,
+            builder_id INTEGER,
+            images TEXT,
+            is_favorite INTEGER DEFAULT 0,
+            created_at TEXT,
+            latitude REAL,
+            longitude REAL
+        )
+    ''')
+    types = ['House', 'Flat', 'Plot']
+    conn.executemany(
+        '''INSERT INTO properties (title, description, price, location, property_type, bedrooms, bathrooms,
+           area_sqft, builder_id, images, created_at, latitude, longitude)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        [(f'Property {i}', 'Spacious home near the metro. ' * 8, float(i % 1000) * 1000, 'Sector 45, Gurugram',
+          types[i % 3], i % 5, i % 3, 900 + i, None,
+          json.dumps([f'https://images.example.com/{i}/{j}.jpg' for j in range(4)]),
+          datetime.now().isoformat(), 28.4 + i * 1e-5, 77.0) for i in range(rows)],
+    )
+    return conn
+
+
+def old_path(rows, columns):
+    items = []
+    for row in rows:
+        item = dict(row)
+        item['images'] = decode_images(item['images'])
+        items.append(item)
+    return json.dumps(items, sort_keys=True, separators=(',', ':')).encode()
+
+
+def measure(name, encode, rows, columns, repeat, baseline):
+    body = encode(rows, columns)
+    assert json.loads(body) == json.loads(baseline), f'{name} output differs'
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(rows, columns)
+    elapsed = (time.perf_counter() - start) / repeat
+    return name, elapsed, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = seed(args.rows)
+    cursor = conn.execute("SELECT * FROM properties")
+    rows = cursor.fetchall()
+    columns = [column[0] for column in cursor.description]
+    encoder = RowEncoder({'images': decode_images})
+    baseline = old_path(rows, columns)
+
+    paths = [
+        ('dict + json', old_path),
+        ('RowEncoder json', lambda rows, columns: encoder.encode(rows, columns, backend='json')),
+    ]
+    if serializers.orjson is not None:
+        paths.append(('RowEncoder orjson', lambda rows, columns: encoder.encode(rows, columns, backend='orjson')))
+
+    results = [measure(name, encode, rows, columns, args.repeat, baseline) for name, encode in paths]
+    base = results[0][1]
+    for name, elapsed, size in results:
+        print(f"{name:>18} | {elapsed * 1000:8.2f} ms | {args.rows / elapsed:10.0f} rows/s"
+              f" | {base / elapsed:5.2f}x | {size:>9} bytes")
+
+
+if __name__ == '__main__':
+    main()
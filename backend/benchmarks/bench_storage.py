@@ -0,0 +1,174 @@
+"""
+Mixed read/write benchmark for the SQLite storage settings.
+
+Compares the old setup (rollback journal, every writer committing on its own
+connection) with the current one (WAL + tuned PRAGMAs, writes serialized
+through database.WriteQueue) and reports read latency percentiles while
+admin-style writes run in parallel.
+
+Usage:
+    python benchmarks/bench_storage.py [--readers 8] [--writers 4] [--seconds 5]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ConnectionPool, WriteQueue  # noqa: E402
+
+WAL_PRAGMAS = [
+    'busy_timeout = 5000',
+    'synchronous = NORMAL',
+    'temp_store = MEMORY',
+    'cache_size = -16000',
+    'mmap_size = 134217728',
+]
+LEGACY_PRAGMAS = ['busy_timeout = 5000']
+
+READ_QUERY = '''
+    SELECT * FROM properties
+    WHERE property_type = ? AND price >= ?
+    ORDER BY created_at, id LIMIT 50
+'''
+
+
+def seed(path, rows, journal_mode):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute('''
+        CREATE TABLE properties (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            price REAL NOT NULL,
+            location TEXT NOT NULL,
+            property_type TEXT NOT NULL,
+            status TEXT DEFAULT 'Available',
+            created_at TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            message TEXT NOT NULL,
+            created_at TEXT,
+            read_status BOOLEAN DEFAULT 0
+        )
+    ''')
+    types = ['House', 'Flat', 'Plot']
+    conn.executemany(
+        "INSERT INTO properties (title, description, price, location, property_type, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f'Property {i}', 'x' * 400, float(i % 1000) * 1000, 'Gurugram', types[i % 3],
+          datetime.now().isoformat()) for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def write_job(i):
+    def job(db):
+        db.execute("UPDATE properties SET title = ? WHERE id = ?", (f'Edited {i}', i % 1000 + 1))
+        db.execute("INSERT INTO notifications (type, message, created_at) VALUES (?, ?, ?)",
+                   ('property', f'Property updated: {i}', datetime.now().isoformat()))
+    return job
+
+
+def run(mode, args):
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+    wal = mode == 'wal'
+    seed(path, args.rows, 'WAL' if wal else 'DELETE')
+
+    pool = ConnectionPool(path, WAL_PRAGMAS if wal else LEGACY_PRAGMAS)
+    writer = WriteQueue(lambda: pool.connect(autocommit=True)) if wal else None
+
+    stop = threading.Event()
+    latencies = []
+    counters = {'read_errors': 0, 'writes': 0, 'write_errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        conn = pool.connect()
+        local = []
+        errors = 0
+        n = 0
+        while not stop.is_set():
+            n += 1
+            start = time.perf_counter()
+            try:
+                conn.execute(READ_QUERY, (['House', 'Flat', 'Plot'][n % 3], (n % 500) * 1000)).fetchall()
+            except sqlite3.OperationalError:
+                errors += 1
+                continue
+            local.append(time.perf_counter() - start)
+        conn.really_close()
+        with lock:
+            latencies.extend(local)
+            counters['read_errors'] += errors
+
+    def write_worker(worker_id):
+        conn = None if wal else pool.connect()
+        i = worker_id
+        while not stop.is_set():
+            i += args.writers
+            try:
+                if wal:
+                    writer.run(write_job(i))
+                else:
+                    write_job(i)(conn)
+                    conn.commit()
+            except sqlite3.OperationalError:
+                if conn is not None:
+                    conn.rollback()
+                with lock:
+                    counters['write_errors'] += 1
+                continue
+            with lock:
+                counters['writes'] += 1
+        if conn is not None:
+            conn.really_close()
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=write_worker, args=(w,)) for w in range(args.writers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    if writer is not None:
+        writer.stop()
+
+    latencies.sort()
+
+    def pct(p):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{mode:>7} | reads {len(latencies):>8} | p50 {pct(0.50):7.2f} ms | p99 {pct(0.99):7.2f} ms"
+          f" | max {pct(1.0):8.2f} ms | read errors {counters['read_errors']:>4}"
+          f" | writes {counters['writes']:>6} | write errors {counters['write_errors']:>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    for mode in ('legacy', 'wal'):
+        run(mode, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Negotiated response compression.
+
+JSON and text responses of at least a minimum size are compressed with
+brotli (when the brotli package is installed) or gzip, whichever the
+client's Accept-Encoding prefers. CompressedBody keeps compressed copies
+of a body next to it, so cached responses are compressed once per
+encoding instead of on every hit.
+
+Compressed responses carry weak ETags: the bytes differ from the
+uncompressed representation, but they are semantically the same for
+If-None-Match revalidation.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Server preference when the client rates encodings equally
+ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+COMPRESSIBLE_TYPES = {'application/json', 'application/javascript', 'application/x-ndjson', 'image/svg+xml'}
+# Responses compressed per request favour speed; cached bodies are
+# compressed once, so they can afford a better ratio
+LEVELS = {'br': 5, 'gzip': 6}
+CACHED_LEVELS = {'br': 9, 'gzip': 9}
+
+
+def compressible(mimetype):
+    return mimetype in COMPRESSIBLE_TYPES or (mimetype or '').startswith('text/')
+
+
+def negotiate(request):
+    """The encoding to use for request, or None to send the body as is"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding, level=None):
+    if encoding == 'br':
+        return brotli.compress(body, quality=level if level is not None else LEVELS['br'])
+    if encoding == 'gzip':
+        # mtime=0 keeps the output the same for the same body
+        return gzip.compress(body, compresslevel=level if level is not None else LEVELS['gzip'], mtime=0)
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+
+def weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(request, response, min_size):
+    """Compress response in place if the client accepts it; returns response.
+
+    Meant for an after_request hook. Streamed responses, non-200 responses
+    and bodies under min_size bytes are left alone; responses that are
+    already encoded (e.g. served from CompressedBody) only get their ETag
+    weakened.
+    """
+    if not compressible(response.mimetype):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    if ('Content-Encoding' not in response.headers and response.status_code == 200
+            and not response.direct_passthrough and not response.is_streamed):
+        body = response.get_data()
+        encoding = negotiate(request) if len(body) >= min_size else None
+        if encoding is not None:
+            response.set_data(compress(body, encoding))
+            response.headers['Content-Encoding'] = encoding
+
+    if 'Content-Encoding' in response.headers:
+        weaken_etag(response)
+    return response
+
+
+class CompressedBody:
+    """A response body with compressed copies made on first use"""
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self._variants = {}
+
+    def get(self, encoding=None):
+        """The body in encoding (None for uncompressed)"""
+        if encoding is None:
+            return self.body
+        data = self._variants.get(encoding)
+        if data is None:
+            # Two requests racing here both compress; either result is fine
+            data = compress(self.body, encoding, CACHED_LEVELS[encoding])
+            self._variants[encoding] = data
+        return data
+
+    def apply(self, request, response, min_size):
+        """Give response the best variant of this body for request"""
+        encoding = None
+        if compressible(self.mimetype) and len(self.body) >= min_size:
+            encoding = negotiate(request)
+        response.set_data(self.get(encoding))
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        return response
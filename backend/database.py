@@ -0,0 +1,375 @@
+"""
+SQLite connection management for the API.
+
+Connections are expensive to open relative to the queries the API runs, so
+they are kept in a small pool and reused across requests. Each request gets
+one connection (stored on flask.g by app.py) which is handed back to the
+pool when the app context tears down.
+"""
+import atexit
+import collections
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back instead of closing it"""
+
+    def close(self):
+        # Handlers call close() when they're done with the connection.
+        # Anything they didn't commit is discarded, as a real close would do.
+        if self.in_transaction:
+            self.rollback()
+
+    def really_close(self):
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections.
+
+    PRAGMAs are applied once when a connection is created rather than on
+    every checkout. Idle connections are kept up to max_idle; extra ones
+    are closed on release.
+    """
+
+    def __init__(self, database, pragmas=(), max_idle=8, timeout=5.0):
+        self.database = database
+        self.pragmas = list(pragmas)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def connect(self, autocommit=False):
+        """Open a new pooled connection with row access by name.
+
+        With autocommit=True the sqlite3 module doesn't open transactions
+        implicitly and the caller manages BEGIN/COMMIT itself.
+        """
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            factory=PooledConnection,
+            # A connection is only used by one request at a time, but may be
+            # handed to a different worker thread on its next checkout
+            check_same_thread=False,
+            isolation_level=None if autocommit else '',
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, or open a new one if none are free"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.connect()
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.really_close()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.really_close()
+
+
+class WriteQueue:
+    """Serializes database writes through one background writer thread.
+
+    Callers submit jobs, callables taking the writer's connection. The
+    writer drains whatever is queued (up to max_batch jobs), runs each job
+    inside its own savepoint and commits the whole batch at once. A job that
+    raises is rolled back on its own without affecting the rest of the
+    batch.
+    """
+
+    def __init__(self, connect, max_batch=64):
+        self._connect = connect
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Started lazily so forked server workers each get their own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name='db-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def submit(self, job):
+        """Queue job(conn) and return a Future for its result"""
+        future = Future()
+        self._ensure_started()
+        self._queue.put((job, future))
+        return future
+
+    def run(self, job, timeout=30):
+        """Queue job(conn) and wait for its result"""
+        return self.submit(job).result(timeout)
+
+    def stop(self, timeout=5):
+        """Finish the queued jobs and stop the writer thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _worker(self):
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                stopping = False
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._run_batch(conn, batch)
+                if stopping:
+                    return
+        finally:
+            conn.really_close()
+
+    def _run_batch(self, conn, batch):
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = job(conn)
+                except BaseException as exc:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, None, exc))
+                else:
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, result, None))
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+class BatchWriter:
+    """Inserts queued rows in batches from a background thread.
+
+    add() only appends a row to an in-memory queue, so callers never wait on
+    the database. The writer thread takes up to max_batch rows (after
+    waiting up to max_delay seconds for more to arrive), inserts them with
+    executemany in one transaction and only then removes them from the
+    queue. A batch that fails because the database is busy or locked is
+    retried after retry_delay seconds; any other failure would repeat, so
+    the batch is logged and dropped rather than blocking every later row.
+    stop() flushes what is still queued; it is registered with atexit, and
+    app.py also calls it on SIGTERM, which skips atexit.
+
+    before_commit(conn) runs inside each batch's transaction and
+    after_commit() once it has committed.
+    """
+
+    def __init__(self, connect, sql, max_batch=256, max_delay=0.05, retry_delay=1.0,
+                 before_commit=None, after_commit=None):
+        self._connect = connect
+        self.sql = sql
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.before_commit = before_commit
+        self.after_commit = after_commit
+        self._rows = collections.deque()
+        self._added = 0
+        self._written = 0
+        self._dropped = 0
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _ensure_started(self):
+        # Started lazily so forked server workers each get their own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._worker, name='db-batch-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def add(self, row):
+        """Queue row (a tuple of parameters for sql) to be written"""
+        with self._cond:
+            self._rows.append(row)
+            self._added += 1
+            self._cond.notify_all()
+        self._ensure_started()
+
+    def flush(self, timeout=None):
+        """Wait until every row queued so far is written; False on timeout"""
+        with self._cond:
+            target = self._added
+            return self._cond.wait_for(lambda: self._written + self._dropped >= target, timeout)
+
+    def pending(self):
+        with self._cond:
+            return len(self._rows)
+
+    def stop(self, timeout=5):
+        """Write the queued rows and stop the writer thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+
+    def _worker(self):
+        conn = None
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._rows or self._stopping)
+                    if not self._rows:
+                        return
+                    if not self._stopping:
+                        self._cond.wait_for(
+                            lambda: len(self._rows) >= self.max_batch or self._stopping, self.max_delay
+                        )
+                    batch = [self._rows[i] for i in range(min(len(self._rows), self.max_batch))]
+
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                    self._write(conn, batch)
+                except Exception as exc:
+                    if conn is not None:
+                        conn.really_close()
+                        conn = None
+                    if is_transient(exc):
+                        logger.warning('Batch write of %d rows failed, retrying: %s', len(batch), exc)
+                        with self._cond:
+                            self._cond.wait(self.retry_delay)
+                        continue
+                    logger.exception('Batch write of %d rows failed, dropping them', len(batch))
+                    with self._cond:
+                        for _ in batch:
+                            self._rows.popleft()
+                        self._dropped += len(batch)
+                        self._cond.notify_all()
+                    continue
+
+                with self._cond:
+                    for _ in batch:
+                        self._rows.popleft()
+                    self._written += len(batch)
+                    self._cond.notify_all()
+
+                if self.after_commit is not None:
+                    try:
+                        self.after_commit()
+                    except Exception:
+                        logger.exception('after_commit hook failed')
+        finally:
+            if conn is not None:
+                conn.really_close()
+
+    def _write(self, conn, batch):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self.sql, batch)
+            if self.before_commit is not None:
+                self.before_commit(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+# SQLite result codes worth retrying: another connection holds a lock
+TRANSIENT_ERRORS = {sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED} if hasattr(sqlite3, 'SQLITE_BUSY') else set()
+
+
+def is_transient(exc):
+    """Whether a failed write may succeed if retried"""
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    code = getattr(exc, 'sqlite_errorcode', None)
+    if code is not None:
+        # Extended codes carry the primary code in their low byte
+        return (code & 0xff) in TRANSIENT_ERRORS
+    message = str(exc)
+    return 'locked' in message or 'busy' in message
+
+
+def run_migrations(conn, migrations):
+    """Apply the migrations the database hasn't seen yet.
+
+    migrations is an ordered list of callables taking a cursor. The number
+    of applied steps is kept in PRAGMA user_version; each step runs in its
+    own transaction together with the version bump, so a failed step leaves
+    the schema at the previous version. Returns the resulting version.
+    """
+    version = conn.execute("PRAGMA user_version").fetchall()[0][0]
+    pending = list(enumerate(migrations, start=1))[version:]
+    if not pending:
+        return version
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        for version, migration in pending:
+            conn.execute("BEGIN")
+            try:
+                migration(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    finally:
+        conn.isolation_level = isolation_level
+    return version
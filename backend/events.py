@@ -0,0 +1,302 @@
+"""
+Live change events for browsers, sent as Server-Sent Events.
+
+Mutation routes publish an event for every committed change to public data
+(entity type, id, action and a version number). EventStreamServer pushes
+them to every open GET /api/events connection. It is a small asyncio HTTP
+server running on one background thread, so idle clients cost a socket and
+a few objects each rather than a worker thread. Given an upstream address it
+sits in front of the WSGI app on the public port, forwarding every other
+request there, so the stream needs no port or proxy setup of its own.
+
+Event versions increase monotonically and are sent, prefixed with an
+epoch chosen when the process starts, as the SSE id ("<epoch>-<version>"),
+so a reconnecting EventSource resumes from its Last-Event-ID. Clients that
+have fallen further behind than the replay history, or whose id comes from
+before a restart (versions start over, so the numbers alone would resume
+from unrelated events), get a "reset" event and should refetch.
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from urllib.parse import parse_qs
+
+
+class EventBroker:
+    """Numbers published events, keeps a replay history and fans them out"""
+
+    def __init__(self, history=1000):
+        self._history = deque(maxlen=history)
+        self._listeners = []
+        self._version = 0
+        self._lock = threading.Lock()
+        # Distinguishes this process's versions from a previous run's
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def publish(self, entity, action, entity_id=None, data=None):
+        """Record a change and hand it to every listener; returns the event"""
+        with self._lock:
+            self._version += 1
+            event = {
+                'type': entity,
+                'action': action,
+                'id': entity_id,
+                'version': self._version,
+                'timestamp': time.time(),
+            }
+            if data is not None:
+                event['data'] = data
+            self._history.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+        return event
+
+    def event_id(self, version):
+        return f'{self.epoch}-{version}'
+
+    def parse_event_id(self, event_id):
+        """The version in an event id from this process, or None"""
+        epoch, _, version = event_id.partition('-')
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        return int(version)
+
+    def since(self, version):
+        """Events after version, or None if some have dropped out of the history"""
+        with self._lock:
+            if version > self._version:
+                return None
+            if version == self._version:
+                return []
+            if not self._history or self._history[0]['version'] > version + 1:
+                return None
+            return [event for event in self._history if event['version'] > version]
+
+    @property
+    def version(self):
+        with self._lock:
+            return self._version
+
+    def add_listener(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+
+def format_event(event, epoch):
+    return f"id: {epoch}-{event['version']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+# Request headers the dispatcher replaces when forwarding
+HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'x-forwarded-for'}
+
+
+def forwarded_head(lines, client):
+    """The request head in lines, rewritten to be forwarded upstream.
+
+    client is appended to X-Forwarded-For, and the connection is closed
+    after one request so every request on it gets dispatched again.
+    """
+    forwarded_for = []
+    out = [lines[0]]
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'x-forwarded-for':
+            forwarded_for.append(value.strip())
+        elif name.strip().lower() not in HOP_HEADERS:
+            out.append(line)
+    forwarded_for.append(client)
+    out.append(f"X-Forwarded-For: {', '.join(forwarded_for)}")
+    out.append('Connection: close')
+    return ('\r\n'.join(out) + '\r\n\r\n').encode('latin-1')
+
+
+class EventStreamServer:
+    """Serves GET /api/events from an asyncio loop on a single thread.
+
+    Each client is a (writer, last version sent) entry. Clients whose socket
+    buffer grows past max_buffer bytes are disconnected rather than letting
+    one slow reader hold memory; EventSource reconnects and resumes.
+
+    With upstream=(host, port), every other request is forwarded there
+    unchanged apart from X-Forwarded-For and Connection (see
+    forwarded_head); without it they get a 404.
+    """
+
+    def __init__(self, broker, host='0.0.0.0', port=5001, heartbeat=15, max_buffer=256 * 1024,
+                 upstream=None):
+        self.broker = broker
+        self.host = host
+        self.port = port
+        self.upstream = upstream
+        self.heartbeat = heartbeat
+        self.max_buffer = max_buffer
+        self._clients = {}
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        """Start serving on a daemon thread"""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='event-stream', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def client_count(self):
+        return len(self._clients)
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        )
+        self.broker.add_listener(lambda event: self._loop.call_soon_threadsafe(self._broadcast, event))
+        self._loop.create_task(self._heartbeat())
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 10)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            writer.close()
+            return
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        path, _, query = target.partition('?')
+
+        if path != '/api/events' and self.upstream is not None:
+            await self._forward(reader, writer, lines)
+            return
+        if method == 'OPTIONS':
+            self._respond(writer, '204 No Content', [
+                ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+                ('Access-Control-Allow-Headers', 'Last-Event-ID, Cache-Control'),
+            ])
+            return
+        if method != 'GET' or path != '/api/events':
+            self._respond(writer, '404 Not Found')
+            return
+
+        # EventSource sends Last-Event-ID when it reconnects; ?since= lets a
+        # fresh page start from the version it loaded its data at
+        last_id = headers.get('last-event-id') or parse_qs(query).get('since', [''])[0]
+        if last_id:
+            # None (an id from another run, or garbage) gets a reset below
+            last_version = self.broker.parse_event_id(last_id)
+        else:
+            last_version = self.broker.version
+
+        writer.write(
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/event-stream\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Connection: keep-alive\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'X-Accel-Buffering: no\r\n'
+            b'\r\n'
+            b'retry: 5000\n\n'
+        )
+        missed = self.broker.since(last_version) if last_version is not None else None
+        if missed is None:
+            last_version = self.broker.version
+            writer.write(f"event: reset\nid: {self.broker.event_id(last_version)}\ndata: {{}}\n\n".encode())
+        else:
+            for event in missed:
+                writer.write(format_event(event, self.broker.epoch))
+                last_version = event['version']
+        self._clients[writer] = last_version
+
+        try:
+            # Clients never send anything after the request; this returns
+            # once they disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(writer)
+
+    async def _forward(self, reader, writer, lines):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream)
+        except OSError:
+            self._respond(writer, '502 Bad Gateway')
+            return
+        peer = writer.get_extra_info('peername')
+        upstream_writer.write(forwarded_head(lines, peer[0] if peer else 'unknown'))
+        # The request body follows the head; the response ends when the
+        # app closes its side
+        response = asyncio.ensure_future(pipe(upstream_reader, writer))
+        request = asyncio.ensure_future(pipe(reader, upstream_writer))
+        await response
+        request.cancel()
+        writer.close()
+        upstream_writer.close()
+
+    def _respond(self, writer, status, headers=()):
+        lines = [f'HTTP/1.1 {status}', 'Access-Control-Allow-Origin: *', 'Content-Length: 0', 'Connection: close']
+        lines += [f'{name}: {value}' for name, value in headers]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        writer.close()
+
+    def _broadcast(self, event):
+        payload = format_event(event, self.broker.epoch)
+        for writer, last_version in list(self._clients.items()):
+            # Already sent while replaying history on connect
+            if event['version'] <= last_version:
+                continue
+            self._send(writer, payload)
+            if writer in self._clients:
+                self._clients[writer] = event['version']
+
+    async def _heartbeat(self):
+        # Comment lines keep proxies from closing idle connections
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for writer in list(self._clients):
+                self._send(writer, b': ping\n\n')
+
+    def _send(self, writer, payload):
+        if writer.is_closing() or writer.transport.get_write_buffer_size() > self.max_buffer:
+            self._drop(writer)
+            return
+        writer.write(payload)
+
+    def _drop(self, writer):
+        self._clients.pop(writer, None)
+        if not writer.is_closing():
+            writer.close()
+
+
+async def pipe(reader, writer):
+    """Copy reader to writer until reader ends, then pass the end on"""
+    try:
+        while True:
+            chunk = await reader.read(64 * 1024)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+        if not writer.is_closing() and writer.can_write_eof():
+            writer.write_eof()
+    except (ConnectionError, OSError):
+        writer.close()
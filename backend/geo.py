@@ -0,0 +1,145 @@
+"""
+Coordinates for listings.
+
+Properties and projects carry latitude/longitude columns, indexed by an
+R*Tree table per listing table (<table>_geo). Rows saved without
+coordinates are geocoded offline by database triggers from the geo_places
+lookup table, which maps lowercase city names, pincodes and pincode
+prefixes to a point; CITIES and PINCODE_PREFIXES are what it is seeded
+with.
+
+The helpers here turn the near/radius and bbox query parameters into
+boxes for the R*Tree. Distances use an equirectangular approximation,
+which is well within a percent at city scale.
+"""
+import math
+
+KM_PER_DEGREE = 111.32
+
+# (name, latitude, longitude); names are matched case-insensitively
+CITIES = [
+    ('gurugram', 28.4595, 77.0266),
+    ('gurgaon', 28.4595, 77.0266),
+    ('delhi', 28.7041, 77.1025),
+    ('new delhi', 28.6139, 77.2090),
+    ('noida', 28.5355, 77.3910),
+    ('greater noida', 28.4744, 77.5040),
+    ('ghaziabad', 28.6692, 77.4538),
+    ('faridabad', 28.4089, 77.3178),
+    ('sonipat', 28.9931, 77.0151),
+    ('chandigarh', 30.7333, 76.7794),
+    ('mohali', 30.7046, 76.7179),
+    ('panchkula', 30.6942, 76.8606),
+    ('dehradun', 30.3165, 78.0322),
+    ('jaipur', 26.9124, 75.7873),
+    ('lucknow', 26.8467, 80.9462),
+    ('mumbai', 19.0760, 72.8777),
+    ('navi mumbai', 19.0330, 73.0297),
+    ('thane', 19.2183, 72.9781),
+    ('pune', 18.5204, 73.8567),
+    ('ahmedabad', 23.0225, 72.5714),
+    ('surat', 21.1702, 72.8311),
+    ('indore', 22.7196, 75.8577),
+    ('bhopal', 23.2599, 77.4126),
+    ('nagpur', 21.1458, 79.0882),
+    ('kolkata', 22.5726, 88.3639),
+    ('hyderabad', 17.3850, 78.4867),
+    ('bengaluru', 12.9716, 77.5946),
+    ('bangalore', 12.9716, 77.5946),
+    ('chennai', 13.0827, 80.2707),
+    ('kochi', 9.9312, 76.2673),
+    ('goa', 15.2993, 74.1240),
+]
+
+# Leading digits of the pincodes delivered in each city (its postal
+# sorting district) and the city they locate; the longest matching prefix
+# wins, e.g. Thane and Navi Mumbai within Mumbai's 400
+PINCODE_PREFIXES = [
+    ('110', 'delhi'),
+    ('122', 'gurugram'),
+    ('121', 'faridabad'),
+    ('2013', 'noida'),
+    ('2010', 'ghaziabad'),
+    ('131', 'sonipat'),
+    ('160', 'chandigarh'),
+    ('134', 'panchkula'),
+    ('248', 'dehradun'),
+    ('302', 'jaipur'),
+    ('226', 'lucknow'),
+    ('400', 'mumbai'),
+    ('4006', 'thane'),
+    ('4007', 'navi mumbai'),
+    ('411', 'pune'),
+    ('380', 'ahmedabad'),
+    ('395', 'surat'),
+    ('452', 'indore'),
+    ('462', 'bhopal'),
+    ('440', 'nagpur'),
+    ('700', 'kolkata'),
+    ('500', 'hyderabad'),
+    ('560', 'bengaluru'),
+    ('600', 'chennai'),
+    ('682', 'kochi'),
+    ('403', 'goa'),
+]
+
+
+def pincode_prefix_places():
+    """(prefix, latitude, longitude) rows for PINCODE_PREFIXES"""
+    points = {name: (lat, lng) for name, lat, lng in CITIES}
+    return [(prefix, *points[city]) for prefix, city in PINCODE_PREFIXES]
+
+
+def parse_numbers(value, count):
+    """count comma-separated floats from a query parameter; ValueError otherwise"""
+    parts = value.split(',')
+    if len(parts) != count:
+        raise ValueError(f'Expected {count} comma-separated numbers')
+    try:
+        numbers = [float(part) for part in parts]
+    except ValueError:
+        numbers = []
+    if not numbers or not all(math.isfinite(number) for number in numbers):
+        raise ValueError('Coordinates must be numbers')
+    return numbers
+
+
+def check_point(lat, lng):
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError('Coordinates are out of range')
+
+
+def parse_near(near, radius):
+    """(lat, lng, radius_km) from near=lat,lng and radius=km"""
+    lat, lng = parse_numbers(near, 2)
+    check_point(lat, lng)
+    try:
+        radius = float(radius)
+    except ValueError:
+        radius = 0
+    if not 0 < radius <= 1000:
+        raise ValueError('radius must be between 0 and 1000 km')
+    return lat, lng, radius
+
+
+def parse_bbox(bbox):
+    """(min_lat, min_lng, max_lat, max_lng) from bbox=min_lng,min_lat,max_lng,max_lat"""
+    min_lng, min_lat, max_lng, max_lat = parse_numbers(bbox, 4)
+    check_point(min_lat, min_lng)
+    check_point(max_lat, max_lng)
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError('bbox minimums must not exceed its maximums')
+    return min_lat, min_lng, max_lat, max_lng
+
+
+def lng_scale(lat):
+    """Kilometres per degree of longitude relative to one of latitude, at lat"""
+    # Floor it so boxes near the poles stay finite
+    return max(math.cos(math.radians(lat)), 0.01)
+
+
+def radius_box(lat, lng, radius):
+    """(min_lat, min_lng, max_lat, max_lng) enclosing the circle of radius km"""
+    dlat = radius / KM_PER_DEGREE
+    dlng = dlat / lng_scale(lat)
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
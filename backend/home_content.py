@@ -0,0 +1,103 @@
+"""
+Home page content, cached in memory.
+
+The home_content table holds one JSON document per section. HomeContentStore
+keeps the parsed {section: content} document, and its JSON encoding, in
+memory together with the home_content table version it was read at, so
+serving it doesn't query or decode anything. Writes run as one transaction
+on the writer queue, then the document is reloaded.
+"""
+import json
+import threading
+import time
+
+
+class HomeContentStore:
+    """In-memory home content document backed by the home_content table.
+
+    pool is a database.ConnectionPool for reads and run_write the app's
+    run_write(job, *tables). The cached document is re-checked against the
+    table version at most every max_age seconds, which picks up changes
+    made by other server processes. Returned documents are shared and must
+    not be modified.
+    """
+
+    def __init__(self, pool, run_write, max_age=5.0):
+        self._pool = pool
+        self._run_write = run_write
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None  # (version, document, encoded)
+        self._checked_at = 0.0
+
+    def snapshot(self):
+        """(version, document, JSON encoding) of the current content"""
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - self._checked_at > self.max_age:
+            snapshot = self._refresh()
+        return snapshot
+
+    def get(self):
+        return self.snapshot()[1]
+
+    def version(self):
+        return self.snapshot()[0]
+
+    def update_section(self, section, content, merge=False):
+        """Store content for section and return the new version.
+
+        With merge=True and both old and new content being objects, the keys
+        of content are merged into the existing section instead of replacing
+        it.
+        """
+        def write(db):
+            row = db.execute("SELECT content FROM home_content WHERE section = ?", (section,)).fetchone()
+            new_content = content
+            if merge and row is not None and isinstance(content, dict):
+                current = decode(row['content'])
+                if isinstance(current, dict):
+                    new_content = {**current, **content}
+            if row is not None:
+                db.execute("UPDATE home_content SET content = ? WHERE section = ?", (json.dumps(new_content), section))
+            else:
+                db.execute("INSERT INTO home_content (section, content) VALUES (?, ?)", (section, json.dumps(new_content)))
+
+        self._run_write(write, 'home_content')
+        return self._refresh(force=True)[0]
+
+    def replace(self, document):
+        """Replace every section with document's and return the new version"""
+        def write(db):
+            db.execute("DELETE FROM home_content")
+            db.executemany(
+                "INSERT INTO home_content (section, content) VALUES (?, ?)",
+                [(section, json.dumps(content)) for section, content in document.items()],
+            )
+
+        self._run_write(write, 'home_content')
+        return self._refresh(force=True)[0]
+
+    def _refresh(self, force=False):
+        with self._lock:
+            conn = self._pool.acquire()
+            try:
+                conn.execute("BEGIN")
+                row = conn.execute("SELECT version FROM table_versions WHERE name = 'home_content'").fetchone()
+                version = row['version'] if row else 0
+                if force or self._snapshot is None or self._snapshot[0] != version:
+                    rows = conn.execute("SELECT section, content FROM home_content ORDER BY id").fetchall()
+                    document = {row['section']: decode(row['content']) for row in rows}
+                    self._snapshot = (version, document, json.dumps(document).encode())
+                conn.rollback()
+            finally:
+                self._pool.release(conn)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+
+def decode(content):
+    """A section's stored content; anything that isn't valid JSON is returned as is"""
+    try:
+        return json.loads(content)
+    except (TypeError, ValueError):
+        return content
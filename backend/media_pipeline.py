@@ -0,0 +1,181 @@
+"""
+Image uploads and resized variants.
+
+Uploads are streamed to disk under a content hash, so identical files share
+one set of variants and every URL is immutable. Resizing runs on a small
+background thread pool; each upload directory gets a manifest.json that
+records its status, original dimensions and variant files once done.
+
+    MEDIA_ROOT/<key>/original.<ext>
+    MEDIA_ROOT/<key>/<variant>.webp
+    MEDIA_ROOT/<key>/<variant>.jpg
+    MEDIA_ROOT/<key>/manifest.json
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest edge in pixels for each variant
+VARIANTS = {
+    'thumb': 320,
+    'card': 800,
+    'full': 1920,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+ORIGINAL_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(ValueError):
+    """Raised for uploads that can't be accepted"""
+
+
+class ImagePipeline:
+    """Stores uploads and renders their variants on a worker pool.
+
+    on_ready, if given, is called with the manifest of each upload whose
+    variants have been rendered, on the worker thread.
+    """
+
+    def __init__(self, root, max_workers=2, max_bytes=20 * 1024 * 1024, on_ready=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.on_ready = on_ready
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='media')
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def store(self, stream):
+        """Stream an upload to disk and queue its variants.
+
+        Returns the manifest for the upload (status 'processing' for a new
+        file, or the existing manifest when the same content was uploaded
+        before). Raises UploadError for oversized or non-image files.
+        """
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadError('File is too large')
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            # Only the header is read here; decoding happens in the worker
+            try:
+                with Image.open(tmp_path) as image:
+                    image_format = image.format
+                    pixels = image.width * image.height
+            except Image.DecompressionBombError:
+                raise UploadError('Image dimensions are too large')
+            except (UnidentifiedImageError, OSError):
+                raise UploadError('File is not a supported image')
+            # Image.open only warns between MAX_IMAGE_PIXELS and twice that
+            if Image.MAX_IMAGE_PIXELS and pixels > Image.MAX_IMAGE_PIXELS:
+                raise UploadError('Image dimensions are too large')
+            if image_format not in ORIGINAL_EXTENSIONS:
+                raise UploadError('File is not a supported image')
+
+            key = digest.hexdigest()[:32]
+            existing = self.manifest(key)
+            if existing is not None and existing['status'] == 'ready':
+                return existing
+            with self._lock:
+                if key in self._pending:
+                    return existing
+
+            key_dir = os.path.join(self.root, key)
+            os.makedirs(key_dir, exist_ok=True)
+            original = f'original.{ORIGINAL_EXTENSIONS[image_format]}'
+            os.replace(tmp_path, os.path.join(key_dir, original))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        manifest = {'key': key, 'status': 'processing', 'original': original, 'bytes': size}
+        self._write_manifest(key, manifest)
+        with self._lock:
+            self._pending[key] = self._executor.submit(self._render, key, original)
+        return manifest
+
+    def manifest(self, key):
+        """Return the manifest for key, or None if there is no such upload"""
+        try:
+            with open(os.path.join(self.root, key, 'manifest.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def wait(self, key, timeout=None):
+        """Block until key's variants are rendered, if it is still in progress.
+
+        Returns False if they are still rendering after timeout seconds.
+        """
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except TimeoutError:
+                return False
+        return True
+
+    def _render(self, key, original):
+        key_dir = os.path.join(self.root, key)
+        manifest = {'key': key, 'status': 'ready', 'original': original, 'variants': {}}
+        try:
+            with Image.open(os.path.join(key_dir, original)) as image:
+                image = ImageOps.exif_transpose(image)
+                manifest['width'], manifest['height'] = image.size
+                for name, edge in VARIANTS.items():
+                    variant = image.copy()
+                    variant.thumbnail((edge, edge), Image.LANCZOS)
+                    files = {}
+                    for ext, (image_format, options) in FORMATS.items():
+                        # JPEG has no alpha channel
+                        target = variant if ext == 'webp' and variant.mode in ('RGB', 'RGBA') else variant.convert('RGB')
+                        filename = f'{name}.{ext}'
+                        target.save(os.path.join(key_dir, filename), image_format, **options)
+                        files[ext] = filename
+                    manifest['variants'][name] = {
+                        'width': variant.width,
+                        'height': variant.height,
+                        'files': files,
+                    }
+        except Exception as exc:
+            manifest = {'key': key, 'status': 'failed', 'original': original, 'error': str(exc)}
+        self._write_manifest(key, manifest)
+        if manifest['status'] == 'ready' and self.on_ready is not None:
+            try:
+                self.on_ready(manifest)
+            except Exception:
+                logger.exception('on_ready hook failed for %s', key)
+        with self._lock:
+            self._pending.pop(key, None)
+        return manifest
+
+    def _write_manifest(self, key, manifest):
+        path = os.path.join(self.root, key, 'manifest.json')
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,167 @@
+"""
+Per-client and per-route request rate limits.
+
+Each limit is a token bucket holding up to `count` requests and refilled at
+count/period. A bucket is stored as a single float, the time at which it
+will be full again (the "theoretical arrival time" of the generic cell rate
+algorithm, which behaves exactly like a token bucket): a request adds one
+emission interval to it, and is refused if that would push it more than
+the bucket's capacity past now. A key whose time has passed is a full
+bucket, so the in-memory store can drop it without losing anything; it
+sweeps those out periodically.
+
+Limits are checked in a before_request hook, so refused requests get a 429
+before the view runs or touches the database. Bucket state lives in a
+RateLimitStore; MemoryStore keeps it per process, and a shared store (e.g.
+Redis) can implement the same take() to limit across processes.
+"""
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, namedtuple
+
+from flask import jsonify, request
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+class Limit(namedtuple('Limit', 'count period')):
+    """count requests per period seconds, in bursts of up to count"""
+
+    @property
+    def interval(self):
+        return self.period / self.count
+
+
+def parse_limit(value):
+    """A Limit from '10/minute' (or '10/60'); None for '' or '0' (no limit)"""
+    value = (value or '').strip()
+    if value in ('', '0'):
+        return None
+    count, _, period = value.partition('/')
+    try:
+        count = int(count)
+        period = PERIODS.get(period.strip()) or float(period)
+    except ValueError:
+        raise ValueError(f'Invalid rate limit: {value!r}')
+    if count <= 0 or period <= 0:
+        raise ValueError(f'Invalid rate limit: {value!r}')
+    return Limit(count, period)
+
+
+def next_state(stored, limit, now):
+    """(allowed, new_stored, remaining, retry_after) for one request.
+
+    stored is the key's saved full-at time, or None for a full bucket.
+    """
+    full_at = max(stored or now, now) + limit.interval
+    excess = full_at - now - limit.period
+    if excess > 1e-9:
+        return False, stored, 0, excess
+    remaining = int((limit.period - (full_at - now)) / limit.interval + 1e-9)
+    return True, full_at, remaining, 0.0
+
+
+class RateLimitStore(ABC):
+    """Where bucket state is kept"""
+
+    @abstractmethod
+    def take(self, key, limit, now):
+        """Spend one request from key's bucket.
+
+        Returns (allowed, remaining, retry_after seconds); must be atomic
+        per key.
+        """
+
+
+class MemoryStore(RateLimitStore):
+    """Buckets in a dict of key -> full-at time, for a single process.
+
+    Keys whose buckets have refilled are swept every sweep_interval seconds.
+    If more than max_keys are live at once the least recently used are
+    dropped, which only ever errs towards letting requests through.
+    """
+
+    def __init__(self, max_keys=100000, sweep_interval=60, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_interval
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key, limit, now):
+        with self._lock:
+            if now >= self._next_sweep:
+                self.sweep(now)
+            allowed, full_at, remaining, retry_after = next_state(self._buckets.get(key), limit, now)
+            if allowed:
+                self._buckets[key] = full_at
+                self._buckets.move_to_end(key)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+        return allowed, remaining, retry_after
+
+    def sweep(self, now=None):
+        """Drop full buckets; called with the lock held by take()"""
+        now = self.clock() if now is None else now
+        expired = [key for key, full_at in self._buckets.items() if full_at <= now]
+        for key in expired:
+            del self._buckets[key]
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+
+class RateLimiter:
+    """Checks registered endpoints' limits before their views run.
+
+    Each endpoint may have a per_client limit, keyed by the client address,
+    and a total limit shared by all clients of that endpoint.
+    """
+
+    def __init__(self, store=None, key_func=None, clock=time.monotonic):
+        self.store = store if store is not None else MemoryStore(clock=clock)
+        self.key_func = key_func or (lambda: request.remote_addr or 'unknown')
+        self.clock = clock
+        self.rules = {}
+
+    def limit(self, endpoint, per_client=None, total=None):
+        """Limit endpoint (a view function name); limits may be Limit or '10/minute'"""
+        if isinstance(per_client, str):
+            per_client = parse_limit(per_client)
+        if isinstance(total, str):
+            total = parse_limit(total)
+        if per_client or total:
+            self.rules[endpoint] = (per_client, total)
+        else:
+            self.rules.pop(endpoint, None)
+
+    def check(self, endpoint, client):
+        """None if the request may proceed, else seconds until it may be retried"""
+        per_client, total = self.rules[endpoint]
+        now = self.clock()
+        # The shared bucket is only spent by requests their client's bucket lets through
+        for key, limit in ((f'{endpoint}:{client}', per_client), (endpoint, total)):
+            if limit is None:
+                continue
+            allowed, _, retry_after = self.store.take(key, limit, now)
+            if not allowed:
+                return retry_after
+        return None
+
+    def init_app(self, app):
+        @app.before_request
+        def enforce_rate_limits():
+            if request.method == 'OPTIONS' or request.endpoint not in self.rules:
+                return None
+            retry_after = self.check(request.endpoint, self.key_func())
+            if retry_after is None:
+                return None
+            response = jsonify({'message': 'Too many requests, try again later'})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response
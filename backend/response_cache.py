@@ -0,0 +1,105 @@
+"""
+In-process read-through cache for API responses.
+
+Entries are tagged with the tables they were built from. Writes call
+invalidate() with the tables they touched, which drops exactly the entries
+carrying those tags. Each tag also has a version counter so a response that
+was computed while a write to one of its tables committed is not stored.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """LRU cache with a TTL and tag-based invalidation"""
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, tags, expires_at)
+        self._tagged = {}  # tag -> set of keys
+        self._versions = {}  # tag -> int
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, tags, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def versions(self, tags):
+        """Current version of each tag, to pass back to set()"""
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def set(self, key, value, tags, versions=None):
+        """Store value under key.
+
+        If versions (from versions()) is given and any tag has been
+        invalidated since, the value is stale and is not stored.
+        """
+        tags = tuple(tags)
+        with self._lock:
+            if versions is not None and versions != tuple(self._versions.get(tag, 0) for tag in tags):
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, tags, time.monotonic() + self.ttl)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, *tags):
+        """Drop every entry built from any of the given tags"""
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in self._tagged.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
@@ -0,0 +1,72 @@
+"""The admin routes the dashboard calls refuse requests without its token."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+@pytest.fixture(scope='module')
+def client():
+    # The database and media paths are relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix='megareality-test-'))
+    import app as backend
+    backend.init_db()
+    try:
+        yield backend.app.test_client()
+    finally:
+        # Write the queued notifications before leaving the directory
+        backend.notification_writer.stop()
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope='module')
+def auth(client):
+    response = client.post('/api/admin/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+def create(client, auth, path, body):
+    response = client.post(path, json=body, headers=auth)
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_agent_routes_require_token(client, auth):
+    assert client.post('/api/admin/agents', json={'name': 'Asha'}).status_code == 401
+    agent_id = create(client, auth, '/api/admin/agents', {'name': 'Asha'})
+    
+    path = f'/api/admin/agents/{agent_id}'
+    assert client.put(path, json={'name': 'Asha K'}).status_code == 401
+    assert client.put(path, json={'name': 'Asha K'}, headers=auth).status_code == 200
+    assert client.delete(path).status_code == 401
+    assert client.delete(path, headers=auth).status_code == 200
+
+
+def test_builder_routes_require_token(client, auth):
+    assert client.post('/api/admin/builders', json={'name': 'Skyline'}).status_code == 401
+    builder_id = create(client, auth, '/api/admin/builders', {'name': 'Skyline'})
+    
+    path = f'/api/admin/builders/{builder_id}'
+    assert client.put(path, json={'name': 'Skyline Homes'}).status_code == 401
+    assert client.put(path, json={'name': 'Skyline Homes'}, headers=auth).status_code == 200
+    assert client.delete(path).status_code == 401
+    assert client.delete(path, headers=auth).status_code == 200
+
+
+def test_project_delete_requires_token(client, auth):
+    project_id = create(client, auth, '/api/admin/projects', {'title': 'Green Acres', 'location': 'Gurugram'})
+    
+    path = f'/api/admin/projects/{project_id}'
+    assert client.delete(path).status_code == 401
+    assert client.delete(path, headers=auth).status_code == 200
+
+
+def test_forged_token_is_refused(client):
+    headers = {'Authorization': 'Bearer not-a-token'}
+    assert client.post('/api/admin/agents', json={'name': 'Asha'}, headers=headers).status_code == 401
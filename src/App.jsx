@@ -26,6 +26,7 @@ import AgentsSection from "./components/AgentsSection";
 import AgentDetail from "./components/AgentDetail";
 import ProjectDetail from "./components/ProjectDetail";
 import AutoScrollSection from "./components/AutoScrollSection";
+import { startLiveEvents, stopLiveEvents } from "./utils/liveEvents";
 import "./App.css";
 
 function App() {
@@ -42,6 +43,12 @@ function AppContent() {
   // Check if we're on an admin page
   const isAdminPage = location.pathname.startsWith("/admin");
 
+  // Receive catalog and home content changes made in other sessions
+  React.useEffect(() => {
+    startLiveEvents();
+    return stopLiveEvents;
+  }, []);
+
   // Force full re-render when leaving homepage
   const [renderKey, setRenderKey] = React.useState(0);
 
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { motion } from "framer-motion";
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./About.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
 
@@ -16,9 +16,8 @@ const About = () => {
   useEffect(() => {
     const fetchAboutContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setAboutContent(
             data.about || {
               title: "About MegaReality",
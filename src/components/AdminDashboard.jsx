@@ -17,6 +17,28 @@ import "./Notification.css";
 import API_BASE_URL from "../config";
 import "./AdminDashboard.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl, thumbImage } from "../utils/media";
+import { resetAdminSync, syncAdminData } from "../utils/adminSync";
+
+// Uploads an image file and returns the root-relative URL of its full-size
+// (1920px) copy. The server builds the smaller variants in the background;
+// images are shown through mediaUrl, and cards and lists use the variants
+// through cardImage/thumbImage (utils/media.js).
+const uploadImageFile = async (file) => {
+  const body = new FormData();
+  body.append("file", file);
+  const response = await fetch(`${API_BASE_URL}/api/admin/media`, {
+    method: "POST",
+    headers: { Authorization: `Bearer ${localStorage.getItem("adminToken")}` },
+    body,
+  });
+  if (!response.ok) {
+    throw new Error("Image upload failed");
+  }
+  const media = await response.json();
+  return media.url;
+};
+
 const AdminDashboard = () => {
   const [activeTab, setActiveTab] = useState("properties");
   const [properties, setProperties] = useState([]);
@@ -206,147 +228,100 @@ const AdminDashboard = () => {
   const fetchData = useCallback(async () => {
     try {
       const token = localStorage.getItem("adminToken");
-      const headers = {
-        Authorization: `Bearer ${token}`,
-        "Content-Type": "application/json",
-      };
-
-      if (activeTab === "properties") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/properties`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setProperties(data);
-        }
-      } else if (activeTab === "inquiries") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/inquiries`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setInquiries(data);
-        }
-      } else if (activeTab === "admins") {
-        const response = await fetch(`${API_BASE_URL}/api/admins`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setAdmins(data);
-        }
-      } else if (activeTab === "agents") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/agents`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setAgents(data);
-        }
-      } else if (activeTab === "projects") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/projects`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setProjects(data);
-        }
-      } else if (activeTab === "builders") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/builders`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setBuilders(data);
-        }
-      } else if (activeTab === "home") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          // Ensure all required sections exist with default values
-          const updatedData = {
-            hero: {
-              title: "Find Your Dream Property",
-              subtitle:
-                "Discover the perfect place to call home with MegaReality",
-              backgroundImage:
-                "https://images.unsplash.com/photo-1600596542815-ffad4c1539a9?w=1920&q=80",
-              ...data.hero,
-            },
-            about: {
-              title: "About MegaReality",
-              description:
-                "We are a leading real estate company dedicated to helping you find your perfect property. With years of experience and a commitment to excellence, we make your property dreams come true.",
-              image:
-                "https://images.unsplash.com/photo-1560518883-ce09059eeffa?w=800&q=80",
-              ...data.about,
-            },
-            contact: {
-              phone: "+91 98765 43210",
-              email: "info@megareality.com",
-              address: "123 Real Estate Avenue, Gurugram, Haryana 122001",
-              ...data.contact,
-            },
-            properties: {
-              title: "Featured Properties",
-              description: "Discover our handpicked selection of premium properties",
-              ...data.properties,
-            },
-            agents: {
-              title: "Our Expert Agents",
-              description: "Meet our team of experienced real estate professionals",
-              ...data.agents,
-            },
-            services: {
-              title: "Our Services",
-              description: "Comprehensive real estate solutions tailored to your needs",
-              ...data.services,
-            },
-            autoscroll: {
-              title: "Auto-Scroll Section",
-              description:
-                "Dynamic content that auto-scrolls to showcase our offerings",
-              pages: [
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1560448204-e02f33c33ddc?w=1920&q=80",
-                  title: "Premium Properties",
-                  description:
-                    "Discover our collection of premium properties in the best locations",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1502672260266-1c1ef2d93688?w=1920&q=80",
-                  title: "Luxury Living",
-                  description:
-                    "Experience luxury living with our exclusive property collection",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1493663284031-b7e3aefcae8e?w=1920&q=80",
-                  title: "Modern Designs",
-                  description: "Modern architectural designs for contemporary living",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1512917774080-9991f1c4c750?w=1920&q=80",
-                  title: "Affordable Options",
-                  description: "Find affordable options without compromising on quality",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1516426122078-c23e76319801?w=1920&q=80",
-                  title: "Investment Opportunities",
-                  description: "Great investment opportunities with high returns",
-                },
-              ],
-              ...data.autoscroll,
-            },
-          };
-          setHomeContent(updatedData);
-        }
+      // Every tab is refreshed from one delta request; see utils/adminSync
+      const synced = await syncAdminData(token);
+      setProperties(synced.properties);
+      setInquiries(synced.inquiries);
+      setAdmins(synced.admins);
+      setAgents(synced.agents);
+      setProjects(synced.projects);
+      setBuilders(synced.builders);
+
+      // The home form is only reset while it's the open tab, so a sync
+      // triggered elsewhere doesn't discard unsaved edits
+      if (activeTab === "home") {
+        const data = synced.home_content;
+        // Ensure all required sections exist with default values
+        const updatedData = {
+          hero: {
+            title: "Find Your Dream Property",
+            subtitle:
+              "Discover the perfect place to call home with MegaReality",
+            backgroundImage:
+              "https://images.unsplash.com/photo-1600596542815-ffad4c1539a9?w=1920&q=80",
+            ...data.hero,
+          },
+          about: {
+            title: "About MegaReality",
+            description:
+              "We are a leading real estate company dedicated to helping you find your perfect property. With years of experience and a commitment to excellence, we make your property dreams come true.",
+            image:
+              "https://images.unsplash.com/photo-1560518883-ce09059eeffa?w=800&q=80",
+            ...data.about,
+          },
+          contact: {
+            phone: "+91 98765 43210",
+            email: "info@megareality.com",
+            address: "123 Real Estate Avenue, Gurugram, Haryana 122001",
+            ...data.contact,
+          },
+          properties: {
+            title: "Featured Properties",
+            description: "Discover our handpicked selection of premium properties",
+            ...data.properties,
+          },
+          agents: {
+            title: "Our Expert Agents",
+            description: "Meet our team of experienced real estate professionals",
+            ...data.agents,
+          },
+          services: {
+            title: "Our Services",
+            description: "Comprehensive real estate solutions tailored to your needs",
+            ...data.services,
+          },
+          autoscroll: {
+            title: "Auto-Scroll Section",
+            description:
+              "Dynamic content that auto-scrolls to showcase our offerings",
+            pages: [
+              {
+                backgroundImage:
+                  "https://images.unsplash.com/photo-1560448204-e02f33c33ddc?w=1920&q=80",
+                title: "Premium Properties",
+                description:
+                  "Discover our collection of premium properties in the best locations",
+              },
+              {
+                backgroundImage:
+                  "https://images.unsplash.com/photo-1502672260266-1c1ef2d93688?w=1920&q=80",
+                title: "Luxury Living",
+                description:
+                  "Experience luxury living with our exclusive property collection",
+              },
+              {
+                backgroundImage:
+                  "https://images.unsplash.com/photo-1493663284031-b7e3aefcae8e?w=1920&q=80",
+                title: "Modern Designs",
+                description: "Modern architectural designs for contemporary living",
+              },
+              {
+                backgroundImage:
+                  "https://images.unsplash.com/photo-1512917774080-9991f1c4c750?w=1920&q=80",
+                title: "Affordable Options",
+                description: "Find affordable options without compromising on quality",
+              },
+              {
+                backgroundImage:
+                  "https://images.unsplash.com/photo-1516426122078-c23e76319801?w=1920&q=80",
+                title: "Investment Opportunities",
+                description: "Great investment opportunities with high returns",
+              },
+            ],
+            ...data.autoscroll,
+          },
+        };
+        setHomeContent(updatedData);
       }
     } catch (error) {
       console.error("Error fetching data:", error);
@@ -358,162 +333,9 @@ const AdminDashboard = () => {
     fetchData();
   }, [activeTab, fetchData]);
 
-  const
-    try {
-      const token = localStorage.getItem("adminToken");
-      const headers = {
-        Authorization: `Bearer ${token}`,
-        "Content-Type": "application/json",
-      };
-
-      if (activeTab === "properties") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/properties`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setProperties(data);
-        }
-      } else if (activeTab === "inquiries") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/inquiries`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setInquiries(data);
-        }
-      } else if (activeTab === "admins") {
-        const response = await fetch(`${API_BASE_URL}/api/admins`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setAdmins(data);
-        }
-      } else if (activeTab === "agents") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/agents`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setAgents(data);
-        }
-      } else if (activeTab === "projects") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/projects`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setProjects(data);
-        }
-      } else if (activeTab === "builders") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/builders`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          setBuilders(data);
-        }
-      } else if (activeTab === "home") {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`, {
-          headers,
-        });
-        if (response.ok) {
-          const data = await response.json();
-          // Ensure all required sections exist with default values
-          const updatedData = {
-            hero: {
-              title: "Find Your Dream Property",
-              subtitle:
-                "Discover the perfect place to call home with MegaReality",
-              backgroundImage:
-                "https://images.unsplash.com/photo-1600596542815-ffad4c1539a9?w=1920&q=80",
-              ...data.hero,
-            },
-            about: {
-              title: "About MegaReality",
-              description:
-                "We are a leading real estate company dedicated to helping you find your perfect property. With years of experience and a commitment to excellence, we make your property dreams come true.",
-              image:
-                "https://images.unsplash.com/photo-1560518883-ce09059eeffa?w=800&q=80",
-              ...data.about,
-            },
-            contact: {
-              phone: "+91 98765 43210",
-              email: "info@megareality.com",
-              address: "123 Real Estate Avenue, Gurugram, Haryana 122001",
-              ...data.contact,
-            },
-            properties: {
-              title: "Featured Properties",
-              description:
-                "Discover our handpicked selection of premium properties",
-              ...data.properties,
-            },
-            agents: {
-              title: "Our Expert Agents",
-              description:
-                "Meet our team of experienced real estate professionals",
-              ...data.agents,
-            },
-            services: {
-              title: "Our Services",
-              description:
-                "Comprehensive real estate solutions tailored to your needs",
-              ...data.services,
-            },
-            autoscroll: {
-              title: "Auto-Scroll Section",
-              description:
-                "Dynamic content that auto-scrolls to showcase our offerings",
-              pages: [
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1560448204-e02f33c33ddc?w=1920&q=80",
-                  title: "Premium Properties",
-                  description:
-                    "Discover our collection of premium properties in the best locations",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1502672260266-1c1ef2d93688?w=1920&q=80",
-                  title: "Luxury Living",
-                  description:
-                    "Experience luxury living with our exclusive property collection",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1493663284031-b7e3aefcae8e?w=1920&q=80",
-                  title: "Modern Designs",
-                  description:
-                    "Modern architectural designs for contemporary living",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1512917774080-9991f1c4c750?w=1920&q=80",
-                  title: "Affordable Options",
-                  description:
-                    "Find affordable options without compromising on quality",
-                },
-                {
-                  backgroundImage:
-                    "https://images.unsplash.com/photo-1516426122078-c23e76319801?w=1920&q=80",
-                  title: "Investment Opportunities",
-                  description:
-                    "Great investment opportunities with high returns",
-                },
-              ],
-              ...data.autoscroll,
-            },
-          };
-          setHomeContent(updatedData);
-        }
-      }
-    } catch (error) {
-      console.error("Error fetching data:", error);
-    }
   const handleLogout = () => {
     localStorage.removeItem("adminToken");
+    resetAdminSync();
     navigate("/admin/login");
   };
 
@@ -555,6 +377,18 @@ const AdminDashboard = () => {
         ...prev,
         images: newImages,
       }));
+      // Swap the local preview for the uploaded image's URL
+      const replacePreview = (images, uploadedUrl) =>
+        images.map((image) => (image === imageUrl ? uploadedUrl : image));
+      uploadImageFile(file)
+        .then((uploadedUrl) => {
+          setImageInputs((prev) => replacePreview(prev, uploadedUrl));
+          setFormData((prev) => ({
+            ...prev,
+            images: replacePreview(prev.images, uploadedUrl),
+          }));
+        })
+        .catch((error) => console.error("Error uploading image:", error));
     }
   }, [fileInputs, imageInputs]);
 
@@ -642,6 +476,14 @@ const AdminDashboard = () => {
         ...prev,
         image: imageUrl,
       }));
+      uploadImageFile(file)
+        .then((uploadedUrl) =>
+          setAgentForm((prev) => ({
+            ...prev,
+            image: prev.image === imageUrl ? uploadedUrl : prev.image,
+          }))
+        )
+        .catch((error) => console.error("Error uploading image:", error));
     }
   }, [agentFileInputs]);
 
@@ -726,6 +568,14 @@ const AdminDashboard = () => {
         ...prev,
         image: imageUrl,
       }));
+      uploadImageFile(file)
+        .then((uploadedUrl) =>
+          setBuilderForm((prev) => ({
+            ...prev,
+            image: prev.image === imageUrl ? uploadedUrl : prev.image,
+          }))
+        )
+        .catch((error) => console.error("Error uploading image:", error));
     }
   }, [builderFileInputs]);
 
@@ -1015,9 +865,11 @@ const AdminDashboard = () => {
         properties_sold: parseInt(agentForm.properties_sold) || 0,
       };
 
+      const token = localStorage.getItem("adminToken");
       const response = await fetch(url, {
         method: method,
         headers: {
+          Authorization: `Bearer ${token}`,
           "Content-Type": "application/json",
         },
         body: JSON.stringify(payload),
@@ -1073,10 +925,14 @@ const AdminDashboard = () => {
   const handleDeleteAgent = useCallback(async (agentId) => {
     if (window.confirm("Are you sure you want to delete this agent?")) {
       try {
+        const token = localStorage.getItem("adminToken");
         const response = await fetch(
           `${API_BASE_URL}/api/admin/agents/${agentId}`,
           {
             method: "DELETE",
+            headers: {
+              Authorization: `Bearer ${token}`,
+            },
           }
         );
 
@@ -1114,9 +970,11 @@ const AdminDashboard = () => {
         projects_count: parseInt(builderForm.projects_count) || 0,
       };
 
+      const token = localStorage.getItem("adminToken");
       const response = await fetch(url, {
         method: method,
         headers: {
+          Authorization: `Bearer ${token}`,
           "Content-Type": "application/json",
         },
         body: JSON.stringify(payload),
@@ -1270,10 +1128,14 @@ const AdminDashboard = () => {
   const handleDeleteProject = useCallback(async (projectId) => {
     if (window.confirm("Are you sure you want to delete this project?")) {
       try {
+        const token = localStorage.getItem("adminToken");
         const response = await fetch(
           `${API_BASE_URL}/api/admin/projects/${projectId}`,
           {
             method: "DELETE",
+            headers: {
+              Authorization: `Bearer ${token}`,
+            },
           }
         );
 
@@ -1297,10 +1159,14 @@ const AdminDashboard = () => {
   const handleDeleteBuilder = useCallback(async (builderId) => {
     if (window.confirm("Are you sure you want to delete this builder?")) {
       try {
+        const token = localStorage.getItem("adminToken");
         const response = await fetch(
           `${API_BASE_URL}/api/admin/builders/${builderId}`,
           {
             method: "DELETE",
+            headers: {
+              Authorization: `Bearer ${token}`,
+            },
           }
         );
 
@@ -1341,7 +1207,7 @@ const AdminDashboard = () => {
           <div key={property.id} className="property-card">
             <div className="property-image">
               {property.images && property.images.length > 0 ? (
-                <img src={property.images[0]} alt={property.title} />
+                <img src={thumbImage(property.images[0])} alt={property.title} />
               ) : (
                 <div className="no-image">No Image</div>
               )}
@@ -1572,7 +1438,7 @@ const AdminDashboard = () => {
                           />
                           {url && (
                             <div className="file-preview">
-                              <img src={url} alt={`Preview ${index + 1}`} />
+                              <img src={mediaUrl(url)} alt={`Preview ${index + 1}`} />
                             </div>
                           )}
                         </div>
@@ -1607,7 +1473,7 @@ const AdminDashboard = () => {
                       .map((url, index) => (
                         <img
                           key={index}
-                          src={url}
+                          src={mediaUrl(url)}
                           alt={`Preview ${index + 1}`}
                         />
                       ))}
@@ -2599,7 +2465,7 @@ const AdminDashboard = () => {
           <div key={project.id} className="property-card">
             <div className="property-image">
               {project.images && project.images.length > 0 ? (
-                <img src={project.images[0]} alt={project.title} />
+                <img src={thumbImage(project.images[0])} alt={project.title} />
               ) : (
                 <div className="no-image">No Image</div>
               )}
@@ -3029,7 +2895,7 @@ const AdminDashboard = () => {
                               />
                               {url && (
                                 <div className="file-preview">
-                                  <img src={url} alt={`Preview ${index + 1}`} />
+                                  <img src={mediaUrl(url)} alt={`Preview ${index + 1}`} />
                                 </div>
                               )}
                             </div>
@@ -3065,7 +2931,7 @@ const AdminDashboard = () => {
                           .map((url, index) => (
                             <img
                               key={index}
-                              src={url}
+                              src={mediaUrl(url)}
                               alt={`Preview ${index + 1}`}
                             />
                           ))}
@@ -3275,7 +3141,7 @@ const AdminDashboard = () => {
                             />
                             {agentForm.image && (
                               <div className="file-preview">
-                                <img src={agentForm.image} alt="Preview" />
+                                <img src={mediaUrl(agentForm.image)} alt="Preview" />
                               </div>
                             )}
                           </div>
@@ -3317,7 +3183,7 @@ const AdminDashboard = () => {
                     <div className="agent-image-wrapper">
                       {agent.image ? (
                         <img
-                          src={agent.image}
+                          src={mediaUrl(agent.image)}
                           alt={agent.name}
                           className="agent-image"
                         />
@@ -3484,7 +3350,7 @@ const AdminDashboard = () => {
                               />
                               {builderForm.image && (
                                 <div className="file-preview">
-                                  <img src={builderForm.image} alt="Preview" />
+                                  <img src={mediaUrl(builderForm.image)} alt="Preview" />
                                 </div>
                               )}
                             </div>
@@ -3530,7 +3396,7 @@ const AdminDashboard = () => {
                     <div className="builder-image-wrapper">
                       {builder.image ? (
                         <img
-                          src={builder.image}
+                          src={mediaUrl(builder.image)}
                           alt={builder.name}
                           className="builder-image"
                         />
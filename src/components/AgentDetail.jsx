@@ -4,6 +4,7 @@ import { motion } from "framer-motion";
 import API_BASE_URL from "../config";
 import "./AgentDetail.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl } from "../utils/media";
 
 const AgentDetail = () => {
   const { id } = useParams();
@@ -145,7 +146,7 @@ const AgentDetail = () => {
 
         <div className="agent-header">
           <div className="agent-image-large">
-            <img src={agent.image} alt={agent.name} />
+            <img src={mediaUrl(agent.image)} alt={agent.name} />
           </div>
 
           <div className="agent-basic-info">
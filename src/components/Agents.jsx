@@ -3,6 +3,7 @@ import { useNavigate } from "react-router-dom";
 import "./Agents.css";
 import API_BASE_URL from "../config";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl } from "../utils/media";
 
 const Agents = () => {
   const [agents, setAgents] = useState([]);
@@ -104,7 +105,7 @@ const Agents = () => {
               style={{ cursor: "pointer" }}
             >
               <div className="agent-image">
-                <img src={agent.image} alt={agent.name} />
+                <img src={mediaUrl(agent.image)} alt={agent.name} />
               </div>
               <div className="agent-info">
                 <h3>{agent.name}</h3>
@@ -2,9 +2,10 @@ import { useState, useEffect } from "react";
 import { motion } from "framer-motion";
 import { FaArrowLeft, FaArrowRight } from "react-icons/fa";
 import { useNavigate } from "react-router-dom";
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./AgentsSection.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl } from "../utils/media";
 
 const AgentsSection = () => {
   const [agents, setAgents] = useState([]);
@@ -21,8 +22,7 @@ const AgentsSection = () => {
   useEffect(() => {
     const fetchAgents = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/agents`);
-        const data = await response.json();
+        const data = (await getHomepage()).agents;
 
         setAgents(data);
         setLoading(false);
@@ -54,8 +54,7 @@ const AgentsSection = () => {
   // Function to fetch agents
   const fetchAgents = async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/agents`);
-      const data = await response.json();
+      const data = (await getHomepage()).agents;
       setAgents(data);
     } catch (error) {
       console.error("Error fetching agents:", error);
@@ -82,9 +81,8 @@ const AgentsSection = () => {
   useEffect(() => {
     const fetchHomeContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setSectionContent({
             title: data.agents?.title || "Meet Our Agents",
             description:
@@ -226,7 +224,7 @@ const AgentsSection = () => {
                 style={{ cursor: "pointer" }}
               >
                 <div className="agent-image">
-                  <img src={agent.image} alt={agent.name} loading="lazy" />
+                  <img src={mediaUrl(agent.image)} alt={agent.name} loading="lazy" />
                 </div>
                 <div className="agent-info">
                   <h3>{agent.name}</h3>
@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
 import { FaChevronLeft, FaChevronRight } from "react-icons/fa"; // Removed FaPlay, FaPause since we're removing the toggle
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./AutoScrollSection.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
 
@@ -49,9 +49,8 @@ const AutoScrollSection = () => {
   useEffect(() => {
     const fetchHomeContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           // First, try to get specific autoscroll content
           if (data.autoscroll && data.autoscroll.pages) {
             setPages(data.autoscroll.pages);
@@ -8,6 +8,7 @@ import {
   FaPaperPlane,
 } from "react-icons/fa";
 import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./Contact.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
 
@@ -34,9 +35,8 @@ const Contact = () => {
   useEffect(() => {
     const fetchContactContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setContactContent(
             data.contact || {
               phone: "+91 98765 43210",
@@ -8,7 +8,7 @@ import {
   FaRupeeSign,
   FaChevronDown,
 } from "react-icons/fa";
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./Hero.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
 
@@ -34,9 +34,8 @@ const Hero = () => {
   useEffect(() => {
     const fetchHeroContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setHeroContent(
             data.hero || {
               title: "Find Your Dream Property",
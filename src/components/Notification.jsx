@@ -2,6 +2,10 @@ import { useState, useEffect } from "react";
 import { FaBell, FaTimes, FaCheck, FaCheckDouble } from "react-icons/fa";
 import API_BASE_URL from "../config";
 
+// Only the newest notifications are shown; the badge count comes from the
+// server so the poll doesn't grow with the notification history
+const NOTIFICATION_PAGE_SIZE = 20;
+
 const Notification = ({ token }) => {
   const [notifications, setNotifications] = useState([]);
   const [showNotifications, setShowNotifications] = useState(false);
@@ -11,16 +15,27 @@ const Notification = ({ token }) => {
     if (!token) return;
 
     try {
-      const response = await fetch(`${API_BASE_URL}/api/admin/notifications`, {
-        headers: {
-          Authorization: `Bearer ${token}`,
-          "Content-Type": "application/json",
-        },
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        setNotifications(data);
+      const headers = {
+        Authorization: `Bearer ${token}`,
+        "Content-Type": "application/json",
+      };
+      const [listResponse, countResponse] = await Promise.all([
+        fetch(
+          `${API_BASE_URL}/api/admin/notifications?limit=${NOTIFICATION_PAGE_SIZE}`,
+          { headers }
+        ),
+        fetch(`${API_BASE_URL}/api/admin/notifications/unread-count`, {
+          headers,
+        }),
+      ]);
+
+      if (listResponse.ok) {
+        const data = await listResponse.json();
+        setNotifications(data.items);
+      }
+      if (countResponse.ok) {
+        const data = await countResponse.json();
+        setUnreadCount(data.unread_count);
       }
     } catch (error) {
       console.error("Error fetching notifications:", error);
@@ -35,12 +50,6 @@ const Notification = ({ token }) => {
     return () => clearInterval(interval);
   }, [token]);
 
-  useEffect(() => {
-    // Calculate unread count
-    const unread = notifications.filter((n) => !n.read).length;
-    setUnreadCount(unread);
-  }, [notifications]);
-
   const markAsRead = async (notificationId) => {
     try {
       const response = await fetch(
@@ -56,8 +65,11 @@ const Notification = ({ token }) => {
 
       if (response.ok) {
         setNotifications((prev) =>
-          prev.map((n) => (n.id === notificationId ? { ...n, read: true } : n))
+          prev.map((n) =>
+            n.id === notificationId ? { ...n, read_status: 1 } : n
+          )
         );
+        setUnreadCount((prev) => Math.max(prev - 1, 0));
       }
     } catch (error) {
       console.error("Error marking notification as read:", error);
@@ -78,7 +90,8 @@ const Notification = ({ token }) => {
       );
 
       if (response.ok) {
-        setNotifications((prev) => prev.map((n) => ({ ...n, read: true })));
+        setNotifications((prev) => prev.map((n) => ({ ...n, read_status: 1 })));
+        setUnreadCount(0);
       }
     } catch (error) {
       console.error("Error marking all notifications as read:", error);
@@ -143,7 +156,7 @@ const Notification = ({ token }) => {
                 <div
                   key={notification.id}
                   className={`notification-item ${
-                    !notification.read ? "unread" : ""
+                    !notification.read_status ? "unread" : ""
                   }`}
                 >
                   <div className="notification-content">
@@ -158,7 +171,7 @@ const Notification = ({ token }) => {
                       </small>
                     </div>
                   </div>
-                  {!notification.read && (
+                  {!notification.read_status && (
                     <button
                       className="mark-read-btn"
                       onClick={() => markAsRead(notification.id)}
@@ -4,6 +4,7 @@ import { motion } from "framer-motion";
 import API_BASE_URL from "../config";
 import "./ProjectDetail.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl } from "../utils/media";
 
 const ProjectDetail = () => {
   const { id } = useParams();
@@ -146,7 +147,7 @@ const ProjectDetail = () => {
         <div className="project-header">
           <div className="project-image-large">
             {project.images && project.images.length > 0 ? (
-              <img src={project.images[0]} alt={project.title} />
+              <img src={mediaUrl(project.images[0])} alt={project.title} />
             ) : (
               <div className="no-image-large">No Image Available</div>
             )}
@@ -237,7 +238,7 @@ const ProjectDetail = () => {
               <div className="project-gallery">
                 {project.images.slice(1).map((image, index) => (
                   <div key={index} className="gallery-item">
-                    <img src={image} alt={`Project view ${index + 1}`} />
+                    <img src={mediaUrl(image)} alt={`Project view ${index + 1}`} />
                   </div>
                 ))}
               </div>
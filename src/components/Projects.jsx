@@ -10,6 +10,7 @@ import {
 import API_BASE_URL from "../config";
 import "./Projects.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { cardImage } from "../utils/media";
 
 const Projects = () => {
   const [projects, setProjects] = useState([]);
@@ -157,7 +158,7 @@ const Projects = () => {
                   <div className="project-image">
                     {project.images && project.images.length > 0 ? (
                       <img
-                        src={project.images[0]}
+                        src={cardImage(project.images[0])}
                         alt={project.title}
                         loading="lazy"
                       />
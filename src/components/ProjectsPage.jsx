@@ -5,6 +5,7 @@ import { FaMapMarkerAlt, FaSearch } from "react-icons/fa";
 import API_BASE_URL from "../config";
 import "./ProjectsPage.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { cardImage } from "../utils/media";
 
 const ProjectsPage = () => {
   const [projects, setProjects] = useState([]);
@@ -229,7 +230,7 @@ const ProjectsPage = () => {
                 <div className="project-image">
                   {project.images && project.images.length > 0 ? (
                     <img
-                      src={project.images[0]}
+                      src={cardImage(project.images[0])}
                       alt={project.title}
                       loading="lazy"
                     />
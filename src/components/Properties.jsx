@@ -8,8 +8,24 @@ import {
   FaArrowRight,
 } from "react-icons/fa";
 import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./Properties.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { cardImage } from "../utils/media";
+import { LOCATION_TERMS } from "../utils/locations";
+
+// Listings whose location contains any of terms, newest first like the
+// homepage
+const fetchPropertiesIn = async (terms) => {
+  const params = new URLSearchParams({ fields: "card,images,created_at" });
+  terms.forEach((term) => params.append("location", term));
+  const response = await fetch(`${API_BASE_URL}/api/properties?${params}`);
+  if (!response.ok) {
+    throw new Error(`Properties request failed: ${response.status}`);
+  }
+  const data = await response.json();
+  return data.sort((a, b) => (b.created_at || "").localeCompare(a.created_at || ""));
+};
 
 const Properties = () => {
   const [properties, setProperties] = useState([]);
@@ -24,44 +40,13 @@ const Properties = () => {
 
   const navigate = useNavigate();
 
-  // Apply location filter function
-  const applyLocationFilter = (location) => {
-    if (!properties.length) return; // Handle empty properties
-
-    let filtered = properties;
-
-    // Apply location filter based on selected location if location is specified
-    if (location && location !== "") {
-      if (location === "gurugram") {
-        filtered = filtered.filter(
-          (prop) =>
-            prop.location.toLowerCase().includes("gurugram") ||
-            prop.location.toLowerCase().includes("gurgaon")
-        );
-      } else if (location === "delhi") {
-        filtered = filtered.filter(
-          (prop) =>
-            prop.location.toLowerCase().includes("delhi") ||
-            prop.location.toLowerCase().includes("new delhi")
-        );
-      }
-    } else {
-      // If no location is selected, show all properties
-      filtered = properties;
-    }
-
-    setFilteredProperties(filtered);
-  };
-
   // Listen for location changes
   useEffect(() => {
     const handleLocationChange = (e) => {
       setLocationChanging(true);
-      const newLocation = e.detail.location;
-      setSelectedLocation(newLocation);
-
-      // Apply location filter immediately
-      applyLocationFilter(newLocation);
+      // TopBar sends the location name itself as the detail
+      const newLocation = e.detail?.location ?? e.detail ?? "";
+      setSelectedLocation(newLocation.toLowerCase());
 
       // Simulate loading delay for better UX
       setTimeout(() => {
@@ -74,35 +59,21 @@ const Properties = () => {
     // Check initial location from localStorage
     const savedLocation = localStorage.getItem("selectedLocation");
     if (savedLocation) {
-      const normalizedLocation = savedLocation.toLowerCase();
-      setSelectedLocation(normalizedLocation);
-      applyLocationFilter(normalizedLocation);
+      setSelectedLocation(savedLocation.toLowerCase());
     }
 
     return () => {
       window.removeEventListener("locationChanged", handleLocationChange);
     };
-  }, [applyLocationFilter]); // Added applyLocationFilter to dependency array
+  }, []);
 
   // Fetch properties from backend
   useEffect(() => {
     const fetchProperties = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/properties`);
-        const data = await response.json();
+        const data = (await getHomepage()).properties;
         setProperties(data);
-
-        setFilteredProperties(data);
-
         setLoading(false);
-
-        // Apply location filter after initial load if needed
-        const savedLocation = localStorage.getItem("selectedLocation");
-        if (savedLocation) {
-          const normalizedLocation = savedLocation.toLowerCase();
-          setSelectedLocation(normalizedLocation);
-          applyLocationFilter(normalizedLocation);
-        }
       } catch (error) {
         console.error("Error fetching properties:", error);
         setLoading(false);
@@ -112,20 +83,36 @@ const Properties = () => {
     fetchProperties();
   }, []);
 
-  // Re-apply location filter whenever properties change
+  // Without a location the section shows the homepage's newest listings.
+  // With one, the matching listings come from the server, since the
+  // homepage only carries the newest few and older matches would be missed.
   useEffect(() => {
-    if (properties.length > 0) {
-      applyLocationFilter(selectedLocation);
+    const terms = LOCATION_TERMS[selectedLocation];
+    if (!terms) {
+      setFilteredProperties(properties);
+      return;
     }
-  }, [properties, selectedLocation, applyLocationFilter]);
+
+    let cancelled = false;
+    fetchPropertiesIn(terms)
+      .then((data) => {
+        if (!cancelled) setFilteredProperties(data);
+      })
+      .catch((error) => {
+        console.error("Error fetching properties for location:", error);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [properties, selectedLocation]);
 
   // Fetch section content from admin panel
   useEffect(() => {
     const fetchHomeContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setSectionContent({
             title: data.properties?.title || "Featured Properties",
             description:
@@ -183,14 +170,9 @@ const Properties = () => {
   // Function to fetch properties
   const fetchProperties = async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/properties`);
-      const data = await response.json();
+      // The location filter re-runs when properties change
+      const data = (await getHomepage()).properties;
       setProperties(data);
-      setFilteredProperties(data);
-      // Apply location filter if needed
-      if (selectedLocation) {
-        applyLocationFilter(selectedLocation);
-      }
     } catch (error) {
       console.error("Error fetching properties:", error);
     }
@@ -342,7 +324,7 @@ const Properties = () => {
                     <div className="property-image">
                       {property.images && property.images.length > 0 ? (
                         <img
-                          src={property.images[0]}
+                          src={cardImage(property.images[0])}
                           alt={property.title}
                           loading="lazy"
                         />
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useNavigate, useSearchParams, useLocation } from "react-router-dom";
 import { motion } from "framer-motion";
 import {
@@ -11,13 +11,51 @@ import {
 import API_BASE_URL from "../config";
 import "./Properties.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { cardImage } from "../utils/media";
+import { LOCATION_TERMS } from "../utils/locations";
+
+const PAGE_SIZE = 24;
+
+// Query parameters selecting the listings that match the page's filters,
+// shared by the list and facet requests
+const filterParams = (filters, selectedLocation, builderId) => {
+  const params = new URLSearchParams();
+  (LOCATION_TERMS[selectedLocation] || []).forEach((term) =>
+    params.append("city", term)
+  );
+  if (builderId) params.set("builder", builderId);
+  if (filters.location) params.set("location", filters.location);
+  if (filters.propertyType) params.set("type", filters.propertyType);
+  if (filters.status) params.set("status", filters.status);
+  if (filters.minPrice) params.set("min_price", filters.minPrice);
+  if (filters.maxPrice) params.set("max_price", filters.maxPrice);
+  return params;
+};
+
+// One page of matching listings as {items, next_cursor}
+const fetchPropertyPage = async (params, cursor, signal) => {
+  const query = new URLSearchParams(params);
+  query.set("fields", "card");
+  query.set("limit", PAGE_SIZE);
+  if (cursor) query.set("cursor", cursor);
+  const response = await fetch(`${API_BASE_URL}/api/properties?${query}`, {
+    signal,
+  });
+  if (!response.ok) {
+    throw new Error(`Properties request failed: ${response.status}`);
+  }
+  return response.json();
+};
 
 const PropertiesPage = () => {
   const [properties, setProperties] = useState([]);
-  const [filteredProperties, setFilteredProperties] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [locationChanging, setLocationChanging] = useState(false);
-  const [selectedLocation, setSelectedLocation] = useState("gurugram");
+  const [selectedLocation, setSelectedLocation] = useState(() =>
+    (localStorage.getItem("selectedLocation") || "gurugram").toLowerCase()
+  );
   const [searchFilters, setSearchFilters] = useState({
     location: "",
     propertyType: "",
@@ -25,171 +63,87 @@ const PropertiesPage = () => {
     maxPrice: "",
     status: "",
   });
+  const [facets, setFacets] = useState(null);
+  // Bumped to refetch the first page after listings change
+  const [refreshKey, setRefreshKey] = useState(0);
   const [searchParams] = useSearchParams();
   const location = useLocation();
   const builderId = searchParams.get("builder");
+  // The filters of the list currently shown, so a "load more" that
+  // finishes after they change is dropped
+  const currentQuery = useRef("");
 
   const navigate = useNavigate();
 
-  // Apply location filter function
-  const applyLocationFilter = (location) => {
-    if (!location || !properties.length) return; // Handle undefined/null location and empty properties
-
-    let filtered = [...properties];
-
-    // Apply location filter based on selected location
-    if (location === "gurugram") {
-      filtered = filtered.filter(
-        (prop) =>
-          prop.location.toLowerCase().includes("gurugram") ||
-          prop.location.toLowerCase().includes("gurgaon")
-      );
-    } else if (location === "delhi") {
-      filtered = filtered.filter(
-        (prop) =>
-          prop.location.toLowerCase().includes("delhi") ||
-          prop.location.toLowerCase().includes("new delhi")
-      );
-    }
-
-    // If filtering by builder, apply that filter
-    if (builderId) {
-      filtered = filtered.filter(
-        (prop) => prop.builder_id && prop.builder_id.toString() === builderId
-      );
-    }
-
-    // Apply other existing filters
-    if (searchFilters.location) {
-      filtered = filtered.filter((prop) =>
-        prop.location
-          .toLowerCase()
-          .includes(searchFilters.location.toLowerCase())
-      );
-    }
-
-    if (searchFilters.propertyType) {
-      filtered = filtered.filter(
-        (prop) => prop.property_type === searchFilters.propertyType
-      );
-    }
-
-    if (searchFilters.minPrice) {
-      filtered = filtered.filter(
-        (prop) => prop.price >= parseFloat(searchFilters.minPrice)
-      );
-    }
-
-    if (searchFilters.maxPrice) {
-      filtered = filtered.filter(
-        (prop) => prop.price <= parseFloat(searchFilters.maxPrice)
-      );
-    }
-
-    if (searchFilters.status) {
-      filtered = filtered.filter(
-        (prop) => prop.status === searchFilters.status
-      );
-    }
-
-    setFilteredProperties(filtered);
-  };
-
   // Listen for location changes
   useEffect(() => {
     const handleLocationChange = (e) => {
+      const newLocation = e.detail?.location ?? e.detail;
+      if (typeof newLocation !== "string") return;
       setLocationChanging(true);
-      const newLocation = e.detail.location;
-      setSelectedLocation(newLocation);
-      applyLocationFilter(newLocation);
-
-      // Simulate loading delay for better UX
-      setTimeout(() => {
-        setLocationChanging(false);
-      }, 500);
+      setSelectedLocation(newLocation.toLowerCase());
     };
 
     window.addEventListener("locationChanged", handleLocationChange);
 
-    // Check initial location from localStorage
-    const savedLocation = localStorage.getItem("selectedLocation");
-    if (savedLocation) {
-      const normalizedLocation = savedLocation.toLowerCase();
-      setSelectedLocation(normalizedLocation);
-      applyLocationFilter(normalizedLocation);
-    }
-
     return () => {
       window.removeEventListener("locationChanged", handleLocationChange);
     };
-  }, [applyLocationFilter]); // Added applyLocationFilter to dependency array
+  }, []);
 
-  // Fetch properties from backend
+  // Fetch the first page of matching properties whenever the filters change
   useEffect(() => {
-    const fetchProperties = async () => {
-      try {
-        const response = await fetch(`${API_BASE_URL}/api/properties`);
-        const data = await response.json();
-        setProperties(data);
-        setFilteredProperties(data);
-        setLoading(false);
-
-        // Apply location filter after initial load if needed
-        const savedLocation = localStorage.getItem("selectedLocation");
-        if (savedLocation) {
-          const normalizedLocation = savedLocation.toLowerCase();
-          setSelectedLocation(normalizedLocation);
-          applyLocationFilter(normalizedLocation);
-        }
-      } catch (error) {
+    const params = filterParams(searchFilters, selectedLocation, builderId);
+    currentQuery.current = params.toString();
+
+    const controller = new AbortController();
+    fetchPropertyPage(params, null, controller.signal)
+      .then((page) => {
+        setProperties(page.items);
+        setNextCursor(page.next_cursor);
+      })
+      .catch((error) => {
+        if (error.name === "AbortError") return;
         console.error("Error fetching properties:", error);
-        setLoading(false);
+        setProperties([]);
+        setNextCursor(null);
+      })
+      .finally(() => {
+        if (!controller.signal.aborted) {
+          setLoading(false);
+          setLocationChanging(false);
+        }
+      });
+
+    return () => controller.abort();
+  }, [searchFilters, selectedLocation, builderId, refreshKey]);
+
+  const loadMore = async () => {
+    const params = filterParams(searchFilters, selectedLocation, builderId);
+    const query = params.toString();
+    setLoadingMore(true);
+    try {
+      const page = await fetchPropertyPage(params, nextCursor);
+      if (currentQuery.current === query) {
+        setProperties((prev) => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
       }
-    };
-
-    fetchProperties();
-  }, []);
-
-  // Re-apply location filter whenever properties change
-  useEffect(() => {
-    if (properties.length > 0) {
-      applyLocationFilter(selectedLocation);
+    } catch (error) {
+      console.error("Error fetching properties:", error);
+    } finally {
+      setLoadingMore(false);
     }
-  }, [properties, selectedLocation, applyLocationFilter]);
+  };
 
   // Listen for property changes
   useEffect(() => {
     const handlePropertiesChanged = () => {
-      // Re-fetch properties when changes occur
-      const fetchProperties = async () => {
-        try {
-          const response = await fetch(`${API_BASE_URL}/api/properties`);
-          const data = await response.json();
-          setProperties(data);
-          setFilteredProperties(data);
-        } catch (error) {
-          console.error("Error fetching properties:", error);
-        }
-      };
-
-      fetchProperties();
+      setRefreshKey((key) => key + 1);
     };
 
     const handleFavoritesChanged = (data) => {
       if (data.entityType === "property") {
-        // Re-fetch properties to get updated favorite status
-        const fetchProperties = async () => {
-          try {
-            const response = await fetch(`${API_BASE_URL}/api/properties`);
-            const data = await response.json();
-            setProperties(data);
-            setFilteredProperties(data);
-          } catch (error) {
-            console.error("Error fetching properties:", error);
-          }
-        };
-
-        fetchProperties();
+        setRefreshKey((key) => key + 1);
       }
     };
 
@@ -202,6 +156,31 @@ const PropertiesPage = () => {
     };
   }, []);
 
+  // Fetch the listing counts shown next to each filter option
+  useEffect(() => {
+    const params = filterParams(searchFilters, selectedLocation, builderId);
+
+    const controller = new AbortController();
+    fetch(`${API_BASE_URL}/api/properties/facets?${params}`, {
+      signal: controller.signal,
+    })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => setFacets(data ? data.facets : null))
+      .catch((error) => {
+        if (error.name !== "AbortError") {
+          console.error("Error fetching property facets:", error);
+        }
+      });
+
+    return () => controller.abort();
+  }, [searchFilters, selectedLocation, builderId, refreshKey]);
+
+  const optionLabel = (facet, value, label = value) => {
+    if (!facets || !facets[facet]) return label;
+    const entry = facets[facet].find((item) => item.value === value);
+    return `${label} (${entry ? entry.count : 0})`;
+  };
+
   // Initialize search filters with URL parameters
   useEffect(() => {
     const locationParam = searchParams.get("location") || "";
@@ -318,9 +297,9 @@ const PropertiesPage = () => {
                 onChange={handleFilterChange}
               >
                 <option value="">All Types</option>
-                <option value="House">House</option>
-                <option value="Flat">Flat</option>
-                <option value="Plot">Plot</option>
+                <option value="House">{optionLabel("type", "House")}</option>
+                <option value="Flat">{optionLabel("type", "Flat")}</option>
+                <option value="Plot">{optionLabel("type", "Plot")}</option>
               </select>
             </div>
 
@@ -333,9 +312,11 @@ const PropertiesPage = () => {
                 onChange={handleFilterChange}
               >
                 <option value="">All Status</option>
-                <option value="Available">Available</option>
-                <option value="Sold">Sold</option>
-                <option value="Rent">Rent</option>
+                <option value="Available">
+                  {optionLabel("status", "Available")}
+                </option>
+                <option value="Sold">{optionLabel("status", "Sold")}</option>
+                <option value="Rent">{optionLabel("status", "Rent")}</option>
               </select>
             </div>
           </div>
@@ -390,8 +371,8 @@ const PropertiesPage = () => {
           whileInView="visible"
           viewport={{ once: true, margin: "-100px" }}
         >
-          {filteredProperties.length > 0 ? (
-            filteredProperties.map((property) => (
+          {properties.length > 0 ? (
+            properties.map((property) => (
               <motion.div
                 key={property.id}
                 className="property-card"
@@ -406,9 +387,9 @@ const PropertiesPage = () => {
                 style={{ cursor: "pointer" }}
               >
                 <div className="property-image">
-                  {property.images && property.images.length > 0 ? (
+                  {property.cover_image ? (
                     <img
-                      src={property.images[0]}
+                      src={cardImage(property.cover_image)}
                       alt={property.title}
                       loading="lazy"
                     />
@@ -444,6 +425,18 @@ const PropertiesPage = () => {
             </div>
           )}
         </motion.div>
+
+        {nextCursor && (
+          <div className="view-all-container">
+            <button
+              className="btn-view-all"
+              onClick={loadMore}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load More Properties"}
+            </button>
+          </div>
+        )}
       </div>
     </section>
   );
@@ -16,6 +16,7 @@ import {
 import API_BASE_URL from "../config";
 import "./PropertyDetail.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { cardImage, mediaUrl } from "../utils/media";
 
 const PropertyDetail = () => {
   const { id } = useParams();
@@ -231,7 +232,7 @@ const PropertyDetail = () => {
               {property.images && property.images.length > 0 ? (
                 <>
                   <img
-                    src={property.images[currentImageIndex]}
+                    src={mediaUrl(property.images[currentImageIndex])}
                     alt={property.title}
                   />
                   {property.images.length > 1 && (
@@ -258,7 +259,7 @@ const PropertyDetail = () => {
                 {property.images.map((image, index) => (
                   <img
                     key={index}
-                    src={image}
+                    src={mediaUrl(image)}
                     alt={`${property.title} ${index + 1}`}
                     className={index === currentImageIndex ? "active" : ""}
                     onClick={() => setCurrentImageIndex(index)}
@@ -449,7 +450,7 @@ const PropertyDetail = () => {
                     {similarProperty.images &&
                     similarProperty.images.length > 0 ? (
                       <img
-                        src={similarProperty.images[0]}
+                        src={cardImage(similarProperty.images[0])}
                         alt={similarProperty.title}
                         loading="lazy"
                       />
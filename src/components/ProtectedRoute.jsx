@@ -1,5 +1,6 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
+import API_BASE_URL from "../config";
 
 const ProtectedRoute = ({ children }) => {
   const [isLoading, setIsLoading] = useState(true);
@@ -7,7 +8,7 @@ const ProtectedRoute = ({ children }) => {
 
   useEffect(() => {
     // Check if admin is authenticated
-    const checkAuth = () => {
+    const checkAuth = async () => {
       const token = localStorage.getItem("adminToken");
       const admin = localStorage.getItem("admin");
 
@@ -18,19 +19,24 @@ const ProtectedRoute = ({ children }) => {
         // Redirect to login if not authenticated
         navigate("/admin/login");
       } else {
-        // Token exists, check if it's still valid
+        // Token exists, check with the server that it's still valid
         try {
-          const parsedAdmin = JSON.parse(admin);
-          console.log("Admin parsed:", parsedAdmin);
-          if (parsedAdmin && parsedAdmin.id) {
+          const response = await fetch(`${API_BASE_URL}/api/admin/session`, {
+            headers: { Authorization: `Bearer ${token}` },
+          });
+          if (response.ok) {
+            const data = await response.json();
+            localStorage.setItem("admin", JSON.stringify(data.admin));
             console.log("Authentication verified, showing protected content");
             setIsLoading(false);
           } else {
-            console.log("Invalid admin info, redirecting to login");
+            console.log("Token expired or invalid, redirecting to login");
+            localStorage.removeItem("adminToken");
+            localStorage.removeItem("admin");
             navigate("/admin/login");
           }
         } catch (error) {
-          console.log("Error parsing admin info, redirecting to login", error);
+          console.log("Error verifying token, redirecting to login", error);
           navigate("/admin/login");
         }
       }
@@ -10,7 +10,7 @@ import {
   FaArrowLeft,
   FaArrowRight,
 } from "react-icons/fa";
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import "./Services.css";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
 
@@ -69,9 +69,8 @@ const Services = () => {
   useEffect(() => {
     const fetchHomeContent = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/admin/home-content`);
-        if (response.ok) {
-          const data = await response.json();
+        const data = (await getHomepage()).home_content;
+        if (data) {
           setSectionContent({
             title: data.services?.title || "Our Services",
             description:
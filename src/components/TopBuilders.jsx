@@ -2,8 +2,9 @@ import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import { motion } from "framer-motion";
 import { FaArrowLeft, FaArrowRight, FaBuilding } from "react-icons/fa";
-import API_BASE_URL from "../config";
+import { getHomepage } from "../utils/homepage";
 import eventBus, { EVENT_TYPES } from "../utils/eventBus";
+import { mediaUrl } from "../utils/media";
 import "./TopBuilders.css";
 
 const TopBuilders = () => {
@@ -15,8 +16,7 @@ const TopBuilders = () => {
   useEffect(() => {
     const fetchBuilders = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/api/builders`);
-        const data = await response.json();
+        const data = (await getHomepage()).builders;
         setBuilders(data);
         setLoading(false);
       } catch (error) {
@@ -34,8 +34,7 @@ const TopBuilders = () => {
       // Re-fetch builders when changes occur
       const fetchBuilders = async () => {
         try {
-          const response = await fetch(`${API_BASE_URL}/api/builders`);
-          const data = await response.json();
+          const data = (await getHomepage()).builders;
           setBuilders(data);
         } catch (error) {
           console.error("Error fetching builders:", error);
@@ -59,8 +58,7 @@ const TopBuilders = () => {
         // Page became visible, fetch latest builders
         const fetchBuilders = async () => {
           try {
-            const response = await fetch(`${API_BASE_URL}/api/builders`);
-            const data = await response.json();
+            const data = (await getHomepage()).builders;
             setBuilders(data);
           } catch (error) {
             console.error("Error fetching builders:", error);
@@ -154,7 +152,7 @@ const TopBuilders = () => {
                 whileHover={{ y: -10 }}
               >
                 <div className="builder-image">
-                  <img src={builder.image} alt={builder.name} />
+                  <img src={mediaUrl(builder.image)} alt={builder.name} />
                 </div>
                 <div className="builder-info">
                   <h3>{builder.name}</h3>
@@ -1,4 +1,8 @@
 const API_BASE_URL =
   process.env.REACT_APP_API_URL || "https://megareality-backend.onrender.com";
 
+// Live change events (/api/events) are served on the API's port by
+// `python app.py`; set this to serve them from somewhere else
+export const EVENTS_URL = process.env.REACT_APP_EVENTS_URL || API_BASE_URL;
+
 export default API_BASE_URL;
@@ -0,0 +1,82 @@
+import API_BASE_URL from "../config";
+
+// The admin dashboard's copy of the admin tables, kept current through
+// GET /api/sync: the first call returns everything, later calls only the
+// rows changed or deleted since the token the previous call returned.
+const TABLES = [
+  "properties",
+  "projects",
+  "agents",
+  "builders",
+  "inquiries",
+  "admins",
+  "home_content",
+];
+
+const emptyTables = () =>
+  Object.fromEntries(TABLES.map((table) => [table, new Map()]));
+
+let syncToken = "0";
+let rows = emptyTables();
+let pending = null;
+
+const byId = (a, b) => a.id - b.id;
+const newestFirst = (a, b) =>
+  (b.created_at || "").localeCompare(a.created_at || "") || b.id - a.id;
+
+// The tables as arrays in the order the dashboard lists them, and home
+// content as {section: content}
+const snapshot = () => {
+  const data = {};
+  TABLES.forEach((table) => {
+    data[table] = [...rows[table].values()].sort(
+      table === "inquiries" ? newestFirst : byId
+    );
+  });
+  data.home_content = Object.fromEntries(
+    data.home_content.map((row) => [row.section, row.content])
+  );
+  return data;
+};
+
+const applySync = (data) => {
+  if (data.full) {
+    rows = emptyTables();
+  }
+  Object.entries(data.changes).forEach(([table, changed]) => {
+    changed.forEach((row) => rows[table]?.set(row.id, row));
+  });
+  Object.entries(data.deleted).forEach(([table, ids]) => {
+    ids.forEach((id) => rows[table]?.delete(id));
+  });
+  syncToken = data.token;
+};
+
+export const syncAdminData = (token) => {
+  // Concurrent callers share one request so a delta is never applied twice
+  if (!pending) {
+    pending = fetch(`${API_BASE_URL}/api/sync?since=${syncToken}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Sync request failed: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((data) => {
+        applySync(data);
+        return snapshot();
+      })
+      .finally(() => {
+        pending = null;
+      });
+  }
+  return pending;
+};
+
+// Forget the local copy, e.g. on logout
+export const resetAdminSync = () => {
+  syncToken = "0";
+  rows = emptyTables();
+};
@@ -0,0 +1,22 @@
+import API_BASE_URL from "../config";
+
+// Every homepage section reads from GET /api/homepage. Sections mounting (or
+// refreshing) at the same time share one request instead of each fetching
+// its own endpoint.
+let pending = null;
+
+export const getHomepage = () => {
+  if (!pending) {
+    pending = fetch(`${API_BASE_URL}/api/homepage`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Homepage request failed: ${response.status}`);
+        }
+        return response.json();
+      })
+      .finally(() => {
+        pending = null;
+      });
+  }
+  return pending;
+};
@@ -0,0 +1,55 @@
+// Bridges the backend's /api/events stream onto the in-page event bus, so
+// changes made by any admin reach every open tab
+import { EVENTS_URL } from "../config";
+import eventBus, { EVENT_TYPES } from "./eventBus";
+
+const CHANGE_EVENTS = {
+  property: [EVENT_TYPES.PROPERTIES_CHANGED, "propertyId", "property"],
+  agent: [EVENT_TYPES.AGENTS_CHANGED, "agentId", "agent"],
+  builder: [EVENT_TYPES.BUILDERS_CHANGED, "builderId", "builder"],
+  project: [EVENT_TYPES.PROJECTS_CHANGED, "projectId", "project"],
+};
+
+let source = null;
+
+export const startLiveEvents = () => {
+  if (!EVENTS_URL || source || typeof EventSource === "undefined") return;
+
+  // EventSource reconnects by itself and resumes from the last event id
+  source = new EventSource(`${EVENTS_URL}/api/events`);
+
+  source.onmessage = (message) => {
+    const change = JSON.parse(message.data);
+    if (change.type === "home_content") {
+      eventBus.emit(EVENT_TYPES.HOME_CONTENT_CHANGED, {
+        section: change.id,
+        content: change.data,
+      });
+      return;
+    }
+    const mapping = CHANGE_EVENTS[change.type];
+    if (!mapping) return;
+    const [eventType, idKey, dataKey] = mapping;
+    eventBus.emit(eventType, {
+      action: change.action,
+      [idKey]: change.id,
+      [dataKey]: change.data,
+      version: change.version,
+    });
+  };
+
+  // Sent when changes were missed (e.g. the server restarted); listeners
+  // refetch on any change event
+  source.addEventListener("reset", () => {
+    Object.values(CHANGE_EVENTS).forEach(([eventType]) =>
+      eventBus.emit(eventType, { action: "reset" })
+    );
+  });
+};
+
+export const stopLiveEvents = () => {
+  if (source) {
+    source.close();
+    source = null;
+  }
+};
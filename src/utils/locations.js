@@ -0,0 +1,6 @@
+// The navbar's location choices and the terms a listing's location must
+// contain (any of) to belong to them. Other choices don't filter.
+export const LOCATION_TERMS = {
+  gurugram: ["gurugram", "gurgaon"],
+  delhi: ["delhi"],
+};
@@ -0,0 +1,25 @@
+import API_BASE_URL from "../config";
+
+// Uploaded images are stored as the root-relative path of their full-size
+// variant (/media/<key>/full.jpg), so they don't depend on the host or
+// scheme the upload went through. The server also renders smaller variants
+// next to it under the same key, so cards and thumbnails can point at those
+// instead of downloading the 1920px image. Other URLs are returned as is.
+const FULL_VARIANT = /(\/media\/[0-9a-f]{32}\/)full\.jpg$/;
+
+// An image URL the browser can load: media paths are served by the API
+export const mediaUrl = (url) =>
+  typeof url === "string" && url.startsWith("/media/")
+    ? `${API_BASE_URL}${url}`
+    : url;
+
+export const imageVariant = (url, variant) =>
+  mediaUrl(
+    typeof url === "string" ? url.replace(FULL_VARIANT, `$1${variant}.jpg`) : url
+  );
+
+// 800px, for listing cards
+export const cardImage = (url) => imageVariant(url, "card");
+
+// 320px, for admin lists and small previews
+export const thumbImage = (url) => imageVariant(url, "thumb");